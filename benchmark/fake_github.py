@@ -0,0 +1,776 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+GRAPHQL_PR_FIELDS = re.compile(r"pr(\d+): pullRequest\(number: (\d+)\) \{ \.\.\.PRFields \}")
+GRAPHQL_PR_MERGEABLE = re.compile(r"pr(\d+): pullRequest\(number: (\d+)\) \{ mergeable \}")
+GRAPHQL_LABEL = re.compile(r'l(\d+): label\(name: "(.*?)"\) \{ id \}')
+GRAPHQL_ADD_LABELS = re.compile(
+    r'pr(\d+): addLabelsToLabelable\(input: \{labelableId: "PR_(\d+)", labelIds: \[(.*?)\]\}\)'
+)
+GRAPHQL_REPOSITORY = re.compile(r'r(\d+): repository\(owner: "(.*?)", name: "(.*?)"\)')
+GRAPHQL_COMPARE = re.compile(
+    r'pr(\d+): ref\(qualifiedName: "(.*?)"\) \{ compare\(headRef: "(.*?)"\) \{ behindBy \} \}'
+)
+
+
+SCENARIOS = ["green", "pending", "chromatic", "unapproved", "conflicting"]
+DEFAULT_SCENARIO_WEIGHTS = {
+    "green": 50,
+    "pending": 20,
+    "chromatic": 10,
+    "unapproved": 15,
+    "conflicting": 5,
+}
+CHECK_RUN_NAMES = ["build", "unit-tests"]
+STATUS_CONTEXTS = ["ci/circleci"]
+
+
+def fake_sha(*parts):
+    return hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+
+
+class FakeRepositoryState:
+    def __init__(
+        self,
+        repo="acme/monorepo",
+        pr_count=10,
+        seed=1,
+        trigger_label="ci-plumber",
+        authors=("bot", "alice", "bob"),
+        teams=3,
+        team_size=25,
+        scenario_weights=None,
+        reviews=2,
+        team_review_rate=0.3,
+        statuses=1,
+        check_runs=2,
+        chromatic_workflows=1,
+    ):
+        self.owner, self.name = repo.split("/", 1)
+        self.full_name = repo
+        self.trigger_label = trigger_label
+        self.authors = list(authors)
+        self.base_sha = fake_sha("base", seed)
+        self.seed = seed
+        self.scenario_weights = {**DEFAULT_SCENARIO_WEIGHTS, **(scenario_weights or {})}
+        unknown = sorted(set(self.scenario_weights) - set(SCENARIOS))
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {', '.join(unknown)}")
+        if not any(self.scenario_weights.values()):
+            raise ValueError("At least one scenario needs a weight above 0")
+        self.reviews = reviews
+        self.team_review_rate = team_review_rate
+        self.statuses = statuses
+        self.check_runs = check_runs
+        self._lock = threading.Lock()
+
+        rng = random.Random(seed)
+        reviewers = [f"reviewer{index}" for index in range(team_size * teams)]
+        self.teams = {
+            f"team-{index}": set(reviewers[index * team_size : (index + 1) * team_size])
+            for index in range(teams)
+        }
+        # The first workflow keeps the plain name, as most repositories have just one.
+        self.chromatic_workflows = [
+            {"id": 9001 + index, "name": "Chromatic" if index == 0 else f"Chromatic {index + 1}"}
+            for index in range(chromatic_workflows)
+        ]
+        self.pull_requests = {
+            number: self._generate_pr(rng, number, reviewers)
+            for number in range(1000, 1000 + pr_count)
+        }
+
+    def _generate_pr(self, rng, number, reviewers):
+        scenario = rng.choices(
+            SCENARIOS, weights=[self.scenario_weights[name] for name in SCENARIOS]
+        )[0]
+
+        approvals = max(self.reviews - 1, 0) if scenario == "unapproved" else self.reviews
+        approvers = rng.sample(reviewers, approvals)
+        requested_teams = []
+        if rng.random() < self.team_review_rate:
+            team = rng.choice(sorted(self.teams))
+            requested_teams.append(team)
+            if scenario != "unapproved":
+                approvers.append(rng.choice(sorted(self.teams[team])))
+
+        check_runs = [
+            {
+                "id": number * 100 + index,
+                "name": CHECK_RUN_NAMES[index]
+                if index < len(CHECK_RUN_NAMES)
+                else f"check-{index}",
+                "conclusion": "success",
+                "run_id": None,
+                "workflow": None,
+            }
+            for index in range(self.check_runs)
+        ]
+        if scenario == "pending" and check_runs:
+            check_runs[-1]["conclusion"] = None
+        # Only the first Chromatic workflow fails in the "chromatic" scenario.
+        for index, workflow in enumerate(self.chromatic_workflows):
+            check_runs.append(
+                {
+                    "id": number * 100 + 50 + index,
+                    "name": workflow["name"],
+                    "conclusion": "failure"
+                    if scenario == "chromatic" and index == 0
+                    else "success",
+                    "run_id": 50000 + number + index * 100000,
+                    "workflow": workflow,
+                }
+            )
+        status_state = "pending" if scenario == "pending" else "success"
+
+        labels = [self.trigger_label]
+        if rng.random() < 0.5:
+            labels.append("workdays: Mon-Fri")
+
+        return {
+            "number": number,
+            "title": f"Benchmark PR {number}",
+            "author": rng.choice(self.authors),
+            "head_ref": f"feature/bench-{number}",
+            "head_sha": fake_sha("head", number),
+            "base_ref": "master",
+            "cross_repository": rng.random() < 0.05,
+            "labels": labels,
+            "reviews": [(user, "APPROVED") for user in approvers],
+            "requested_teams": requested_teams,
+            "status_state": status_state,
+            "statuses": [
+                {
+                    "context": (
+                        STATUS_CONTEXTS[index]
+                        if index < len(STATUS_CONTEXTS)
+                        else f"ci/status-{index}"
+                    ),
+                    "state": status_state,
+                }
+                for index in range(self.statuses)
+            ],
+            "check_runs": check_runs,
+            "mergeable": scenario != "conflicting",
+            "mergeable_reads_until_known": rng.choice([0, 0, 0, 1]),
+            "behind_by": rng.randint(0, 150),
+            "merged": False,
+            "state": "open",
+            "commits": rng.randint(1, 12),
+            "files": self._generate_files(number),
+        }
+
+    def _generate_files(self, number):
+        # A separate generator per PR keeps the scenarios above stable for a seed.
+        rng = random.Random(f"{self.seed}:files:{number}")
+        paths = [f"src/module{index // 10}/file{index}.js" for index in range(400)]
+        return [(path, rng.randint(1, 200)) for path in rng.sample(paths, rng.randint(1, 6))]
+
+    def read_mergeable(self, pr):
+        with self._lock:
+            if pr["mergeable_reads_until_known"] > 0:
+                pr["mergeable_reads_until_known"] -= 1
+                return None
+        return pr["mergeable"]
+
+    def pr_for_sha(self, sha):
+        for pr in self.pull_requests.values():
+            if pr["head_sha"] == sha:
+                return pr
+        return None
+
+
+class FakeGitHub:
+    LIMITS = {"core": 5000, "graphql": 5000, "search": 30}
+    WINDOWS = {"core": 3600, "graphql": 3600, "search": 60}
+
+    def __init__(self, state, latency=0.05, jitter=0.02, limits=None, per_page=30):
+        self.state = state
+        self.latency = latency
+        self.jitter = jitter
+        self.default_per_page = per_page
+        self.limits = {**self.LIMITS, **(limits or {})}
+        self.used = Counter()
+        self.calls = Counter()
+        self.reset_at = {
+            resource: int(time.time()) + window for resource, window in self.WINDOWS.items()
+        }
+        self._lock = threading.Lock()
+        self._server = None
+        self.base_url = None
+
+    def start(self, host="127.0.0.1", port=0):
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self.base_url = f"http://{host}:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _charge(self, resource):
+        with self._lock:
+            now = time.time()
+            if now >= self.reset_at[resource]:
+                self.used[resource] = 0
+                self.reset_at[resource] = int(now) + self.WINDOWS[resource]
+            limited = self.used[resource] >= self.limits[resource]
+            if not limited:
+                self.used[resource] += 1
+            headers = {
+                "X-RateLimit-Limit": str(self.limits[resource]),
+                "X-RateLimit-Remaining": str(self.limits[resource] - self.used[resource]),
+                "X-RateLimit-Used": str(self.used[resource]),
+                "X-RateLimit-Reset": str(self.reset_at[resource]),
+                "X-RateLimit-Resource": resource,
+            }
+        return limited, headers
+
+    def _count(self, endpoint):
+        with self._lock:
+            self.calls[endpoint] += 1
+
+    # --- JSON builders -------------------------------------------------------------
+
+    def _repo_url(self):
+        return f"{self.base_url}/repos/{self.state.full_name}"
+
+    def _user(self, login):
+        return {"login": login, "id": abs(hash(login)) % 10**6, "type": "User"}
+
+    def _repository_json(self):
+        return {
+            "id": 1,
+            "name": self.state.name,
+            "full_name": self.state.full_name,
+            "owner": self._user(self.state.owner),
+            "url": self._repo_url(),
+            "clone_url": f"{self.base_url}/{self.state.full_name}.git",
+            "default_branch": "master",
+        }
+
+    def _label_json(self, name):
+        return {"name": name, "url": f"{self._repo_url()}/labels/{name}"}
+
+    def _issue_json(self, pr):
+        return {
+            "number": pr["number"],
+            "title": pr["title"],
+            "user": self._user(pr["author"]),
+            "labels": [self._label_json(label) for label in pr["labels"]],
+            "state": pr["state"],
+            "updated_at": "2024-01-01T00:00:00Z",
+            "draft": False,
+            "url": f"{self._repo_url()}/issues/{pr['number']}",
+            "pull_request": {"url": f"{self._repo_url()}/pulls/{pr['number']}"},
+        }
+
+    def _pull_json(self, pr):
+        head_repo = self._repository_json()
+        if pr["cross_repository"]:
+            head_repo = {**head_repo, "full_name": f"fork-{pr['author']}/{self.state.name}"}
+        return {
+            "number": pr["number"],
+            "title": pr["title"],
+            "user": self._user(pr["author"]),
+            "labels": [self._label_json(label) for label in pr["labels"]],
+            "state": pr["state"],
+            "updated_at": "2024-01-01T00:00:00Z",
+            "draft": False,
+            "merged": pr["merged"],
+            "mergeable": self.state.read_mergeable(pr),
+            "commits": pr["commits"],
+            "url": f"{self._repo_url()}/pulls/{pr['number']}",
+            "issue_url": f"{self._repo_url()}/issues/{pr['number']}",
+            "head": {"ref": pr["head_ref"], "sha": pr["head_sha"], "repo": head_repo},
+            "base": {"ref": pr["base_ref"], "sha": self.state.base_sha, "repo": head_repo},
+        }
+
+    def _graphql_pr_node(self, pr):
+        mergeable = self.state.read_mergeable(pr)
+        check_suites = [
+            {
+                "workflowRun": (
+                    {
+                        "databaseId": run["run_id"],
+                        "workflow": {
+                            "databaseId": run["workflow"]["id"],
+                            "name": run["workflow"]["name"],
+                        },
+                    }
+                    if run["run_id"]
+                    else None
+                ),
+                "checkRuns": {
+                    "pageInfo": {"hasNextPage": False},
+                    "nodes": [
+                        {
+                            "databaseId": run["id"],
+                            "name": run["name"],
+                            "conclusion": run["conclusion"].upper() if run["conclusion"] else None,
+                            "detailsUrl": f"https://github.com/{self.state.full_name}/actions/runs/{run['run_id']}"
+                            if run["run_id"]
+                            else None,
+                        }
+                    ],
+                },
+            }
+            for run in pr["check_runs"]
+        ]
+        return {
+            "id": f"PR_{pr['number']}",
+            "number": pr["number"],
+            "merged": pr["merged"],
+            "mergeable": {True: "MERGEABLE", False: "CONFLICTING", None: "UNKNOWN"}[mergeable],
+            "isCrossRepository": pr["cross_repository"],
+            "headRefName": pr["head_ref"],
+            "headRefOid": pr["head_sha"],
+            "baseRefName": pr["base_ref"],
+            "baseRef": {"target": {"oid": self.state.base_sha}},
+            "labels": {
+                "pageInfo": {"hasNextPage": False},
+                "nodes": [{"name": label} for label in pr["labels"]],
+            },
+            "reviews": {
+                "pageInfo": {"hasNextPage": False},
+                "nodes": [
+                    {"state": state, "author": {"login": user}} for user, state in pr["reviews"]
+                ],
+            },
+            "reviewRequests": {
+                "pageInfo": {"hasNextPage": False},
+                "nodes": [
+                    {"requestedReviewer": {"__typename": "Team", "slug": slug}}
+                    for slug in pr["requested_teams"]
+                ],
+            },
+            "commits": {
+                "nodes": [
+                    {
+                        "commit": {
+                            "oid": pr["head_sha"],
+                            "status": {
+                                "state": pr["status_state"].upper(),
+                                "contexts": [
+                                    {"context": status["context"], "state": status["state"].upper()}
+                                    for status in pr["statuses"]
+                                ],
+                            },
+                            "checkSuites": {
+                                "pageInfo": {"hasNextPage": False},
+                                "nodes": check_suites,
+                            },
+                        }
+                    }
+                ]
+            },
+        }
+
+    # --- request routing -----------------------------------------------------------
+
+    def _routes(self):
+        repo = re.escape(f"/repos/{self.state.full_name}")
+        org = re.escape(f"/orgs/{self.state.owner}")
+        return [
+            ("GET", r"/user", "GET /user", self._get_user),
+            ("GET", rf"{repo}", "GET /repos/{repo}", self._get_repo),
+            ("GET", r"/search/issues", "GET /search/issues", self._search_issues),
+            ("GET", rf"{repo}/pulls", "GET /repos/{repo}/pulls", self._list_pulls),
+            ("GET", rf"{repo}/pulls/(\d+)", "GET /repos/{repo}/pulls/{n}", self._get_pull),
+            (
+                "GET",
+                rf"{repo}/pulls/(\d+)/reviews",
+                "GET /repos/{repo}/pulls/{n}/reviews",
+                self._get_reviews,
+            ),
+            (
+                "GET",
+                rf"{repo}/pulls/(\d+)/requested_reviewers",
+                "GET /repos/{repo}/pulls/{n}/requested_reviewers",
+                self._get_requested_reviewers,
+            ),
+            (
+                "GET",
+                rf"{repo}/pulls/(\d+)/files",
+                "GET /repos/{repo}/pulls/{n}/files",
+                self._get_files,
+            ),
+            ("PUT", rf"{repo}/pulls/(\d+)/merge", "PUT /repos/{repo}/pulls/{n}/merge", self._merge),
+            (
+                "PUT",
+                rf"{repo}/pulls/(\d+)/update-branch",
+                "PUT /repos/{repo}/pulls/{n}/update-branch",
+                self._update_branch,
+            ),
+            (
+                "POST",
+                rf"{repo}/issues/(\d+)/labels",
+                "POST /repos/{repo}/issues/{n}/labels",
+                self._add_labels,
+            ),
+            ("GET", rf"{repo}/commits/(\w+)", "GET /repos/{repo}/commits/{sha}", self._get_commit),
+            (
+                "GET",
+                rf"{repo}/commits/(\w+)/status",
+                "GET /repos/{repo}/commits/{sha}/status",
+                self._get_status,
+            ),
+            (
+                "GET",
+                rf"{repo}/commits/(\w+)/check-runs",
+                "GET /repos/{repo}/commits/{sha}/check-runs",
+                self._get_check_runs,
+            ),
+            ("GET", rf"{repo}/compare/(.+)\.\.\.(.+)", "GET /repos/{repo}/compare", self._compare),
+            (
+                "GET",
+                rf"{repo}/actions/workflows",
+                "GET /repos/{repo}/actions/workflows",
+                self._get_workflows,
+            ),
+            (
+                "GET",
+                rf"{repo}/actions/workflows/(\d+)/runs",
+                "GET /repos/{repo}/actions/workflows/{n}/runs",
+                self._get_workflow_runs,
+            ),
+            (
+                "POST",
+                rf"{repo}/actions/runs/(\d+)/rerun-failed-jobs",
+                "POST /repos/{repo}/actions/runs/{n}/rerun-failed-jobs",
+                self._rerun_failed_jobs,
+            ),
+            (
+                "GET",
+                rf"{org}/teams/([\w-]+)/memberships/([\w-]+)",
+                "GET /orgs/{org}/teams/{team}/memberships/{user}",
+                self._get_membership,
+            ),
+            (
+                "GET",
+                rf"{org}/teams/([\w-]+)/members",
+                "GET /orgs/{org}/teams/{team}/members",
+                self._get_members,
+            ),
+            ("POST", r"/graphql", "POST /graphql", self._graphql),
+        ]
+
+    def dispatch(self, method, raw_path, body):
+        parsed = urlparse(raw_path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+
+        for route_method, pattern, endpoint, handler in self._routes():
+            # Owner and repository names are case-insensitive on GitHub.
+            match = re.fullmatch(pattern, parsed.path, flags=re.IGNORECASE)
+            if route_method == method and match:
+                self._count(endpoint)
+                resource = "graphql" if endpoint == "POST /graphql" else "core"
+                if endpoint == "GET /search/issues":
+                    resource = "search"
+                limited, headers = self._charge(resource)
+                if limited:
+                    return 403, {"message": "API rate limit exceeded for user."}, headers
+                status, payload, extra_headers = handler(query, body, *match.groups())
+                headers.update(extra_headers)
+                return status, payload, headers
+
+        self._count(f"{method} (unhandled) {parsed.path}")
+        return 404, {"message": "Not Found"}, {}
+
+    def _paginate(self, path, query, items):
+        per_page = int(query.get("per_page", self.default_per_page))
+        page = int(query.get("page", 1))
+        start = (page - 1) * per_page
+        headers = {}
+        if start + per_page < len(items):
+            params = {**query, "page": page + 1, "per_page": per_page}
+            next_query = "&".join(f"{key}={value}" for key, value in params.items())
+            headers["Link"] = f'<{self.base_url}{path}?{next_query}>; rel="next"'
+        return items[start : start + per_page], headers
+
+    def _pr(self, number):
+        return self.state.pull_requests.get(int(number))
+
+    def _get_user(self, query, body):
+        return 200, self._user(self.state.authors[0]), {}
+
+    def _get_repo(self, query, body):
+        return 200, self._repository_json(), {}
+
+    def _search_issues(self, query, body):
+        terms = query.get("q", "")
+        author = re.search(r"author:(\S+)", terms)
+        sha = re.search(r"\b([0-9a-f]{40})\b", terms)
+        matches = [
+            self._issue_json(pr)
+            for pr in sorted(self.state.pull_requests.values(), key=lambda pr: -pr["number"])
+            if pr["state"] == "open"
+            and self.state.trigger_label in pr["labels"]
+            and (author is None or pr["author"] == author.group(1))
+            and (sha is None or pr["head_sha"] == sha.group(1))
+        ]
+        page, headers = self._paginate("/search/issues", query, matches)
+        return (
+            200,
+            {"total_count": len(matches), "incomplete_results": False, "items": page},
+            headers,
+        )
+
+    def _list_pulls(self, query, body):
+        pulls = [
+            self._pull_json(pr)
+            for pr in sorted(self.state.pull_requests.values(), key=lambda pr: -pr["number"])
+            if pr["state"] == "open"
+        ]
+        page, headers = self._paginate(f"/repos/{self.state.full_name}/pulls", query, pulls)
+        return 200, page, headers
+
+    def _get_pull(self, query, body, number):
+        pr = self._pr(number)
+        return (200, self._pull_json(pr), {}) if pr else (404, {"message": "Not Found"}, {})
+
+    def _get_reviews(self, query, body, number):
+        pr = self._pr(number)
+        reviews = [
+            {"id": index, "user": self._user(user), "state": state}
+            for index, (user, state) in enumerate(pr["reviews"])
+        ]
+        return 200, reviews, {}
+
+    def _get_requested_reviewers(self, query, body, number):
+        pr = self._pr(number)
+        teams = [
+            {"slug": slug, "name": slug, "id": index}
+            for index, slug in enumerate(pr["requested_teams"])
+        ]
+        return 200, {"users": [], "teams": teams}, {}
+
+    def _get_files(self, query, body, number):
+        return (
+            200,
+            [
+                {
+                    "filename": path,
+                    "status": "modified",
+                    "sha": fake_sha("file", number, path),
+                    "changes": changes,
+                    "additions": changes,
+                    "deletions": 0,
+                }
+                for path, changes in self._pr(number)["files"]
+            ],
+            {},
+        )
+
+    def _merge(self, query, body, number):
+        pr = self._pr(number)
+        with self.state._lock:
+            pr["merged"] = True
+            pr["state"] = "closed"
+        return 200, {"merged": True, "sha": fake_sha("merge", number), "message": "Merged"}, {}
+
+    def _update_branch(self, query, body, number):
+        return 202, {"message": "Updating pull request branch.", "url": ""}, {}
+
+    def _add_labels(self, query, body, number):
+        pr = self._pr(number)
+        payload = json.loads(body or b"[]")
+        names = payload.get("labels", []) if isinstance(payload, dict) else payload
+        with self.state._lock:
+            for name in names:
+                if name not in pr["labels"]:
+                    pr["labels"].append(name)
+        return 200, [self._label_json(label) for label in pr["labels"]], {}
+
+    def _get_commit(self, query, body, sha):
+        return (
+            200,
+            {"sha": sha, "url": f"{self._repo_url()}/commits/{sha}", "commit": {"message": "wip"}},
+            {},
+        )
+
+    def _get_status(self, query, body, sha):
+        pr = self.state.pr_for_sha(sha)
+        state = pr["status_state"] if pr else "pending"
+        statuses = pr["statuses"] if pr else []
+        return (
+            200,
+            {"state": state, "sha": sha, "total_count": len(statuses), "statuses": statuses},
+            {},
+        )
+
+    def _get_check_runs(self, query, body, sha):
+        pr = self.state.pr_for_sha(sha)
+        runs = [
+            {
+                "id": run["id"],
+                "name": run["name"],
+                "head_sha": sha,
+                "status": "completed" if run["conclusion"] else "in_progress",
+                "conclusion": run["conclusion"],
+                "details_url": f"https://github.com/{self.state.full_name}/actions/runs/{run['run_id']}"
+                if run["run_id"]
+                else None,
+            }
+            for run in (pr["check_runs"] if pr else [])
+        ]
+        page, headers = self._paginate(
+            f"/repos/{self.state.full_name}/commits/{sha}/check-runs", query, runs
+        )
+        return 200, {"total_count": len(runs), "check_runs": page}, headers
+
+    def _compare(self, query, body, base, head):
+        pr = self.state.pr_for_sha(head) or next(
+            (pr for pr in self.state.pull_requests.values() if pr["head_ref"] == head), None
+        )
+        behind_by = pr["behind_by"] if pr else 0
+        return (
+            200,
+            {
+                "url": f"{self._repo_url()}/compare/{base}...{head}",
+                "status": "diverged",
+                "ahead_by": pr["commits"] if pr else 0,
+                "behind_by": behind_by,
+                "total_commits": pr["commits"] if pr else 0,
+                "commits": [{"sha": fake_sha("c", head, index)} for index in range(behind_by)],
+                "files": [{"filename": f"file{index}.js"} for index in range(min(behind_by, 300))],
+            },
+            {},
+        )
+
+    def _get_workflows(self, query, body):
+        workflows = [
+            {
+                "id": workflow["id"],
+                "name": workflow["name"],
+                "path": f".github/workflows/chromatic-{workflow['id']}.yml",
+            }
+            for workflow in self.state.chromatic_workflows
+        ]
+        workflows.append({"id": 9000, "name": "CI", "path": ".github/workflows/ci.yml"})
+        for workflow in workflows:
+            workflow["url"] = f"{self._repo_url()}/actions/workflows/{workflow['id']}"
+        return 200, {"total_count": len(workflows), "workflows": workflows}, {}
+
+    def _get_workflow_runs(self, query, body, workflow_id):
+        runs = [
+            {
+                "id": run["run_id"],
+                "head_sha": pr["head_sha"],
+                "head_branch": pr["head_ref"],
+                "conclusion": run["conclusion"],
+                "url": f"{self._repo_url()}/actions/runs/{run['run_id']}",
+            }
+            for pr in self.state.pull_requests.values()
+            for run in pr["check_runs"]
+            if run["workflow"]
+            and run["workflow"]["id"] == int(workflow_id)
+            and pr["head_ref"] == query.get("branch")
+        ]
+        return 200, {"total_count": len(runs), "workflow_runs": runs}, {}
+
+    def _rerun_failed_jobs(self, query, body, run_id):
+        return 201, {}, {}
+
+    def _get_membership(self, query, body, team, login):
+        if login in self.state.teams.get(team, set()):
+            return 200, {"state": "active", "role": "member", "url": ""}, {}
+        return 404, {"message": "Not Found"}, {}
+
+    def _get_members(self, query, body, team):
+        members = [self._user(login) for login in sorted(self.state.teams.get(team, set()))]
+        page, headers = self._paginate(
+            f"/orgs/{self.state.owner}/teams/{team}/members", query, members
+        )
+        return 200, page, headers
+
+    def _graphql(self, query, body):
+        text = json.loads(body)["query"]
+        if text.startswith("mutation"):
+            return self._graphql_mutation(text)
+        if "viewer { login }" in text:
+            return self._graphql_identity(text)
+
+        repository = {}
+        for alias, name in GRAPHQL_LABEL.findall(text):
+            repository[f"l{alias}"] = {"id": f"LA_{name}"}
+        for alias, number in GRAPHQL_PR_FIELDS.findall(text):
+            pr = self._pr(number)
+            repository[f"pr{alias}"] = self._graphql_pr_node(pr) if pr else None
+        for alias, number in GRAPHQL_PR_MERGEABLE.findall(text):
+            pr = self._pr(number)
+            mergeable = self.state.read_mergeable(pr) if pr else None
+            repository[f"pr{alias}"] = {
+                "mergeable": {True: "MERGEABLE", False: "CONFLICTING", None: "UNKNOWN"}[mergeable]
+            }
+        for alias, base_ref, head_ref in GRAPHQL_COMPARE.findall(text):
+            pr = self._pr(alias)
+            repository[f"pr{alias}"] = {"compare": {"behindBy": pr["behind_by"] if pr else 0}}
+        return 200, {"data": {"repository": repository}}, {}
+
+    def _graphql_identity(self, text):
+        data = {"viewer": {"login": self.state.authors[0]}}
+        for alias, owner, name in GRAPHQL_REPOSITORY.findall(text):
+            data[f"r{alias}"] = {
+                "nameWithOwner": f"{owner}/{name}",
+                "databaseId": 1,
+                "viewerPermission": "ADMIN",
+                "defaultBranchRef": {"name": "master"},
+            }
+        return 200, {"data": data}, {}
+
+    def _graphql_mutation(self, text):
+        data = {}
+        for alias, number, label_ids in GRAPHQL_ADD_LABELS.findall(text):
+            pr = self._pr(number)
+            with self.state._lock:
+                for label_id in re.findall(r'"LA_(.*?)"', label_ids):
+                    if label_id not in pr["labels"]:
+                        pr["labels"].append(label_id)
+            data[f"pr{alias}"] = {"clientMutationId": None}
+        return 200, {"data": data}, {}
+
+    def _handler_class(self):
+        fake = self
+
+        class FakeGitHubHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length) if length else b""
+                if fake.latency or fake.jitter:
+                    time.sleep(fake.latency + random.uniform(0, fake.jitter))
+
+                status, payload, headers = fake.dispatch(self.command, self.path, body)
+                encoded = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(encoded)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            do_GET = _handle
+            do_POST = _handle
+            do_PUT = _handle
+            do_PATCH = _handle
+            do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return FakeGitHubHandler
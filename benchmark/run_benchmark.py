@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import yaml  # noqa: E402
+
+from benchmark.fake_github import (  # noqa: E402
+    DEFAULT_SCENARIO_WEIGHTS,
+    FakeGitHub,
+    FakeRepositoryState,
+)
+
+
+PHASES = [
+    ("discovery", "github_handler", "find_target_prs"),
+    ("snapshots", "snapshot_loader", "load"),
+    ("behind_counts", "behind_counts", "resolve"),
+    ("mergeability", "mergeability_resolver", "resolve"),
+    ("labels_batch", "label_batcher", "apply"),
+    ("labels", "github_handler", "ensure_required_labels"),
+    ("branch", "github_handler", "check_and_update_branch"),
+    ("ci_status", "github_handler", "check_ci_status"),
+    ("linter", "linter_fixer", "fix_linter_issues"),
+    ("chromatic", "chromatic_handler", "retry_chromatic"),
+    ("approvals", "approval_checker", "check_approvals"),
+    ("can_merge", "github_handler", "can_merge"),
+    ("merge", "github_handler", "merge_pr"),
+]
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def wrap(self, phase, function):
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.seconds[phase] += elapsed
+                    self.calls[phase] += 1
+
+        return timed
+
+    def instrument(self, plumber):
+        for phase, attribute, method in PHASES:
+            target = getattr(plumber, attribute)
+            setattr(target, method, self.wrap(phase, getattr(target, method)))
+
+
+def build_config(fake, state, args, work_dir):
+    return {
+        "github": {
+            "token": "benchmark-token",
+            "repo": state.full_name,
+            "base_url": fake.base_url,
+            "discovery": args.discovery,
+            "seconds_between_requests": args.seconds_between_requests,
+            "seconds_between_writes": args.seconds_between_writes,
+            "snapshot": {"enabled": not args.no_snapshot},
+            "http_cache": {"enabled": False},
+            "mergeability": {"wait_seconds": 0.2},
+        },
+        "authors": {"include_token_owner": True, "allowed_users": state.authors[1:]},
+        "labels": {
+            "trigger": state.trigger_label,
+            "auto_add": ["workdays: Mon-Fri"],
+            "categories": [],
+            "batch": {"enabled": args.label_batch},
+        },
+        "repository": {
+            "local_path": str(work_dir / "clone"),
+            "max_commits_behind": 100,
+            "behind_counts": {"local": False},
+        },
+        "approvals": {
+            "minimum_count": args.reviews,
+            "team_cache": {"path": str(work_dir / "team-cache.json")},
+        },
+        "processing": {"workers": args.workers},
+        "merge_planner": {"enabled": args.merge_planner},
+        "linter": {"fix_command": "true"},
+        "logging": {"level": "WARNING", "directory": str(work_dir / "logs")},
+    }
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_single(args, pr_count):
+    from src.ci_plumber import CIPlumber
+    from src.logger_setup import shutdown_logging
+
+    state = FakeRepositoryState(
+        pr_count=pr_count,
+        seed=args.seed,
+        teams=args.teams,
+        team_size=args.team_size,
+        scenario_weights=args.scenario_weights,
+        reviews=args.reviews,
+        team_review_rate=args.team_review_rate,
+        statuses=args.statuses,
+        check_runs=args.check_runs,
+        chromatic_workflows=args.chromatic_workflows,
+    )
+    fake = FakeGitHub(
+        state,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        per_page=args.per_page,
+    ).start()
+
+    with tempfile.TemporaryDirectory(prefix="ci-plumber-bench-") as work_dir:
+        work_dir = Path(work_dir)
+        config_path = work_dir / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.safe_dump(build_config(fake, state, args, work_dir), f)
+
+        timer = PhaseTimer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            plumber = CIPlumber(str(config_path))
+            startup = time.perf_counter() - started
+
+            # The linter phase shells out to git and npm; the benchmark only measures
+            # the GitHub side, so fixes are timed as no-ops.
+            plumber.linter_fixer.fix_linter_issues = lambda pr, snapshot=None: None
+            timer.instrument(plumber)
+
+            started = time.perf_counter()
+            plumber.run()
+            wall = time.perf_counter() - started
+
+        shutdown_logging()
+
+    fake.stop()
+    merged = sum(1 for pr in state.pull_requests.values() if pr["merged"])
+    return {
+        "prs": pr_count,
+        "startup_seconds": round(startup, 3),
+        "wall_seconds": round(wall, 3),
+        "api_calls": sum(fake.calls.values()),
+        "api_calls_by_endpoint": dict(fake.calls.most_common()),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "merged": merged,
+        "options": forwarded_args(args),
+        "phases": {
+            phase: {"seconds": round(timer.seconds[phase], 3), "calls": timer.calls[phase]}
+            for phase, _, _ in PHASES
+        },
+    }
+
+
+def run_isolated(args, pr_count):
+    # Each size runs in its own interpreter so peak RSS is not carried over.
+    command = [sys.executable, __file__, "--single", str(pr_count)] + forwarded_args(args)
+    output = subprocess.run(command, capture_output=True, text=True)
+    if output.returncode != 0:
+        raise RuntimeError(f"Benchmark for {pr_count} PRs failed:\n{output.stderr}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def forwarded_args(args):
+    forwarded = [
+        f"--workers={args.workers}",
+        f"--latency-ms={args.latency_ms}",
+        f"--jitter-ms={args.jitter_ms}",
+        f"--per-page={args.per_page}",
+        f"--seed={args.seed}",
+        f"--discovery={args.discovery}",
+        f"--seconds-between-requests={args.seconds_between_requests}",
+        f"--seconds-between-writes={args.seconds_between_writes}",
+        "--scenario-weights="
+        + ",".join(f"{name}={weight}" for name, weight in args.scenario_weights.items()),
+        f"--reviews={args.reviews}",
+        f"--teams={args.teams}",
+        f"--team-size={args.team_size}",
+        f"--team-review-rate={args.team_review_rate}",
+        f"--statuses={args.statuses}",
+        f"--check-runs={args.check_runs}",
+        f"--chromatic-workflows={args.chromatic_workflows}",
+    ]
+    if args.no_snapshot:
+        forwarded.append("--no-snapshot")
+    if args.label_batch:
+        forwarded.append("--label-batch")
+    if args.merge_planner:
+        forwarded.append("--merge-planner")
+    return forwarded
+
+
+def print_report(results):
+    print(f"{'PRs':>6} {'startup':>9} {'wall':>9} {'API calls':>10} {'peak RSS':>10} {'merged':>7}")
+    for result in results:
+        print(
+            f"{result['prs']:>6} {result['startup_seconds']:>8.2f}s {result['wall_seconds']:>8.2f}s "
+            f"{result['api_calls']:>10} {result['peak_rss_mb']:>8.1f}MB {result['merged']:>7}"
+        )
+
+    for result in results:
+        print(f"\n── {result['prs']} PRs: time per phase (summed over PRs and workers) ──")
+        for phase, stats in result["phases"].items():
+            if stats["calls"]:
+                print(f"  {phase:<14} {stats['seconds']:>8.2f}s  {stats['calls']:>6} calls")
+        print(f"── {result['prs']} PRs: API calls by endpoint ──")
+        for endpoint, count in result["api_calls_by_endpoint"].items():
+            print(f"  {count:>6}  {endpoint}")
+
+
+def compare_to_baseline(results, args):
+    with open(args.baseline, "r") as f:
+        baseline = {result["prs"]: result for result in json.load(f)}
+
+    print(f"\n── Compared to {args.baseline} ──")
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["prs"])
+        if previous is None:
+            print(f"  {result['prs']:>6} PRs: not in the baseline, skipped")
+            continue
+        if previous.get("options") not in (None, result["options"]):
+            print(f"  ⚠️  {result['prs']} PRs: baseline was run with different options")
+
+        for metric, limit in (
+            ("api_calls", args.max_api_calls_increase),
+            ("wall_seconds", args.max_wall_increase),
+        ):
+            before, after = previous[metric], result[metric]
+            change = (after - before) / before * 100 if before else 0.0
+            regressed = change > limit
+            print(
+                f"  {result['prs']:>6} PRs  {metric:<13} {before:>10} → {after:<10} "
+                f"{change:+6.1f}% (limit +{limit:g}%){'  ❌' if regressed else ''}"
+            )
+            if regressed:
+                regressions.append(f"{result['prs']} PRs {metric}")
+
+    if regressions:
+        print(f"\n❌ Regressed against the baseline: {', '.join(regressions)}")
+    else:
+        print("\n✅ No regression against the baseline")
+    return not regressions
+
+
+def scenario_weights(value):
+    weights = dict(DEFAULT_SCENARIO_WEIGHTS)
+    for item in filter(None, value.split(",")):
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_SCENARIO_WEIGHTS:
+            raise argparse.ArgumentTypeError(
+                f"unknown scenario '{name}', expected one of {', '.join(DEFAULT_SCENARIO_WEIGHTS)}"
+            )
+        try:
+            weights[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"weight of '{name}' is not a number: {weight!r}")
+    if not any(weights.values()):
+        raise argparse.ArgumentTypeError("at least one scenario needs a weight above 0")
+    return weights
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark CIPlumber.run against a fake GitHub.")
+    parser.add_argument("--prs", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--per-page", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--discovery", choices=["search", "list"], default="search")
+    parser.add_argument("--no-snapshot", action="store_true")
+    parser.add_argument("--label-batch", action="store_true", help="label all PRs in one mutation")
+    parser.add_argument(
+        "--merge-planner", action="store_true", help="merge ready PRs in planned order"
+    )
+    # PyGithub's own throttles (0.25s per request, 1s per write) would dominate the
+    # numbers, so they are off unless asked for.
+    parser.add_argument("--seconds-between-requests", type=float, default=0)
+    parser.add_argument("--seconds-between-writes", type=float, default=0)
+    parser.add_argument(
+        "--scenario-weights",
+        type=scenario_weights,
+        default=dict(DEFAULT_SCENARIO_WEIGHTS),
+        metavar="NAME=WEIGHT,...",
+        help="relative weights of green, pending, chromatic, unapproved and conflicting PRs",
+    )
+    parser.add_argument("--reviews", type=int, default=2, help="approvals on an approved PR")
+    parser.add_argument("--teams", type=int, default=3)
+    parser.add_argument("--team-size", type=int, default=25)
+    parser.add_argument(
+        "--team-review-rate", type=float, default=0.3, help="share of PRs requesting a team"
+    )
+    parser.add_argument("--statuses", type=int, default=1, help="commit statuses per PR")
+    parser.add_argument("--check-runs", type=int, default=2, help="non-Chromatic check runs")
+    parser.add_argument("--chromatic-workflows", type=int, default=1)
+    parser.add_argument("--json", metavar="PATH", help="also write the results to a JSON file")
+    parser.add_argument(
+        "--baseline", metavar="PATH", help="compare against a --json result and fail on regression"
+    )
+    parser.add_argument(
+        "--max-api-calls-increase",
+        type=float,
+        default=5,
+        metavar="PCT",
+        help="allowed API call increase over the baseline",
+    )
+    parser.add_argument(
+        "--max-wall-increase",
+        type=float,
+        default=25,
+        metavar="PCT",
+        help="allowed wall time increase over the baseline",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.single is not None:
+        print(json.dumps(run_single(args, args.single)))
+        return
+
+    results = []
+    for pr_count in args.prs:
+        print(f"⏱️  Benchmarking {pr_count} PRs...", file=sys.stderr)
+        results.append(run_isolated(args, pr_count))
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {os.path.abspath(args.json)}")
+    if args.baseline and not compare_to_baseline(results, args):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,34 @@
-from .approval_checker import ApprovalChecker
-from .chromatic_handler import ChromaticHandler
-from .ci_plumber import CIPlumber
-from .ci_status import CIStatus
-from .config_loader import ConfigLoader
-from .console_utils import Colors, print_header, print_section_separator, print_success_box
-from .github_handler import GitHubHandler
-from .linter_fixer import LinterFixer
-from .logger_setup import ColoredFormatter, setup_logging
+from importlib import import_module
 
 
-__all__ = [
-    "CIPlumber",
-    "ConfigLoader",
-    "setup_logging",
-    "ColoredFormatter",
-    "GitHubHandler",
-    "LinterFixer",
-    "ChromaticHandler",
-    "ApprovalChecker",
-    "CIStatus",
-    "Colors",
-    "print_header",
-    "print_section_separator",
-    "print_success_box",
-]
+# Submodules are imported on first attribute access, so `python src/main.py` does not
+# pay for GitPython and the linter stack on runs that never touch them.
+_EXPORTS = {
+    "CIPlumber": ".ci_plumber",
+    "ConfigLoader": ".config_loader",
+    "setup_logging": ".logger_setup",
+    "ColoredFormatter": ".logger_setup",
+    "GitHubHandler": ".github_handler",
+    "LinterFixer": ".linter_fixer",
+    "ChromaticHandler": ".chromatic_handler",
+    "ApprovalChecker": ".approval_checker",
+    "CIStatus": ".ci_status",
+    "Colors": ".console_utils",
+    "print_header": ".console_utils",
+    "print_section_separator": ".console_utils",
+    "print_success_box": ".console_utils",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
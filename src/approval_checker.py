@@ -2,20 +2,26 @@
 
 
 class ApprovalChecker:
-    def __init__(self, repo, config, logger):
+    def __init__(self, repo, config, logger, team_cache):
         self.repo = repo
         self.config = config
         self.logger = logger
+        self.team_cache = team_cache
+        self.organization = config["github"]["repo"].split("/", 1)[0]
+
+    def check_approvals(self, pr, snapshot=None):
+        if snapshot is not None:
+            reviews = [(review.user, review.state) for review in snapshot.reviews]
+        else:
+            reviews = [(review.user.login, review.state) for review in pr.get_reviews()]
 
-    def check_approvals(self, pr):
-        reviews = pr.get_reviews()
         approved_users = set()
         has_changes_requested = False
 
-        for review in reviews:
-            if review.state == "APPROVED":
-                approved_users.add(review.user.login)
-            elif review.state == "CHANGES_REQUESTED":
+        for user, state in reviews:
+            if state == "APPROVED":
+                approved_users.add(user)
+            elif state == "CHANGES_REQUESTED":
                 has_changes_requested = True
 
         if has_changes_requested:
@@ -33,9 +39,7 @@ class ApprovalChecker:
             }
 
         try:
-            requested_reviewers = pr.get_review_requests()
-            requested_users = [user.login for user in requested_reviewers[0]]
-            requested_teams = [team.slug for team in requested_reviewers[1]]
+            requested_users, requested_teams = self._requested_reviewers(pr, snapshot)
 
             missing_users = [user for user in requested_users if user not in approved_users]
             missing_teams = self._check_team_approvals(requested_teams, approved_users)
@@ -54,16 +58,21 @@ class ApprovalChecker:
 
         return {"approved": True, "count": approval_count}
 
+    def _requested_reviewers(self, pr, snapshot):
+        if snapshot is not None:
+            return list(snapshot.requested_users), list(snapshot.requested_teams)
+
+        requested_reviewers = pr.get_review_requests()
+        requested_users = [user.login for user in requested_reviewers[0]]
+        requested_teams = [team.slug for team in requested_reviewers[1]]
+        return requested_users, requested_teams
+
     def _check_team_approvals(self, requested_teams, approved_users):
         missing_teams = []
 
         for team in requested_teams:
             try:
-                team_obj = self.repo.organization.get_team_by_slug(team)
-                team_members = [member.login for member in team_obj.get_members()]
-
-                team_approved = any(member in approved_users for member in team_members)
-                if not team_approved:
+                if not self.team_cache.any_member(self.organization, team, approved_users):
                     missing_teams.append(team)
             except Exception as e:
                 self.logger.warning(f"⚠️  Could not check team '{team}': {e}")
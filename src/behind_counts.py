@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+import json
+import os
+from dataclasses import replace
+from pathlib import Path
+
+
+class BehindCountResolver:
+    def __init__(self, repo, config, logger, snapshot_loader):
+        self.repo = repo
+        self.logger = logger
+        self.snapshot_loader = snapshot_loader
+
+        repository_config = config["repository"]
+        behind_config = repository_config.get("behind_counts", {})
+        default_path = Path(config["logging"]["directory"]) / "behind-cache.json"
+        self.path = Path(behind_config.get("cache_file", default_path))
+        self.max_entries = behind_config.get("max_entries", 5000)
+        self.use_local = behind_config.get("local", True)
+
+        local_path = repository_config["local_path"].rstrip("/")
+        worktree_config = repository_config.get("worktrees", {})
+        if worktree_config.get("enabled", False):
+            self.mirror_path = worktree_config.get("bare_path", f"{local_path}.git")
+        else:
+            self.mirror_path = local_path
+
+        self._entries = None
+
+    def resolve(self, snapshots):
+        entries = self._load()
+        pending = []
+        sources = {"cached": 0, "local git": 0, "GraphQL": 0, "compare": 0}
+
+        for snapshot in snapshots.values():
+            if snapshot.base_sha is None:
+                continue
+            cached = entries.get(self._key(snapshot))
+            if cached is not None:
+                snapshots[snapshot.number] = replace(snapshot, behind_by=cached)
+                sources["cached"] += 1
+            else:
+                pending.append(snapshot)
+
+        for source, counter in [
+            ("local git", self._count_locally),
+            ("GraphQL", self._count_with_graphql),
+            ("compare", self._count_with_compare),
+        ]:
+            if not pending:
+                break
+            counts = counter(pending)
+            for snapshot in pending:
+                if snapshot.number in counts:
+                    behind_by = counts[snapshot.number]
+                    snapshots[snapshot.number] = replace(snapshot, behind_by=behind_by)
+                    self._store(entries, self._key(snapshot), behind_by)
+                    sources[source] += 1
+            pending = [snapshot for snapshot in pending if snapshot.number not in counts]
+
+        if any(sources[source] for source in ("local git", "GraphQL", "compare")):
+            self._save(entries)
+
+        summary = ", ".join(f"{count} {source}" for source, count in sources.items() if count)
+        self.logger.info(f"📊 Behind counts for {len(snapshots)} PRs: {summary or 'none needed'}")
+
+    @staticmethod
+    def _key(snapshot):
+        return f"{snapshot.base_sha}:{snapshot.head_sha}"
+
+    def _count_locally(self, snapshots):
+        if not self.use_local or not os.path.isdir(self.mirror_path):
+            return {}
+
+        # Imported here so runs without a local clone never load GitPython.
+        from git import GitCommandError, InvalidGitRepositoryError, NoSuchPathError, Repo
+
+        try:
+            mirror = Repo(self.mirror_path)
+            if mirror.git.rev_parse("--is-shallow-repository") == "true":
+                return {}
+        except (GitCommandError, InvalidGitRepositoryError, NoSuchPathError):
+            return {}
+
+        counts = {}
+        for snapshot in snapshots:
+            try:
+                counts[snapshot.number] = int(
+                    mirror.git.rev_list("--count", f"{snapshot.head_sha}..{snapshot.base_sha}")
+                )
+            except GitCommandError:
+                # One of the commits has not been fetched into the mirror yet.
+                continue
+        return counts
+
+    def _count_with_graphql(self, snapshots):
+        try:
+            return self.snapshot_loader.load_behind_counts(snapshots)
+        except Exception as e:
+            self.logger.warning(f"⚠️  Could not load behind counts over GraphQL: {e}")
+            return {}
+
+    def _count_with_compare(self, snapshots):
+        counts = {}
+        for snapshot in snapshots:
+            try:
+                comparison = self.repo.compare(snapshot.base_sha, snapshot.head_sha)
+                counts[snapshot.number] = comparison.behind_by
+            except Exception as e:
+                self.logger.warning(f"⚠️  Could not compare PR #{snapshot.number}: {e}")
+        return counts
+
+    def _store(self, entries, key, behind_by):
+        entries.pop(key, None)
+        entries[key] = behind_by
+        while len(entries) > self.max_entries:
+            entries.pop(next(iter(entries)))
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            if self.path.exists():
+                try:
+                    with open(self.path, "r") as f:
+                        self._entries = json.load(f)
+                except (OSError, ValueError) as e:
+                    self.logger.warning(f"⚠️  Ignoring unreadable behind-count cache: {e}")
+        return self._entries
+
+    def _save(self, entries):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
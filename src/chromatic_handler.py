@@ -1,50 +1,93 @@
 #!/usr/bin/env python3
 
+import re
+
 from github import GithubException
 
+from .ci_status import CIStatus
+from .github_client import request_repo_endpoint
+
+
+WORKFLOW_RUN_URL = re.compile(r"/actions/runs/(\d+)")
+
 
 class ChromaticHandler:
-    def __init__(self, repo, logger):
+    def __init__(self, repo, logger, status_cache):
         self.repo = repo
         self.logger = logger
+        self.status_cache = status_cache
+        self._chromatic_workflows = None
+
+    def clear(self):
+        self._chromatic_workflows = None
 
-    def retry_chromatic(self, pr):
+    def retry_chromatic(self, pr, snapshot=None):
         try:
-            commit = self.repo.get_commit(pr.head.sha)
-            check_runs = commit.get_check_runs()
+            if snapshot is not None:
+                head_sha, head_ref = snapshot.head_sha, snapshot.head_ref
+            else:
+                head_sha, head_ref = pr.head.sha, pr.head.ref
+            check_runs = self.status_cache.get(head_sha).check_runs
+
+            failed_checks = [
+                check
+                for check in check_runs
+                if CIStatus.is_chromatic_check(check.name) and check.conclusion == "failure"
+            ]
+            for check in failed_checks:
+                self.logger.info(f"🔄 Found failed Chromatic check: {check.name}")
+
+            run_ids = {self._workflow_run_id(check) for check in failed_checks} - {None}
+            if not run_ids:
+                self.logger.info("🔍 Looking for Chromatic workflow runs to retry...")
+                run_ids = self._find_failed_runs(head_sha, head_ref)
 
             retried_any = False
-            for check in check_runs:
-                if "chromatic" in check.name.lower() and check.conclusion == "failure":
-                    self.logger.info(f"🔄 Found failed Chromatic check: {check.name}")
-                    retried_any = True
+            for run_id in sorted(run_ids):
+                retried_any = self._rerun_failed_jobs(run_id) or retried_any
 
             if retried_any:
-                self.logger.info("🔍 Looking for Chromatic workflows to retry...")
-
-            workflows = self.repo.get_workflows()
-            for workflow in workflows:
-                if "chromatic" in workflow.name.lower():
-                    runs = workflow.get_runs(branch=pr.head.ref, event="pull_request")
-                    for run in runs:
-                        if run.head_sha == pr.head.sha and run.conclusion == "failure":
-                            self.logger.info(
-                                f"🔄 Re-running workflow: {workflow.name} (run #{run.id})"
-                            )
-                            try:
-                                run.rerun()
-                                self.logger.info(f"✅ Successfully re-ran workflow {workflow.name}")
-                                retried_any = True
-                            except GithubException as e:
-                                self.logger.warning(
-                                    f"⚠️  Could not re-run workflow {workflow.name}: {e}"
-                                )
-                            break
-
-            if not retried_any:
+                self.status_cache.invalidate(head_sha)
+            else:
                 self.logger.info(
                     f"ℹ️  No failed Chromatic checks found to retry for PR #{pr.number}"
                 )
 
         except Exception as e:
             self.logger.error(f"Failed to retry chromatic for PR #{pr.number}: {e}", exc_info=True)
+
+    @staticmethod
+    def _workflow_run_id(check):
+        if check.workflow_run_id:
+            return check.workflow_run_id
+        match = WORKFLOW_RUN_URL.search(check.details_url or "")
+        return int(match.group(1)) if match else None
+
+    def _find_failed_runs(self, head_sha, head_ref):
+        run_ids = set()
+        for workflow in self._get_chromatic_workflows():
+            runs = workflow.get_runs(branch=head_ref, event="pull_request", head_sha=head_sha)
+            for run in runs:
+                if run.head_sha == head_sha and run.conclusion == "failure":
+                    run_ids.add(run.id)
+                    break
+        return run_ids
+
+    def _get_chromatic_workflows(self):
+        if self._chromatic_workflows is None:
+            self._chromatic_workflows = [
+                workflow
+                for workflow in self.repo.get_workflows()
+                if CIStatus.is_chromatic_check(workflow.name)
+            ]
+        return self._chromatic_workflows
+
+    def _rerun_failed_jobs(self, run_id):
+        self.logger.info(f"🔄 Re-running failed jobs of workflow run #{run_id}")
+        try:
+            request_repo_endpoint(self.repo, "POST", f"/actions/runs/{run_id}/rerun-failed-jobs")
+            self.logger.info(f"✅ Successfully re-ran failed jobs of workflow run #{run_id}")
+            return True
+        except GithubException as e:
+            self.logger.warning(f"⚠️  Could not re-run workflow run #{run_id}: {e}")
+            return False
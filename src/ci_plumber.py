@@ -1,34 +1,107 @@
 #!/usr/bin/env python3
 
-from github import Github
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from github import GithubException
 
 from .approval_checker import ApprovalChecker
+from .behind_counts import BehindCountResolver
 from .chromatic_handler import ChromaticHandler
 from .ci_status import CIStatus
+from .commit_status_cache import CommitStatusCache
 from .config_loader import ConfigLoader
 from .console_utils import print_header, print_section_separator, print_success_box
 from .github_handler import GitHubHandler
-from .linter_fixer import LinterFixer
-from .logger_setup import setup_logging
+from .label_batcher import LabelBatcher
+from .merge_planner import MergePlanner
+from .merge_watcher import MergeWatcher
+from .mergeability import MergeabilityResolver
+from .pr_snapshot import PRSnapshotLoader
+from .request_gateway import OPTIONAL, request_priority
+from .run_metrics import RunMetrics
+from .shared_context import SharedContext
+from .startup_profile import startup_profile
+from .state_store import RunStateStore
 
 
 class CIPlumber:
-    def __init__(self, config_path="cfg/config.yaml"):
-        self.config = ConfigLoader.load(config_path)
+    def __init__(self, config_path="cfg/config.yaml", config=None, shared=None):
+        self.config = config if config is not None else ConfigLoader.load(config_path)
         self._validate_config()
-        self.logger = setup_logging(self.config)
-        self.github = Github(self.config["github"]["token"])
-        self.repo = self.github.get_repo(self.config["github"]["repo"])
 
-        self.token_owner = self.github.get_user().login
+        # A process handling several repositories passes in one shared context so
+        # the client, rate-limit budget and team cache are not duplicated.
+        self.repo_name = self.config["github"]["repo"]
+        self.owns_shared = shared is None
+        self.shared = shared if shared is not None else SharedContext(self.config, [self.repo_name])
+        self.logger = self.shared.logger
+        self.log_buffer = self.shared.log_buffer
+        self.http_cache = self.shared.http_cache
+        self.gateway = self.shared.gateway
+        self.github = self.shared.github
+        self.token_owner = self.shared.token_owner
+        self.team_cache = self.shared.team_cache
+
+        self.repo = self.shared.repository(self.repo_name)
+        self.metrics = RunMetrics(self.config, self.logger)
+
         self.allowed_authors = self._build_allowed_authors()
-        self.logger.info(f"🔑 Detected token owner: {self.token_owner}")
-        self.logger.info(f"👥 Allowed PR authors: {', '.join(self.allowed_authors)}")
+        self.logger.info(
+            f"👥 Allowed PR authors for {self.repo_name}: {', '.join(self.allowed_authors)}"
+        )
+
+        self.status_cache = CommitStatusCache(self.repo, self.logger)
+        self.github_handler = GitHubHandler(
+            self.github, self.repo, self.config, self.logger, self.status_cache
+        )
+        self.label_batcher = LabelBatcher(self.repo, self.config, self.logger, self.github_handler)
+        # Created on first use: runs without linter failures never load GitPython.
+        self._linter_fixer = None
+        self._linter_fixer_lock = threading.Lock()
+        self._cancelled = False
+        self.chromatic_handler = ChromaticHandler(self.repo, self.logger, self.status_cache)
+        self.approval_checker = ApprovalChecker(
+            self.repo, self.config, self.logger, self.team_cache
+        )
+        self.snapshot_loader = PRSnapshotLoader(self.repo, self.config, self.logger)
+        self.behind_counts = BehindCountResolver(
+            self.repo, self.config, self.logger, self.snapshot_loader
+        )
+        self.mergeability_resolver = MergeabilityResolver(
+            self.config, self.logger, self.snapshot_loader
+        )
 
-        self.github_handler = GitHubHandler(self.repo, self.config, self.logger)
-        self.linter_fixer = LinterFixer(self.config, self.logger)
-        self.chromatic_handler = ChromaticHandler(self.repo, self.logger)
-        self.approval_checker = ApprovalChecker(self.repo, self.config, self.logger)
+        self.state_store = None
+        if self.config.get("state", {}).get("enabled", False):
+            self.state_store = RunStateStore(self.config, self.logger, self.status_cache)
+        self.pr_inputs = {}
+        self.head_shas = {}
+
+        self.merge_watcher = None
+        if self.config.get("watch", {}).get("enabled", False):
+            self.merge_watcher = MergeWatcher(
+                self.config, self.logger, self.github_handler, self.status_cache
+            )
+        self.waiting_prs = []
+        self.unknown_mergeable = set()
+        self.merge_planner = MergePlanner(self.config, self.logger)
+        self.ready_prs = []
+        startup_profile.mark("repository setup")
+
+    @property
+    def linter_fixer(self):
+        with self._linter_fixer_lock:
+            if self._linter_fixer is None:
+                from .linter_fixer import LinterFixer
+
+                self._linter_fixer = LinterFixer(
+                    self.config, self.logger, self.status_cache, self.metrics
+                )
+                if self._cancelled:
+                    self._linter_fixer.cancel()
+            return self._linter_fixer
 
     def _validate_config(self):
         if "authors" not in self.config:
@@ -49,64 +122,292 @@ class CIPlumber:
 
         return allowed
 
-    def run(self):
-        print_header("🔧 CI Plumber Starting...")
-        self.logger.info("Starting CI Plumber run")
+    def run(self, watch=True):
+        if self.owns_shared:
+            print_header("🔧 CI Plumber Starting...")
+        self.logger.info(f"Starting CI Plumber run for {self.repo_name}")
 
-        try:
-            self.logger.info(f"Searching for PRs with label '{self.config['labels']['trigger']}'")
-            all_prs = self.github_handler.find_target_prs()
+        with self.metrics.run():
+            try:
+                self.logger.info(
+                    f"Searching for PRs with label '{self.config['labels']['trigger']}'"
+                )
+                with self.metrics.phase("discovery"):
+                    all_prs = self.github_handler.find_target_prs(self.allowed_authors)
+                startup_profile.mark("PR discovery")
+                self.logger.info(
+                    f"🔍 Found {len(all_prs)} PRs with label '{self.config['labels']['trigger']}'"
+                )
+
+                prs = self._filter_by_authors(all_prs)
+                self.logger.info(f"👥 Processing {len(prs)} PRs from allowed authors")
+
+                self.status_cache.clear()
+                self.chromatic_handler.clear()
+                self.head_shas = {}
+                self._process_prs(prs)
+
+                if watch and self.waiting_prs:
+                    with self.metrics.phase("watch"):
+                        self.merge_watcher.watch(self.waiting_prs)
+
+            except Exception as e:
+                self.logger.error(f"💥 Fatal error during run: {e}", exc_info=True)
+            startup_profile.report(self.logger, "run")
+
+        if self.owns_shared:
+            self.shared.log_summaries()
+            print_success_box("✅ CI Plumber Run Completed!")
+
+    def run_pr(self, number):
+        pr = self.repo.get_pull(number)
+        trigger_label = self.config["labels"]["trigger"]
+
+        if pr.state != "open" or trigger_label not in [label.name for label in pr.labels]:
             self.logger.info(
-                f"🔍 Found {len(all_prs)} PRs with label '{self.config['labels']['trigger']}'"
+                f"⏭ PR #{number} is closed or not labeled '{trigger_label}' - skipping"
             )
+            self.head_shas.pop(number, None)
+            return
+
+        if not self._filter_by_authors([pr]):
+            return
 
-            prs = self._filter_by_authors(all_prs)
-            self.logger.info(f"👥 Processing {len(prs)} PRs from allowed authors")
+        self.head_shas[number] = pr.head.sha
+        self.status_cache.invalidate(pr.head.sha)
+        with self.metrics.run():
+            self._process_prs([pr])
 
+    def cancel(self):
+        self.logger.info(f"🛑 Cancelling linter fixes for {self.repo_name}")
+        with self._linter_fixer_lock:
+            self._cancelled = True
+            if self._linter_fixer is not None:
+                self._linter_fixer.cancel()
+
+    def prs_for_sha(self, head_sha):
+        numbers = [number for number, sha in list(self.head_shas.items()) if sha == head_sha]
+        if numbers:
+            return numbers
+        return self.github_handler.find_prs_for_sha(head_sha)
+
+    def _process_prs(self, prs):
+        self.waiting_prs = []
+        self.ready_prs = []
+        with self.metrics.phase("snapshots"):
+            snapshots = self.snapshot_loader.load(prs) if self.snapshot_loader.enabled() else {}
+        if snapshots:
+            with self.metrics.phase("behind_counts"):
+                self.behind_counts.resolve(snapshots)
+        for snapshot in snapshots.values():
+            self.status_cache.prime(snapshot.status)
+            self.head_shas[snapshot.number] = snapshot.head_sha
+
+        if self.state_store is not None:
+            prs = self._select_changed_prs(prs, snapshots)
+
+        with self.metrics.phase("mergeability"):
+            self.unknown_mergeable = self.mergeability_resolver.resolve(prs, snapshots)
+        if self.label_batcher.enabled and snapshots:
+            with self.metrics.phase("labels_batch"):
+                self.label_batcher.apply(snapshots, [pr.number for pr in prs])
+        if self.state_store is not None:
             for pr in prs:
-                print_section_separator()
-                self.logger.info(f"🔄 Processing PR #{pr.number}: {pr.title}")
-                print_section_separator()
-                self._process_pr(pr)
+                if pr.number in self.pr_inputs:
+                    inputs = self._build_inputs(pr, snapshots.get(pr.number))
+                    if inputs is None:
+                        del self.pr_inputs[pr.number]
+                    else:
+                        self.pr_inputs[pr.number] = inputs
 
-        except Exception as e:
-            self.logger.error(f"💥 Fatal error during run: {e}", exc_info=True)
+        startup_profile.report(self.logger, "snapshots and prefetch")
+        workers = self.config.get("processing", {}).get("workers", 1)
+        if workers > 1 and len(prs) > 1:
+            self._process_prs_concurrently(prs, snapshots, workers)
+        elif self.owns_shared:
+            for pr in prs:
+                self._print_pr_header(pr)
+                self._evaluate_pr(pr, snapshots.get(pr.number))
+        else:
+            # Other repositories are logging at the same time, so each PR's lines
+            # are still written as one block under a header naming the repository.
+            for pr in prs:
+                self._process_pr_buffered(pr, snapshots.get(pr.number))
 
-        print_success_box("✅ CI Plumber Run Completed!")
+        if self.ready_prs:
+            if self.owns_shared:
+                self._print_merge_header()
+                self._merge_ready_prs()
+            else:
+                with self.log_buffer.capture(self.logger, header=self._print_merge_header):
+                    self._merge_ready_prs()
+
+    def _merge_ready_prs(self):
+        decisions = self.merge_planner.merge_all(
+            self.ready_prs, self._merge_planned, self._update_deferred
+        )
+        for pr, _ in self.ready_prs:
+            self._record_decision(pr, decisions[pr.number])
+
+    def _select_changed_prs(self, prs, snapshots):
+        self.pr_inputs = {}
+        selected = []
+
+        for pr in prs:
+            inputs = self._build_inputs(pr, snapshots.get(pr.number))
+            if inputs is None:
+                selected.append(pr)
+                continue
+
+            needed, reason = self.state_store.needs_evaluation(pr.number, inputs)
+            if needed:
+                self.logger.info(f"🔁 PR #{pr.number} will be evaluated - {reason}")
+                self.pr_inputs[pr.number] = inputs
+                selected.append(pr)
+            else:
+                self.logger.info(f"💤 PR #{pr.number} skipped - {reason}")
+
+        self.logger.info(f"📋 Evaluating {len(selected)}/{len(prs)} PRs with changed inputs")
+        return selected
 
-    def _process_pr(self, pr):
+    def _build_inputs(self, pr, snapshot):
         try:
-            self.github_handler.ensure_required_labels(pr)
+            return self.state_store.build_inputs(pr, snapshot)
+        except GithubException as e:
+            # Without its inputs a PR can be neither compared nor recorded.
+            self.logger.warning(
+                f"⚠️  Could not read the inputs of PR #{pr.number}, evaluating it "
+                f"without recording: {e}"
+            )
+            return None
+
+    def _evaluate_pr(self, pr, snapshot):
+        decision = self._process_pr(pr, snapshot)
+        # Ready PRs get their decision once the merge plan has run.
+        if decision != "ready_to_merge":
+            self._record_decision(pr, decision)
+
+    def _record_decision(self, pr, decision):
+        self.metrics.record_decision(pr.number, decision)
+
+        if self.state_store is not None and pr.number in self.pr_inputs:
+            self.state_store.record_decision(
+                pr.number,
+                self.pr_inputs[pr.number],
+                decision,
+                mergeable_known=pr.number not in self.unknown_mergeable,
+            )
+
+    def _print_pr_header(self, pr):
+        print_section_separator()
+        where = f"PR #{pr.number}" if self.owns_shared else f"{self.repo_name}#{pr.number}"
+        self.logger.info(f"🔄 Processing {where}: {pr.title}")
+        print_section_separator()
+
+    def _print_merge_header(self):
+        print_section_separator()
+        if not self.owns_shared:
+            self.logger.info(f"🗺️  Merging ready PRs of {self.repo_name}")
 
-            self.github_handler.check_and_update_branch(pr)
+    def _process_prs_concurrently(self, prs, snapshots, workers):
+        self.logger.info(f"⚡ Processing PRs with {workers} workers")
 
-            ci_status = self.github_handler.check_ci_status(pr)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pr-worker") as executor:
+            # Each worker gets a copy of this context so run metrics see its API calls.
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._process_pr_buffered,
+                    pr,
+                    snapshots.get(pr.number),
+                )
+                for pr in prs
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            except KeyboardInterrupt:
+                # Leaving the executor waits for the workers, so stop their linter runs.
+                self.cancel()
+                raise
+
+    def _process_pr_buffered(self, pr, snapshot):
+        with self.log_buffer.capture(self.logger, header=lambda: self._print_pr_header(pr)):
+            self._evaluate_pr(pr, snapshot)
+
+    def _process_pr(self, pr, snapshot=None):
+        try:
+            with self.metrics.phase("labels", pr.number), request_priority(OPTIONAL):
+                self.github_handler.ensure_required_labels(pr, snapshot)
+
+            # With the merge planner, a PR that turns out to be ready is merged as it
+            # is, so its branch update (and the CI run it starts) waits until then.
+            if not self.merge_planner.enabled:
+                with self.metrics.phase("branch", pr.number):
+                    self.github_handler.check_and_update_branch(pr, snapshot)
+
+            with self.metrics.phase("ci_status", pr.number):
+                ci_status = self.github_handler.check_ci_status(pr, snapshot)
             self.logger.info(f"🔍 PR #{pr.number} CI status: {ci_status}")
 
             if CIStatus.LINTER_FAILED in ci_status:
                 self.logger.info(f"🔧 PR #{pr.number} has linter failures, attempting fix")
-                self.linter_fixer.fix_linter_issues(pr)
+                with self.metrics.phase("linter", pr.number):
+                    self.linter_fixer.fix_linter_issues(pr, snapshot)
 
             if CIStatus.CHROMATIC_FAILED in ci_status:
                 self.logger.info(f"🎨 PR #{pr.number} has chromatic failures, retrying workflow")
-                self.chromatic_handler.retry_chromatic(pr)
+                with self.metrics.phase("chromatic", pr.number):
+                    self.chromatic_handler.retry_chromatic(pr, snapshot)
 
-            approval_check = self.approval_checker.check_approvals(pr)
-            can_merge = self._can_merge_with_approvals(pr, approval_check)
+            with self.metrics.phase("approvals", pr.number):
+                approval_check = self.approval_checker.check_approvals(pr, snapshot)
 
+            with self.metrics.phase("merge", pr.number):
+                can_merge = self._can_merge_with_approvals(pr, approval_check, snapshot)
+                if can_merge and not self.merge_planner.enabled:
+                    self.logger.info(f"✅ PR #{pr.number} is ready to merge")
+                    merged = self.github_handler.merge_pr(pr)
+            if can_merge and self.merge_planner.enabled:
+                self.logger.info(f"✅ PR #{pr.number} is ready to merge - added to the merge plan")
+                self.ready_prs.append((pr, snapshot))
+                return "ready_to_merge"
             if can_merge:
-                self.logger.info(f"✅ PR #{pr.number} is ready to merge")
-                self.github_handler.merge_pr(pr)
-            else:
-                self.logger.warning(
-                    f"⏸️  PR #{pr.number} is not ready to merge yet - see reasons above"
-                )
+                return "merged" if merged else "merge_failed"
+
+            if self.merge_planner.enabled:
+                with self.metrics.phase("branch", pr.number):
+                    self.github_handler.check_and_update_branch(pr, snapshot)
+
+            if (
+                self.merge_watcher is not None
+                and approval_check["approved"]
+                and self.github_handler.waiting_for_ci(pr, snapshot)
+            ):
+                self.logger.info(f"⏳ PR #{pr.number} is approved and only waiting for CI")
+                self.waiting_prs.append((pr, snapshot))
+                return "waiting_for_ci"
+
+            self.logger.warning(
+                f"⏸️  PR #{pr.number} is not ready to merge yet - see reasons above"
+            )
+            return "not_ready"
 
         except Exception as e:
             self.logger.error(f"Error processing PR #{pr.number}: {e}", exc_info=True)
+            return "error"
+
+    def _merge_planned(self, pr, snapshot):
+        head_sha = snapshot.head_sha if snapshot is not None else pr.head.sha
+        with self.metrics.phase("merge", pr.number):
+            return self.github_handler.merge_pr(pr, sha=head_sha)
+
+    def _update_deferred(self, pr, snapshot):
+        with self.metrics.phase("branch", pr.number):
+            self.github_handler.update_branch(pr)
 
-    def _can_merge_with_approvals(self, pr, approval_check):
-        if not self.github_handler.can_merge(pr):
+    def _can_merge_with_approvals(self, pr, approval_check, snapshot=None):
+        if not self.github_handler.can_merge(pr, snapshot):
             return False
 
         if not approval_check["approved"]:
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class CommandResult:
+    command: str
+    returncode: object
+    seconds: float
+    peak_memory_bytes: object
+    output_lines: int = 0
+    dropped_lines: int = 0
+    timed_out: bool = False
+    cancelled: bool = False
+
+
+class CommandRunner:
+    MAX_LINE_LENGTH = 2000
+    POLL_SECONDS = 0.1
+
+    def __init__(self, config, logger):
+        self.logger = logger
+
+        linter_config = config["linter"]
+        self.timeout = linter_config.get("timeout_seconds", 900)
+        self.kill_grace = linter_config.get("kill_grace_seconds", 10)
+        self.max_output_lines = linter_config.get("max_output_lines", 200)
+
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self, command, cwd):
+        started = time.monotonic()
+        # A session of its own makes the command the leader of a new process group,
+        # so a timeout also takes down npm's node children and anything they spawned.
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+            start_new_session=True,
+        )
+
+        # Reader threads only queue lines; they are logged from this thread so the
+        # PR's log buffer still groups them with the rest of the PR.
+        lines = queue.Queue()
+        readers = [
+            threading.Thread(target=self._read, args=(stream, is_stderr, lines), daemon=True)
+            for stream, is_stderr in ((process.stdout, False), (process.stderr, True))
+        ]
+        for reader in readers:
+            reader.start()
+
+        result = CommandResult(command, None, 0.0, None)
+        try:
+            status, rusage = self._wait(process, lines, result, started)
+        except BaseException:
+            # Interrupted from the terminal: do not leave the linter running behind us.
+            self._signal_group(process, signal.SIGKILL)
+            raise
+
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+        # Children left behind by the command would keep the pipes open forever.
+        for reader in readers:
+            reader.join(self.kill_grace)
+        if any(reader.is_alive() for reader in readers):
+            self._signal_group(process, signal.SIGKILL)
+            for reader in readers:
+                reader.join()
+        self._log_lines(lines, result)
+
+        result.returncode = process.returncode
+        result.seconds = time.monotonic() - started
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS. It covers the
+        # largest process in the tree the shell waited for, and never reads below
+        # our own memory at fork time since the child starts as a copy of us.
+        scale = 1 if sys.platform == "darwin" else 1024
+        result.peak_memory_bytes = rusage.ru_maxrss * scale
+
+        self._log_dropped(result)
+        self.logger.info(
+            f"📏 Linter command exited with {result.returncode} after {result.seconds:.1f}s, "
+            f"peak memory {result.peak_memory_bytes / 2**20:.0f} MiB"
+        )
+        return result
+
+    def _wait(self, process, lines, result, started):
+        killed_at = None
+        while True:
+            pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                return status, rusage
+            self._log_lines(lines, result)
+
+            if killed_at is None:
+                if self._cancelled.is_set():
+                    result.cancelled = True
+                    self.logger.warning("🛑 Linter command cancelled, killing its process group")
+                elif self.timeout and time.monotonic() - started > self.timeout:
+                    result.timed_out = True
+                    self.logger.warning(
+                        f"⏰ Linter command exceeded {self.timeout}s, killing its process group"
+                    )
+                if result.cancelled or result.timed_out:
+                    self._signal_group(process, signal.SIGTERM)
+                    killed_at = time.monotonic()
+            elif time.monotonic() - killed_at > self.kill_grace:
+                self._signal_group(process, signal.SIGKILL)
+            time.sleep(self.POLL_SECONDS)
+
+    def _read(self, stream, is_stderr, lines):
+        with stream:
+            for line in stream:
+                lines.put((is_stderr, line.rstrip("\n")))
+
+    def log_output(self, result, output):
+        # For linter output that did not come from a command run here, such as an
+        # ESLint worker's report: the same line cap and truncation apply.
+        for line in output.splitlines():
+            self._log_line(result, False, line)
+        self._log_dropped(result)
+
+    def _log_lines(self, lines, result):
+        while True:
+            try:
+                is_stderr, line = lines.get_nowait()
+            except queue.Empty:
+                return
+            self._log_line(result, is_stderr, line)
+
+    def _log_line(self, result, is_stderr, line):
+        if result.output_lines >= self.max_output_lines:
+            result.dropped_lines += 1
+            return
+        result.output_lines += 1
+        if len(line) > self.MAX_LINE_LENGTH:
+            line = line[: self.MAX_LINE_LENGTH] + "…"
+        if is_stderr:
+            self.logger.warning(f"⚠️  {line}")
+        else:
+            self.logger.info(f"📄 {line}")
+
+    def _log_dropped(self, result):
+        if result.dropped_lines:
+            self.logger.info(
+                f"✂️  {result.dropped_lines} more output lines not shown "
+                f"(linter.max_output_lines: {self.max_output_lines})"
+            )
+
+    @staticmethod
+    def _signal_group(process, signum):
+        try:
+            os.killpg(process.pid, signum)
+        except (ProcessLookupError, PermissionError):
+            pass
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import threading
+
+from .pr_snapshot import fetch_commit_status
+from .request_gateway import CRITICAL, request_priority
+
+
+class CommitStatusCache:
+    def __init__(self, repo, logger):
+        self.repo = repo
+        self.logger = logger
+        self._entries = {}
+        self._sha_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, sha):
+        with self._lock:
+            if sha in self._entries:
+                return self._entries[sha]
+            sha_lock = self._sha_locks.setdefault(sha, threading.Lock())
+
+        with sha_lock:
+            with self._lock:
+                if sha in self._entries:
+                    return self._entries[sha]
+
+            with request_priority(CRITICAL):
+                commit_status = fetch_commit_status(self.repo, sha)
+
+            with self._lock:
+                self._entries[sha] = commit_status
+            return commit_status
+
+    def prime(self, commit_status):
+        with self._lock:
+            self._entries[commit_status.sha] = commit_status
+
+    def invalidate(self, sha):
+        with self._lock:
+            if self._entries.pop(sha, None) is not None:
+                self.logger.debug(f"🗑️  Invalidated cached CI status for {sha[:8]}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sha_locks.clear()
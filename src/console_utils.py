@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+from .logger_setup import write_console
+
 
 class Colors:
     RED = "\033[0;31m"
@@ -12,20 +14,24 @@ class Colors:
 
 
 def print_header(title, emoji="🔧"):
-    print(f"{Colors.CYAN}{Colors.BOLD}")
-    print("╔════════════════════════════════════════════════════════════════════════════════╗")
-    print(f"║{title.center(78, ' ')}║")
-    print("╚════════════════════════════════════════════════════════════════════════════════╝")
-    print(f"{Colors.NC}")
+    write_console(
+        f"{Colors.CYAN}{Colors.BOLD}\n"
+        "╔════════════════════════════════════════════════════════════════════════════════╗\n"
+        f"║{title.center(78, ' ')}║\n"
+        "╚════════════════════════════════════════════════════════════════════════════════╝\n"
+        f"{Colors.NC}"
+    )
 
 
 def print_section_separator():
-    print(f"\n{Colors.BLUE}{'='*80}{Colors.NC}")
+    write_console(f"\n{Colors.BLUE}{'='*80}{Colors.NC}")
 
 
 def print_success_box(title):
-    print(f"\n{Colors.GREEN}{Colors.BOLD}")
-    print("╔════════════════════════════════════════════════════════════════════════════════╗")
-    print(f"║{title.center(78, ' ')}║")
-    print("╚════════════════════════════════════════════════════════════════════════════════╝")
-    print(f"{Colors.NC}")
+    write_console(
+        f"\n{Colors.GREEN}{Colors.BOLD}\n"
+        "╔════════════════════════════════════════════════════════════════════════════════╗\n"
+        f"║{title.center(78, ' ')}║\n"
+        "╚════════════════════════════════════════════════════════════════════════════════╝\n"
+        f"{Colors.NC}"
+    )
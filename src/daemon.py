@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+
+import hashlib
+import hmac
+import json
+import signal
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+RELEVANT_EVENTS = {"pull_request", "pull_request_review", "check_run", "status"}
+
+
+class WebhookDaemon:
+    def __init__(self, plumber):
+        self.plumber = plumber
+        self.logger = plumber.logger
+        # A multi-repository plumber routes each delivery to the plumber of its repo.
+        self.plumbers = {
+            repo_plumber.repo_name.lower(): repo_plumber
+            for repo_plumber in getattr(plumber, "plumbers", [plumber])
+        }
+
+        daemon_config = plumber.config.get("daemon", {})
+        self.host = daemon_config.get("host", "127.0.0.1")
+        self.port = daemon_config.get("port", 8787)
+        self.secret = daemon_config.get("secret", "")
+        self.debounce = daemon_config.get("debounce_seconds", 30)
+        self.max_delay = daemon_config.get("max_delay_seconds", 120)
+        self.reconcile_interval = daemon_config.get("reconcile_minutes", 60) * 60
+        self.record_directory = daemon_config.get("record_directory")
+        self.mergeability_rechecks = daemon_config.get("mergeability_rechecks", 5)
+
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._rechecks = {}
+        self._next_reconcile = time.monotonic()
+        self._stopping = threading.Event()
+        self._server = None
+
+    def serve(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        server_thread = threading.Thread(
+            target=self._server.serve_forever, name="webhook-server", daemon=True
+        )
+        server_thread.start()
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        self.logger.info(f"📡 Listening for GitHub webhooks on http://{self.host}:{self.port}/")
+        self.logger.info(
+            f"⏱️  Debounce {self.debounce}s, full reconcile every "
+            f"{self.reconcile_interval // 60} minutes"
+        )
+
+        try:
+            self._work_loop()
+        except KeyboardInterrupt:
+            self.logger.info("🛑 Interrupted")
+        finally:
+            self.stop()
+            self._server.shutdown()
+            self._server.server_close()
+            self.logger.info("👋 Daemon stopped")
+
+    def stop(self):
+        with self._condition:
+            if self._stopping.is_set():
+                return
+            self._stopping.set()
+            self._condition.notify_all()
+        # A linter fix in progress would otherwise hold up the shutdown.
+        for plumber in self.plumbers.values():
+            plumber.cancel()
+
+    def replay(self, paths):
+        records = self._load_recordings(paths)
+        self.logger.info(f"⏪ Replaying {len(records)} recorded webhook deliveries")
+
+        for record in records:
+            self.handle_event(record["event"], record["payload"])
+
+        with self._condition:
+            queued = sorted(self._pending.items(), key=lambda item: item[1][1])
+            self._pending = {}
+
+        for key, _ in queued:
+            self._run_task("pr", key)
+
+        self.logger.info(f"⏪ Replay finished - evaluated {len(queued)} PR(s)")
+
+    def handle_event(self, event, payload):
+        if event not in RELEVANT_EVENTS:
+            self.logger.debug(f"📭 Ignoring '{event}' webhook")
+            return []
+
+        repository = (payload.get("repository") or {}).get("full_name", "")
+        if repository:
+            repo_key = repository.lower()
+        elif len(self.plumbers) == 1:
+            repo_key = next(iter(self.plumbers))
+        else:
+            repo_key = None
+        if repo_key not in self.plumbers:
+            self.logger.debug(f"📭 Ignoring '{event}' webhook for {repository or 'unknown repo'}")
+            return []
+
+        plumber = self.plumbers[repo_key]
+        numbers, head_sha = self._affected_prs(plumber, repo_key, event, payload)
+        if head_sha:
+            plumber.status_cache.invalidate(head_sha)
+
+        for number in numbers:
+            self.enqueue((repo_key, number), event)
+        return numbers
+
+    def _affected_prs(self, plumber, repo_key, event, payload):
+        action = payload.get("action")
+
+        if event in ("pull_request", "pull_request_review"):
+            pr = payload["pull_request"]
+            if event == "pull_request" and action == "closed":
+                self._discard((repo_key, pr["number"]))
+                return [], None
+            return [pr["number"]], pr["head"]["sha"]
+
+        if event == "check_run":
+            check_run = payload["check_run"]
+            if action != "completed":
+                return [], None
+            head_sha = check_run["head_sha"]
+            numbers = [pr["number"] for pr in check_run.get("pull_requests") or []]
+            return numbers or plumber.prs_for_sha(head_sha), head_sha
+
+        # status
+        if payload.get("state") == "pending":
+            return [], None
+        head_sha = payload["sha"]
+        return plumber.prs_for_sha(head_sha), head_sha
+
+    def _describe(self, key):
+        repo_key, number = key
+        if len(self.plumbers) == 1:
+            return f"PR #{number}"
+        return f"{self.plumbers[repo_key].repo_name}#{number}"
+
+    def enqueue(self, key, reason, delay=None):
+        with self._condition:
+            now = time.monotonic()
+            first_seen, pending_due = self._pending.get(key, (now, None))
+            if delay is None:
+                due = min(now + self.debounce, first_seen + self.max_delay)
+            else:
+                due = now + delay if pending_due is None else min(pending_due, now + delay)
+            if key in self._pending:
+                self.logger.debug(
+                    f"🧺 {self._describe(key)} '{reason}' event coalesced with pending work"
+                )
+            else:
+                self.logger.info(f"📥 {self._describe(key)} queued after '{reason}' event")
+            self._pending[key] = (first_seen, due)
+            self._condition.notify_all()
+
+    def _discard(self, key):
+        with self._condition:
+            self._pending.pop(key, None)
+
+    def _work_loop(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            self._run_task(*task)
+
+    def _next_task(self):
+        with self._condition:
+            while not self._stopping.is_set():
+                now = time.monotonic()
+                if now >= self._next_reconcile:
+                    self._next_reconcile = now + self.reconcile_interval
+                    # The reconcile looks at every PR, so pending events are covered by it.
+                    self._pending = {}
+                    return "reconcile", None
+
+                due = [(due, key) for key, (_, due) in self._pending.items() if due <= now]
+                if due:
+                    _, key = min(due)
+                    del self._pending[key]
+                    return "pr", key
+
+                wake_at = min([self._next_reconcile] + [due for _, due in self._pending.values()])
+                self._condition.wait(timeout=max(0, wake_at - now))
+        return None
+
+    def _run_task(self, kind, key):
+        repo_keys = list(self.plumbers) if kind == "reconcile" else [key[0]]
+        try:
+            if kind == "reconcile":
+                self.logger.info("🧹 Running full reconcile")
+                # Webhooks already react to CI finishing, so the daemon skips the watch phase.
+                self.plumber.run(watch=False)
+            else:
+                self.plumbers[key[0]].run_pr(key[1])
+        except Exception as e:
+            target = self._describe(key) if key else ""
+            self.logger.error(f"💥 Daemon task {kind} {target} failed: {e}", exc_info=True)
+
+        if kind == "reconcile":
+            # Every PR gets a fresh set of re-checks after a full reconcile.
+            self._rechecks = {}
+        elif key[1] not in self.plumbers[key[0]].unknown_mergeable:
+            self._rechecks.pop(key, None)
+
+        for repo_key in repo_keys:
+            for unknown in sorted(self.plumbers[repo_key].unknown_mergeable):
+                self._recheck_mergeability((repo_key, unknown))
+
+    def _recheck_mergeability(self, key):
+        # Backs off from the debounce window and gives up after a few rounds, so a
+        # PR GitHub never resolves waits for the next reconcile instead of polling.
+        count = self._rechecks.get(key, 0) + 1
+        self._rechecks[key] = count
+        if count > self.mergeability_rechecks:
+            if count == self.mergeability_rechecks + 1:
+                self.logger.info(
+                    f"❔ {self._describe(key)} mergeability still unknown after "
+                    f"{self.mergeability_rechecks} re-checks, leaving it to the next reconcile"
+                )
+            return
+        self.enqueue(key, "mergeability unknown", delay=self.debounce * 2 ** (count - 1))
+
+    def _record(self, event, delivery, payload):
+        directory = Path(self.record_directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = directory / f"{timestamp}-{event}-{delivery or 'unknown'}.json"
+        with open(path, "w") as f:
+            json.dump({"event": event, "delivery": delivery, "payload": payload}, f)
+
+    @staticmethod
+    def _load_recordings(paths):
+        files = []
+        for path in map(Path, paths):
+            files.extend(sorted(path.glob("*.json")) if path.is_dir() else [path])
+
+        records = []
+        for file_path in files:
+            with open(file_path, "r") as f:
+                records.append(json.load(f))
+        return records
+
+    def _verify_signature(self, body, signature):
+        if not self.secret:
+            return True
+        expected = "sha256=" + hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature or "")
+
+    def _handler_class(self):
+        daemon = self
+
+        class WebhookRequestHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not daemon._verify_signature(body, self.headers.get("X-Hub-Signature-256")):
+                    daemon.logger.warning("⚠️  Rejected webhook with an invalid signature")
+                    self._reply(401, "invalid signature")
+                    return
+
+                event = self.headers.get("X-GitHub-Event", "")
+                delivery = self.headers.get("X-GitHub-Delivery")
+                try:
+                    payload = json.loads(body or b"{}")
+                except ValueError:
+                    self._reply(400, "invalid JSON")
+                    return
+
+                if daemon.record_directory and event in RELEVANT_EVENTS:
+                    daemon._record(event, delivery, payload)
+
+                try:
+                    numbers = daemon.handle_event(event, payload)
+                except (KeyError, TypeError) as e:
+                    daemon.logger.warning(f"⚠️  Malformed '{event}' webhook: {e}")
+                    self._reply(400, "malformed payload")
+                    return
+                self._reply(202, f"queued {len(numbers)} PR(s)")
+
+            def _reply(self, status, message):
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain")
+                self.end_headers()
+                self.wfile.write(message.encode())
+
+            def log_message(self, format, *args):
+                daemon.logger.debug(f"📡 {self.address_string()} - {format % args}")
+
+        return WebhookRequestHandler
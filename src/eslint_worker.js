@@ -0,0 +1,70 @@
+#!/usr/bin/env node
+// Long-lived ESLint worker used by CI Plumber's linter fixer.
+//
+// Reads one JSON request per line on stdin: {"id": 1, "cwd": "/path", "files": ["a.js"]}.
+// Fixes the files in place and writes one JSON line per request to stdout.
+// ESLint, its plugins and parsers stay loaded between requests, so only the
+// first request pays for Node startup and config loading.
+"use strict";
+
+const path = require("path");
+const readline = require("readline");
+
+const engines = new Map();
+
+function engineFor(cwd) {
+  let engine = engines.get(cwd);
+  if (!engine) {
+    const { ESLint } = require(require.resolve("eslint", { paths: [cwd] }));
+    engine = { ESLint, eslint: new ESLint({ cwd, fix: true }) };
+    engines.set(cwd, engine);
+  }
+  return engine;
+}
+
+async function handle(request) {
+  const { ESLint, eslint } = engineFor(request.cwd);
+  const files = request.files.map((file) => path.resolve(request.cwd, file));
+  const results = await eslint.lintFiles(files);
+  await ESLint.outputFixes(results);
+
+  let errorCount = 0;
+  let warningCount = 0;
+  let fixed = 0;
+  for (const result of results) {
+    errorCount += result.errorCount;
+    warningCount += result.warningCount;
+    if (result.output !== undefined) {
+      fixed += 1;
+    }
+  }
+
+  const formatter = await eslint.loadFormatter("stylish");
+  const output = await formatter.format(results);
+  // maxRSS is in kilobytes and covers the worker's whole lifetime so far.
+  const peakMemoryBytes = process.resourceUsage().maxRSS * 1024;
+  return { errorCount, warningCount, fixed, output, peakMemoryBytes };
+}
+
+function reply(message) {
+  process.stdout.write(JSON.stringify(message) + "\n");
+}
+
+const input = readline.createInterface({ input: process.stdin });
+let queue = Promise.resolve();
+
+input.on("line", (line) => {
+  queue = queue.then(async () => {
+    let request = {};
+    try {
+      request = JSON.parse(line);
+      reply({ id: request.id, ok: true, ...(await handle(request)) });
+    } catch (error) {
+      reply({ id: request.id, ok: false, error: String((error && error.stack) || error) });
+    }
+  });
+});
+
+input.on("close", () => {
+  queue.then(() => process.exit(0));
+});
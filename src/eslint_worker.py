@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import atexit
+import itertools
+import json
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from .command_runner import CommandResult
+from .lint_cache import LintResultCache
+
+
+WORKER_SCRIPT = Path(__file__).with_name("eslint_worker.js")
+
+
+class ESLintWorkerError(Exception):
+    pass
+
+
+class ESLintWorker:
+    def __init__(self, node, cwd, logger):
+        self.logger = logger
+        self.process = subprocess.Popen(
+            [node, str(WORKER_SCRIPT)],
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.timed_out = False
+        threading.Thread(target=self._drain_stderr, daemon=True).start()
+
+    def _drain_stderr(self):
+        for line in self.process.stderr:
+            self.logger.debug(f"🟡 ESLint worker: {line.rstrip()}")
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def request(self, cwd, files, timeout):
+        request_id = next(self._ids)
+        with self._lock:
+            # A stuck request kills the worker, which ends the readline below.
+            watchdog = threading.Timer(timeout, self._expire)
+            watchdog.start()
+            try:
+                self.process.stdin.write(
+                    json.dumps({"id": request_id, "cwd": cwd, "files": files}) + "\n"
+                )
+                self.process.stdin.flush()
+                line = self.process.stdout.readline()
+            finally:
+                watchdog.cancel()
+
+        if not line:
+            if self.timed_out:
+                raise ESLintWorkerError(f"no response within {timeout}s, worker killed")
+            raise ESLintWorkerError(f"worker exited with code {self.process.poll()}")
+        response = json.loads(line)
+        if response.get("id") != request_id:
+            raise ESLintWorkerError(f"unexpected response for request {response.get('id')}")
+        if not response.get("ok"):
+            raise ESLintWorkerError(response.get("error", "unknown error"))
+        return response
+
+    def _expire(self):
+        self.timed_out = True
+        self.process.kill()
+
+    def close(self):
+        if not self.alive():
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+
+
+class ESLintWorkerPool:
+    def __init__(self, config, logger, config_files, command_runner):
+        self.logger = logger
+        self.config_files = config_files
+        self.command_runner = command_runner
+
+        worker_config = config["linter"].get("worker", {})
+        self.node = worker_config.get("node", "node")
+        self.max_workers = worker_config.get("max_workers", 2)
+        self.timeout = worker_config.get("timeout_seconds", 600)
+
+        self._lock = threading.Lock()
+        self._workers = OrderedDict()
+        atexit.register(self.close)
+
+    def fix(self, cwd, files):
+        # Workers are keyed by the lockfile and ESLint config of the checkout, so a
+        # dependency or config change gets a fresh process with the new plugins.
+        config_hash = LintResultCache.config_hash(cwd, self.config_files, self.node)
+        # Reported like a fix command, so the run report covers the worker path too.
+        result = CommandResult(f"eslint-worker {config_hash} ({len(files)} files)", None, 0.0, None)
+        started = time.monotonic()
+        worker = None
+        try:
+            worker = self._worker(config_hash, cwd)
+            response = worker.request(cwd, files, self.timeout)
+        except (OSError, ValueError, ESLintWorkerError) as e:
+            result.seconds = time.monotonic() - started
+            result.timed_out = worker is not None and worker.timed_out
+            self.logger.warning(f"⚠️  ESLint worker {config_hash} failed: {e}")
+            self._discard(config_hash)
+            return result
+
+        result.seconds = time.monotonic() - started
+        result.peak_memory_bytes = response.get("peakMemoryBytes")
+        # Same convention as the ESLint CLI: 1 when errors remain after fixing.
+        result.returncode = 1 if response["errorCount"] else 0
+        self.logger.info(
+            f"⚡ ESLint worker {config_hash} fixed {response['fixed']}/{len(files)} files in "
+            f"{result.seconds:.1f}s ({response['errorCount']} errors, "
+            f"{response['warningCount']} warnings left)"
+        )
+        self.command_runner.log_output(result, response["output"])
+        return result
+
+    def _worker(self, config_hash, cwd):
+        with self._lock:
+            worker = self._workers.get(config_hash)
+            if worker is not None and worker.alive():
+                self._workers.move_to_end(config_hash)
+                return worker
+
+            worker = ESLintWorker(self.node, cwd, self.logger)
+            self._workers[config_hash] = worker
+            self.logger.info(f"🟢 Started ESLint worker {config_hash} (pid {worker.process.pid})")
+
+            while len(self._workers) > self.max_workers:
+                old_hash, old_worker = self._workers.popitem(last=False)
+                self.logger.info(f"🔴 Stopping ESLint worker {old_hash} (config changed)")
+                old_worker.close()
+            return worker
+
+    def _discard(self, config_hash):
+        with self._lock:
+            worker = self._workers.pop(config_hash, None)
+        if worker is not None:
+            worker.close()
+
+    def close(self):
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            worker.close()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+import os
+import time
+from contextlib import contextmanager
+
+from git import GitCommandError, InvalidGitRepositoryError, NoSuchPathError, Repo
+
+
+class FetchStrategy:
+    def __init__(self, config, logger):
+        self.config = config
+        self.logger = logger
+
+        fetch_config = config["repository"].get("fetch", {})
+        self.filter = fetch_config.get("filter")
+        self.shallow = fetch_config.get("shallow", False)
+        self.sparse = fetch_config.get("sparse", False)
+
+    def clone(self, repo_url, path, bare=False):
+        kwargs = {}
+        if bare:
+            kwargs["bare"] = True
+        else:
+            kwargs["no_checkout"] = self.sparse
+        if self.filter:
+            kwargs["filter"] = self.filter
+        if self.shallow:
+            kwargs["depth"] = 1
+
+        description = ", ".join(f"{key}={value}" for key, value in kwargs.items()) or "full"
+        with self._measure(f"clone ({description})", path):
+            return Repo.clone_from(repo_url, path, **kwargs)
+
+    def fetch_pr(self, repo, pr, snapshot=None):
+        head_ref = pr.head.ref
+        base_ref = snapshot.base_ref if snapshot is not None else pr.base.ref
+
+        head_depth = pr.commits + 1 if self.shallow else None
+        base_depth = None
+        if self.shallow and snapshot is not None and snapshot.behind_by is not None:
+            base_depth = snapshot.behind_by + 1
+
+        self._fetch_ref(repo, head_ref, head_depth)
+        self._fetch_ref(repo, base_ref, base_depth)
+        return f"refs/remotes/origin/{head_ref}"
+
+    def _fetch_ref(self, repo, branch, depth):
+        args = ["origin", f"+refs/heads/{branch}:refs/remotes/origin/{branch}"]
+        if depth is not None:
+            args.insert(0, f"--depth={depth}")
+        if self.filter:
+            args.insert(0, f"--filter={self.filter}")
+
+        depth_label = f"depth {depth}" if depth is not None else "full history"
+        with self._measure(f"fetch {branch} ({depth_label})", self._repo_path(repo)):
+            repo.git.fetch(*args)
+
+    def checkout(self, repo, pr, ref, local_branch=None):
+        if self.sparse:
+            self._configure_sparse_checkout(repo, pr)
+        elif repo.config_reader().get_value("core", "sparseCheckout", False):
+            repo.git.sparse_checkout("disable")
+
+        with self._measure(f"checkout {pr.head.ref}", self._repo_path(repo)):
+            if local_branch:
+                repo.git.checkout("--force", "-B", local_branch, ref)
+            else:
+                repo.git.checkout("--detach", "--force", ref)
+
+    def _configure_sparse_checkout(self, repo, pr):
+        directories = sorted(
+            {os.path.dirname(changed.filename) for changed in pr.get_files()} - {""}
+        )
+        self.logger.info(
+            f"🪶 Sparse checkout limited to {len(directories)} director"
+            f"{'y' if len(directories) == 1 else 'ies'} touched by PR #{pr.number}"
+        )
+        repo.git.sparse_checkout("set", "--cone", *directories)
+
+    @staticmethod
+    def _repo_path(repo):
+        return repo.working_tree_dir or repo.git_dir
+
+    @contextmanager
+    def _measure(self, phase, path):
+        size_before = self._object_store_size(path)
+        started = time.monotonic()
+        yield
+        elapsed = time.monotonic() - started
+        transferred = self._object_store_size(path) - size_before
+        self.logger.info(f"📏 {phase}: {elapsed:.1f}s, {self._format_bytes(transferred)}")
+
+    @staticmethod
+    def _object_store_size(path):
+        if not os.path.exists(path):
+            return 0
+
+        try:
+            output = Repo(path).git.count_objects("-v")
+        except (GitCommandError, InvalidGitRepositoryError, NoSuchPathError):
+            return 0
+
+        sizes = dict(line.split(": ", 1) for line in output.splitlines() if ": " in line)
+        return (int(sizes.get("size", 0)) + int(sizes.get("size-pack", 0))) * 1024
+
+    @staticmethod
+    def _format_bytes(size):
+        for unit in ["B", "KiB", "MiB"]:
+            if abs(size) < 1024:
+                return f"{size:.0f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GiB"
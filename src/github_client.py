@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import requests
+from github import Github
+from github.GithubRetry import GithubRetry
+from github.Requester import HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass, Requester
+from urllib3 import Retry
+
+from .request_gateway import OPTIONAL, GatewayHTTPAdapter, request_priority
+
+
+class SharedSessionConnectionMixin:
+    # PyGithub stores the pending request on its connection object and reuses one
+    # connection per client, which races when several threads share a client.
+    # Connections made from these classes are cheap per-request objects that all
+    # send through one pooled session.
+    session = None
+    default_port = None
+
+    def __init__(self, host, port=None, strict=False, timeout=None, **kwargs):
+        self.host = host
+        self.port = port if port else self.default_port
+        self.timeout = timeout
+        self.verify = kwargs.get("verify", True)
+
+    def close(self):
+        pass
+
+
+class SharedSessionHTTPSConnection(SharedSessionConnectionMixin, HTTPSRequestsConnectionClass):
+    protocol = "https"
+    default_port = 443
+
+
+class SharedSessionHTTPConnection(SharedSessionConnectionMixin, HTTPRequestsConnectionClass):
+    protocol = "http"
+    default_port = 80
+
+
+def build_session(pool_size, http_cache=None, gateway=None):
+    session = requests.Session()
+    session.auth = Requester.noopAuth
+    if gateway is not None:
+        # The gateway handles rate-limit 403/429 responses for the whole process,
+        # so urllib3 only retries server errors.
+        retry = Retry(
+            status_forcelist=list(range(500, 600)),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS.union({"GET", "POST"}),
+        )
+    else:
+        retry = GithubRetry()
+    adapter = GatewayHTTPAdapter(
+        gateway=gateway,
+        cache=http_cache,
+        max_retries=retry,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def build_github_client(config, http_cache=None, gateway=None):
+    github_config = config["github"]
+    workers = config.get("processing", {}).get("workers", 1)
+    pool_size = max(workers * 2, requests.adapters.DEFAULT_POOLSIZE)
+
+    session = build_session(pool_size, http_cache, gateway)
+    SharedSessionHTTPSConnection.session = session
+    SharedSessionHTTPConnection.session = session
+    Requester.injectConnectionClasses(SharedSessionHTTPConnection, SharedSessionHTTPSConnection)
+
+    kwargs = {}
+    if "base_url" in github_config:
+        kwargs["base_url"] = github_config["base_url"]
+    if "seconds_between_requests" in github_config:
+        kwargs["seconds_between_requests"] = github_config["seconds_between_requests"]
+    if "seconds_between_writes" in github_config:
+        kwargs["seconds_between_writes"] = github_config["seconds_between_writes"]
+
+    return Github(github_config["token"], pool_size=pool_size, **kwargs)
+
+
+def request_repo_endpoint(repo, verb, path, priority=OPTIONAL):
+    # The one place that talks to PyGithub's requester directly, for REST endpoints
+    # PyGithub 2.1.1 has no method for. Going through the requester keeps auth,
+    # the shared session and the gateway; the priority tags the request like the
+    # handler's other calls. Drop a caller once PyGithub grows the method.
+    with request_priority(priority):
+        _, data = repo._requester.requestJsonAndCheck(verb, f"{repo.url}{path}")
+    return data
@@ -1,17 +1,66 @@
 #!/usr/bin/env python3
 
 from github import GithubException
+from github.PullRequest import PullRequest
 
 from .ci_status import CIStatus
+from .request_gateway import CRITICAL, request_priority
+
+
+SEARCH_PR_ATTRIBUTES = ["number", "title", "user", "labels", "state", "updated_at", "draft"]
 
 
 class GitHubHandler:
-    def __init__(self, repo, config, logger):
+    def __init__(self, github, repo, config, logger, status_cache):
+        self.github = github
         self.repo = repo
         self.config = config
         self.logger = logger
+        self.status_cache = status_cache
+
+    def find_target_prs(self, authors=None):
+        discovery = self.config["github"].get("discovery", "search")
+        if discovery == "search" and authors:
+            return self._search_target_prs(authors)
+        return self._list_target_prs()
 
-    def find_target_prs(self):
+    def _search_target_prs(self, authors):
+        trigger_label = self.config["labels"]["trigger"]
+        prs = {}
+
+        # The search API treats repeated author: qualifiers as AND, so run one query per author.
+        for author in authors:
+            query = (
+                f"repo:{self.config['github']['repo']} is:pr is:open "
+                f'label:"{trigger_label}" author:{author}'
+            )
+            for issue in self.github.search_issues(query, sort="created", order="desc"):
+                prs[issue.number] = self._lazy_pull_request(issue)
+
+        self.logger.info(
+            f"🔎 Server-side search matched {len(prs)} PRs for {len(authors)} author(s)"
+        )
+        return sorted(prs.values(), key=lambda pr: pr.number, reverse=True)
+
+    def find_prs_for_sha(self, head_sha):
+        query = (
+            f"repo:{self.config['github']['repo']} is:pr is:open "
+            f'label:"{self.config["labels"]["trigger"]}" {head_sha}'
+        )
+        numbers = [issue.number for issue in self.github.search_issues(query)]
+        self.logger.debug(f"🔎 Commit {head_sha[:7]} belongs to PR(s) {numbers}")
+        return numbers
+
+    def _lazy_pull_request(self, issue):
+        # Search results are issues; build a lazy PullRequest from the fields they share
+        # so head/base/mergeable are only fetched if a later step actually reads them.
+        raw_issue = issue._rawData
+        attributes = {key: raw_issue[key] for key in SEARCH_PR_ATTRIBUTES if key in raw_issue}
+        attributes["url"] = raw_issue["pull_request"]["url"]
+        attributes["issue_url"] = raw_issue["url"]
+        return PullRequest(self.repo._requester, {}, attributes, completed=False)
+
+    def _list_target_prs(self):
         trigger_label = self.config["labels"]["trigger"]
         prs = []
 
@@ -22,83 +71,106 @@ class GitHubHandler:
 
         return prs
 
-    def ensure_required_labels(self, pr):
-        current_labels = [label.name for label in pr.labels]
+    def ensure_required_labels(self, pr, snapshot=None):
+        if snapshot is not None:
+            current_labels = list(snapshot.labels)
+        else:
+            current_labels = [label.name for label in pr.labels]
 
-        auto_add_labels = self.config["labels"].get("auto_add", [])
-        for label in auto_add_labels:
-            if label not in current_labels:
+        missing_labels = []
+        for label, category in self.missing_labels(current_labels):
+            if category is None:
                 self.logger.info(f"🏷️  Adding missing label '{label}' to PR #{pr.number}")
-                try:
-                    pr.add_to_labels(label)
-                except GithubException as e:
-                    self.logger.warning(f"⚠️  Failed to add label '{label}': {e}")
-
-        label_categories = self.config["labels"].get("categories", [])
-        for category in label_categories:
-            prefix = category.get("prefix")
-            default_label = category.get("default")
-
-            if not prefix or not default_label:
-                continue
-
-            has_category_label = any(label.startswith(prefix) for label in current_labels)
-
-            if not has_category_label:
-                self.logger.info(
-                    f"🏷️  Adding default label '{default_label}' "
-                    f"for category '{prefix}' to PR #{pr.number}"
-                )
-                try:
-                    pr.add_to_labels(default_label)
-                except GithubException as e:
-                    self.logger.warning(f"⚠️  Failed to add label '{default_label}': {e}")
             else:
-                existing_label = next(
-                    (label for label in current_labels if label.startswith(prefix)), None
+                self.logger.info(
+                    f"🏷️  Adding default label '{label}' "
+                    f"for category '{category}' to PR #{pr.number}"
                 )
+            missing_labels.append(label)
+
+        for prefix in self._category_defaults():
+            existing_label = next(
+                (label for label in current_labels if label.startswith(prefix)), None
+            )
+            if existing_label is not None:
                 self.logger.info(
                     f"ℹ️  Skipping category '{prefix}' - "
                     f"PR #{pr.number} already has '{existing_label}'"
                 )
 
-    def check_and_update_branch(self, pr):
+        if not missing_labels:
+            return
+
+        # All missing labels go out in one write; the endpoint adds to the existing
+        # labels, so labels set by someone else in the meantime are kept.
         try:
-            comparison = self.repo.compare(pr.base.ref, pr.head.ref)
-            commits_behind = comparison.behind_by
+            pr.add_to_labels(*missing_labels)
+        except GithubException as e:
+            self.logger.warning(f"⚠️  Failed to add labels {', '.join(missing_labels)}: {e}")
 
-            self.logger.info(f"📊 PR #{pr.number} is {commits_behind} commits behind {pr.base.ref}")
+    def missing_labels(self, current_labels):
+        # (label, category prefix or None) for every label the PR should get.
+        missing = {}
+        for label in self.config["labels"].get("auto_add", []):
+            if label not in current_labels:
+                missing.setdefault(label, None)
+
+        for prefix, default_label in self._category_defaults().items():
+            if not any(label.startswith(prefix) for label in current_labels):
+                missing.setdefault(default_label, prefix)
+
+        return list(missing.items())
+
+    def _category_defaults(self):
+        return {
+            category["prefix"]: category["default"]
+            for category in self.config["labels"].get("categories", [])
+            if category.get("prefix") and category.get("default")
+        }
+
+    def check_and_update_branch(self, pr, snapshot=None):
+        try:
+            if snapshot is not None and snapshot.behind_by is not None:
+                base_ref = snapshot.base_ref
+                commits_behind = snapshot.behind_by
+            else:
+                base_ref = pr.base.ref
+                commits_behind = self.repo.compare(base_ref, pr.head.ref).behind_by
+
+            self.logger.info(f"📊 PR #{pr.number} is {commits_behind} commits behind {base_ref}")
 
             if commits_behind > self.config["repository"]["max_commits_behind"]:
                 self.logger.info(f"🔄 PR #{pr.number} is too far behind, triggering branch update")
-                self._update_branch(pr)
+                self.update_branch(pr)
 
         except GithubException as e:
             self.logger.error(f"Failed to check branch distance for PR #{pr.number}: {e}")
 
-    def _update_branch(self, pr):
+    def update_branch(self, pr):
         try:
             pr.update_branch()
             self.logger.info(f"✅ Successfully triggered branch update for PR #{pr.number}")
         except GithubException as e:
             self.logger.error(f"❌ Failed to update branch for PR #{pr.number}: {e}")
 
-    def check_ci_status(self, pr):
+    def _commit_status(self, pr, snapshot):
+        head_sha = snapshot.head_sha if snapshot is not None else pr.head.sha
+        return self.status_cache.get(head_sha)
+
+    def check_ci_status(self, pr, snapshot=None):
         statuses = []
 
         try:
-            commit = self.repo.get_commit(pr.head.sha)
+            commit_status = self._commit_status(pr, snapshot)
 
-            combined_status = commit.get_combined_status()
-            for status in combined_status.statuses:
+            for status in commit_status.statuses:
                 if status.state == "failure":
                     if CIStatus.is_linter_check(status.context):
                         statuses.append(CIStatus.LINTER_FAILED)
                     elif CIStatus.is_chromatic_check(status.context):
                         statuses.append(CIStatus.CHROMATIC_FAILED)
 
-            check_runs = commit.get_check_runs()
-            for check in check_runs:
+            for check in commit_status.check_runs:
                 if check.conclusion == "failure":
                     if CIStatus.is_linter_check(check.name):
                         statuses.append(CIStatus.LINTER_FAILED)
@@ -110,38 +182,47 @@ class GitHubHandler:
 
         return list(set(statuses))
 
-    def can_merge(self, pr):
+    def can_merge(self, pr, snapshot=None):
+        with request_priority(CRITICAL):
+            return self._can_merge(pr, snapshot)
+
+    def _can_merge(self, pr, snapshot):
         try:
-            if pr.merged:
+            merged = snapshot.merged if snapshot is not None else pr.merged
+            if merged:
                 self.logger.info(f"✅ PR #{pr.number} is already merged")
                 return False
 
-            if not pr.mergeable:
+            mergeable = snapshot.mergeable if snapshot is not None else pr.mergeable
+            if mergeable is None:
+                self.logger.info(
+                    f"⏳ PR #{pr.number} mergeability is still being computed by GitHub"
+                )
+                return False
+            if not mergeable:
                 self.logger.warning(
                     f"❌ PR #{pr.number} is not mergeable (conflicts or other issues)"
                 )
                 return False
 
-            commit = self.repo.get_commit(pr.head.sha)
-            combined_status = commit.get_combined_status()
+            commit_status = self._commit_status(pr, snapshot)
 
-            if combined_status.state not in ["success"]:
-                if combined_status.state == "failure":
+            if commit_status.state not in ["success"]:
+                if commit_status.state == "failure":
                     self.logger.warning(
                         f"❌ PR #{pr.number} combined status is 'failure' - CI checks failed"
                     )
-                elif combined_status.state == "pending":
+                elif commit_status.state == "pending":
                     self.logger.info(
                         f"⏳ PR #{pr.number} combined status is 'pending' - waiting for CI"
                     )
                 else:
                     self.logger.info(
-                        f"⏳ PR #{pr.number} combined status is '{combined_status.state}'"
+                        f"⏳ PR #{pr.number} combined status is '{commit_status.state}'"
                     )
                 return False
 
-            check_runs = commit.get_check_runs()
-            for check in check_runs:
+            for check in commit_status.check_runs:
                 if check.conclusion not in ["success", "skipped", "neutral", None]:
                     self.logger.warning(
                         f"❌ PR #{pr.number} has failing check: {check.name} ({check.conclusion})"
@@ -154,10 +235,35 @@ class GitHubHandler:
             self.logger.error(f"Error checking if PR #{pr.number} can merge: {e}")
             return False
 
-    def merge_pr(self, pr):
+    def waiting_for_ci(self, pr, snapshot=None):
+        try:
+            merged = snapshot.merged if snapshot is not None else pr.merged
+            mergeable = snapshot.mergeable if snapshot is not None else pr.mergeable
+            if merged or not mergeable:
+                return False
+
+            commit_status = self._commit_status(pr, snapshot)
+            if commit_status.state != "pending":
+                return False
+
+            return all(
+                check.conclusion in ["success", "skipped", "neutral", None]
+                for check in commit_status.check_runs
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error checking if PR #{pr.number} is waiting for CI: {e}")
+            return False
+
+    def merge_pr(self, pr, sha=None):
+        # With a head SHA, GitHub refuses the merge if the branch moved since it was checked.
+        merge_kwargs = {"sha": sha} if sha else {}
         try:
             self.logger.info(f"🚀 Attempting to merge PR #{pr.number}")
-            pr.merge(merge_method="squash")
+            with request_priority(CRITICAL):
+                pr.merge(merge_method="squash", **merge_kwargs)
             self.logger.info(f"🎉 Successfully merged PR #{pr.number}")
+            return True
         except GithubException as e:
             self.logger.error(f"❌ Failed to merge PR #{pr.number}: {e}")
+            return False
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+
+
+def quote(value):
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+class GraphQLError(Exception):
+    def __init__(self, errors):
+        self.errors = errors
+        messages = "; ".join(error.get("message", str(error)) for error in errors)
+        super().__init__(f"GraphQL query failed: {messages}")
+
+
+class GraphQLClient:
+    def __init__(self, requester):
+        self.requester = requester
+        self.url = self._graphql_url(requester.base_url)
+
+    @staticmethod
+    def _graphql_url(base_url):
+        base_url = base_url.rstrip("/")
+        if base_url.endswith("/api/v3"):
+            return f"{base_url[:-len('/v3')]}/graphql"
+        return f"{base_url}/graphql"
+
+    def execute(self, query, variables=None):
+        _, data = self.requester.requestJsonAndCheck(
+            "POST", self.url, input={"query": query, "variables": variables or {}}
+        )
+
+        if data.get("errors"):
+            raise GraphQLError(data["errors"])
+
+        return data["data"]
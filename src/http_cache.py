@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class HTTPResponseCache:
+    def __init__(self, config, logger):
+        self.logger = logger
+
+        cache_config = config["github"].get("http_cache", {})
+        default_directory = Path(config["logging"]["directory"]) / "http-cache"
+        self.directory = Path(cache_config.get("directory", default_directory))
+        self.max_age = cache_config.get("max_age_days", 7) * 86400
+
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self._lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._prune()
+
+    def _key(self, request):
+        parts = [
+            request.method,
+            request.url,
+            request.headers.get("Accept", ""),
+            request.headers.get("Authorization", ""),
+        ]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def _entry_path(self, key):
+        return self.directory / f"{key}.json"
+
+    def prepare(self, request):
+        if "If-None-Match" in request.headers or "If-Modified-Since" in request.headers:
+            return None
+
+        entry_path = self._entry_path(self._key(request))
+        if not entry_path.exists():
+            return None
+
+        try:
+            with open(entry_path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("etag"):
+            request.headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            request.headers["If-Modified-Since"] = entry["last_modified"]
+        return entry
+
+    def resolve(self, request, response, entry):
+        if response.status_code == 304 and entry is not None:
+            self._count("hits")
+            os.utime(self._entry_path(self._key(request)))
+            return self._cached_response(request, response, entry)
+
+        if response.status_code == 200:
+            self._count("misses")
+            self._store(request, response)
+        else:
+            self._count("uncacheable")
+
+        return response
+
+    def _store(self, request, response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": dict(response.headers),
+            "body": response.content.decode("utf-8", errors="replace"),
+        }
+
+        entry_path = self._entry_path(self._key(request))
+        tmp_path = entry_path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            self.logger.debug(f"Could not store HTTP cache entry for {request.url}: {e}")
+
+    @staticmethod
+    def _cached_response(request, not_modified, entry):
+        headers = CaseInsensitiveDict(entry["headers"])
+        headers.update(not_modified.headers)
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = headers
+        response.encoding = "utf-8"
+        response._content = entry["body"].encode("utf-8")
+        response.url = request.url
+        response.request = request
+        response.connection = not_modified.connection
+        return response
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _prune(self):
+        cutoff = time.time() - self.max_age
+        for entry_path in self.directory.glob("*.json"):
+            try:
+                if entry_path.stat().st_mtime < cutoff:
+                    entry_path.unlink()
+            except OSError:
+                continue
+
+    def log_summary(self):
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total else 0
+        self.logger.info(
+            f"🗄️  HTTP cache: {self.hits} hits (304, free), {self.misses} misses, "
+            f"{self.uncacheable} uncacheable - {hit_rate:.0f}% hit rate"
+        )
+
+
+class CachingHTTPAdapter(requests.adapters.HTTPAdapter):
+    def __init__(self, cache=None, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self.cache is None or request.method != "GET":
+            return super().send(request, **kwargs)
+
+        entry = self.cache.prepare(request)
+        response = super().send(request, **kwargs)
+        return self.cache.resolve(request, response, entry)
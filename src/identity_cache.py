@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from .graphql_client import GraphQLClient, quote
+from .request_gateway import CRITICAL, request_priority
+
+
+WRITE_PERMISSIONS = {"ADMIN", "MAINTAIN", "WRITE"}
+
+
+class IdentityCache:
+    def __init__(self, config, logger):
+        self.logger = logger
+
+        cache_config = config["github"].get("identity_cache", {})
+        self.enabled = cache_config.get("enabled", True)
+        default_path = Path(config["logging"]["directory"]) / "identity-cache.json"
+        self.path = Path(cache_config.get("path", default_path))
+        self.ttl = cache_config.get("ttl_hours", 24) * 3600
+        # Entries are keyed by a digest of the token so the token itself never
+        # reaches the disk, and a rotated token starts from a clean entry.
+        self.key = hashlib.sha256(config["github"]["token"].encode()).hexdigest()[:16]
+
+    def resolve(self, github, repo_names):
+        entry = self._load()
+        repositories = entry.get("repositories", {})
+        missing = [name for name in repo_names if name.lower() not in repositories]
+        if entry.get("login") and not missing:
+            self.logger.info(
+                f"⚡ Token owner and {len(repo_names)} repositories loaded from {self.path.name}"
+            )
+            return entry["login"], repositories
+
+        login, resolved = self._lookup(github, repo_names)
+        repositories.update(resolved)
+        self._save({"login": login, "repositories": repositories, "fetched_at": time.time()})
+        return login, repositories
+
+    def _lookup(self, github, repo_names):
+        # The token owner and every configured repository in one GraphQL request,
+        # instead of GET /user plus one GET /repos per repository.
+        fields = []
+        for index, name in enumerate(repo_names):
+            owner, repo = name.split("/", 1)
+            fields.append(
+                f"r{index}: repository(owner: {quote(owner)}, name: {quote(repo)}) "
+                "{ nameWithOwner databaseId viewerPermission defaultBranchRef { name } }"
+            )
+        query = "query {\n  viewer { login }\n  " + "\n  ".join(fields) + "\n}"
+
+        client = GraphQLClient(github.get_user()._requester)
+        with request_priority(CRITICAL):
+            data = client.execute(query)
+
+        repositories = {}
+        for index, name in enumerate(repo_names):
+            node = data[f"r{index}"]
+            permission = node["viewerPermission"]
+            if permission not in WRITE_PERMISSIONS:
+                self.logger.warning(
+                    f"⚠️  The token only has {permission} access to {node['nameWithOwner']}; "
+                    "labels, branch updates and merges will fail"
+                )
+            repositories[name.lower()] = {
+                "full_name": node["nameWithOwner"],
+                "id": node["databaseId"],
+                "default_branch": (node["defaultBranchRef"] or {}).get("name"),
+                "permission": permission,
+            }
+        return data["viewer"]["login"], repositories
+
+    def _load(self):
+        if not self.enabled or not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                entry = json.load(f).get(self.key, {})
+        except (OSError, ValueError, AttributeError) as e:
+            self.logger.warning(f"⚠️  Ignoring unreadable identity cache {self.path}: {e}")
+            return {}
+
+        if time.time() - entry.get("fetched_at", 0) > self.ttl:
+            return {}
+        return entry
+
+    def _save(self, entry):
+        if not self.enabled:
+            return
+        try:
+            entries = {}
+            if self.path.exists():
+                with open(self.path, "r") as f:
+                    entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        entries[self.key] = entry
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"⚠️  Could not write identity cache {self.path}: {e}")
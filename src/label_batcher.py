@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+from dataclasses import replace
+
+from .graphql_client import GraphQLClient, quote
+from .request_gateway import OPTIONAL, request_priority
+
+
+class LabelBatcher:
+    def __init__(self, repo, config, logger, github_handler):
+        self.logger = logger
+        self.github_handler = github_handler
+        self.client = GraphQLClient(repo._requester)
+        self.owner, self.name = config["github"]["repo"].split("/", 1)
+
+        batch_config = config["labels"].get("batch", {})
+        self.enabled = batch_config.get("enabled", False)
+        self.batch_size = batch_config.get("batch_size", 50)
+
+        # Label node IDs never change, so they are looked up once per process.
+        self._label_ids = {}
+
+    def apply(self, snapshots, numbers):
+        pending = {}
+        for number in numbers:
+            snapshot = snapshots.get(number)
+            if snapshot is None or snapshot.node_id is None:
+                continue
+            missing = [label for label, _ in self.github_handler.missing_labels(snapshot.labels)]
+            if missing:
+                pending[number] = missing
+        if not pending:
+            return
+
+        try:
+            with request_priority(OPTIONAL):
+                self._resolve_label_ids({label for labels in pending.values() for label in labels})
+        except Exception as e:
+            self.logger.warning(f"⚠️  Could not look up label IDs, labeling PRs one by one: {e}")
+            return
+
+        # Labels that do not exist yet are left to the REST call, which creates them.
+        pending = {
+            number: labels
+            for number, labels in pending.items()
+            if all(self._label_ids.get(label) for label in labels)
+        }
+
+        numbers = sorted(pending)
+        labeled = []
+        for start in range(0, len(numbers), self.batch_size):
+            batch = numbers[start : start + self.batch_size]
+            try:
+                with request_priority(OPTIONAL):
+                    self._add_labels(snapshots, pending, batch)
+            except Exception as e:
+                self.logger.warning(f"⚠️  Could not label PRs {batch} in one request: {e}")
+                continue
+
+            for number in batch:
+                snapshot = snapshots[number]
+                snapshots[number] = replace(
+                    snapshot, labels=snapshot.labels + tuple(pending[number])
+                )
+                labeled.append(f"#{number} ({', '.join(pending[number])})")
+
+        if labeled:
+            self.logger.info(
+                f"🏷️  Added labels to {len(labeled)} PR(s) in one request: {', '.join(labeled)}"
+            )
+
+    def _resolve_label_ids(self, labels):
+        unknown = sorted(label for label in labels if label not in self._label_ids)
+        if not unknown:
+            return
+
+        selections = "\n".join(
+            f"    l{index}: label(name: {quote(label)}) {{ id }}"
+            for index, label in enumerate(unknown)
+        )
+        query = (
+            "query($owner: String!, $name: String!) {\n"
+            "  repository(owner: $owner, name: $name) {\n"
+            f"{selections}\n"
+            "  }\n"
+            "}\n"
+        )
+        data = self.client.execute(query, {"owner": self.owner, "name": self.name})
+
+        for index, label in enumerate(unknown):
+            node = data["repository"].get(f"l{index}")
+            self._label_ids[label] = node["id"] if node else None
+
+    def _add_labels(self, snapshots, pending, numbers):
+        mutations = "\n".join(
+            f"  pr{number}: addLabelsToLabelable(input: {{"
+            f"labelableId: {quote(snapshots[number].node_id)}, "
+            f"labelIds: [{', '.join(quote(self._label_ids[label]) for label in pending[number])}]"
+            f"}}) {{ clientMutationId }}"
+            for number in numbers
+        )
+        self.client.execute(f"mutation {{\n{mutations}\n}}\n")
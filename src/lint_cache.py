@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class LintResultCache:
+    def __init__(self, path, logger, max_entries=50000):
+        self.path = Path(path)
+        self.logger = logger
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = None
+
+    @staticmethod
+    def config_hash(cwd, config_files, command):
+        digest = hashlib.sha256(command.encode())
+        for config_file in config_files:
+            file_path = Path(cwd) / config_file
+            digest.update(config_file.encode())
+            if file_path.exists():
+                digest.update(file_path.read_bytes())
+        return digest.hexdigest()[:16]
+
+    def is_clean(self, blob_sha, config_hash):
+        with self._lock:
+            return f"{blob_sha}:{config_hash}" in self._load()
+
+    def mark_clean(self, blob_shas, config_hash):
+        with self._lock:
+            entries = self._load()
+            now = int(time.time())
+            for blob_sha in blob_shas:
+                key = f"{blob_sha}:{config_hash}"
+                entries.pop(key, None)
+                entries[key] = now
+
+            while len(entries) > self.max_entries:
+                entries.pop(next(iter(entries)))
+
+            self._save(entries)
+
+    def _load(self):
+        if self._entries is None:
+            self._entries = {}
+            if self.path.exists():
+                try:
+                    with open(self.path, "r") as f:
+                        self._entries = json.load(f)
+                except (OSError, ValueError) as e:
+                    self.logger.warning(f"⚠️  Ignoring unreadable linter cache {self.path}: {e}")
+        return self._entries
+
+    def _save(self, entries):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
@@ -1,75 +1,252 @@
 #!/usr/bin/env python3
 
 import os
-import subprocess
+import shlex
+import threading
+from pathlib import Path
 
 from git import GitCommandError, Repo
 
+from .command_runner import CommandRunner
+from .eslint_worker import ESLintWorkerPool
+from .fetch_strategy import FetchStrategy
+from .lint_cache import LintResultCache
+from .worktree_pool import WorktreePool
+
+
+DEFAULT_LINT_EXTENSIONS = [".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs"]
+DEFAULT_LINT_CONFIG_FILES = [
+    ".eslintrc",
+    ".eslintrc.js",
+    ".eslintrc.json",
+    ".eslintrc.yml",
+    "eslint.config.js",
+    ".prettierrc",
+    "package.json",
+    "package-lock.json",
+    "yarn.lock",
+]
+
 
 class LinterFixer:
-    def __init__(self, config, logger):
+    def __init__(self, config, logger, status_cache, metrics=None):
         self.config = config
         self.logger = logger
+        self.status_cache = status_cache
+        self.metrics = metrics
         self.local_repo_path = config["repository"]["local_path"]
+        self._clone_lock = threading.Lock()
+        self.fetch_strategy = FetchStrategy(config, logger)
+        self.command_runner = CommandRunner(config, logger)
+
+        self.worktree_pool = None
+        if config["repository"].get("worktrees", {}).get("enabled", False):
+            self.worktree_pool = WorktreePool(config, logger)
+
+        self.changed_files_config = config["linter"].get("changed_files", {})
+        self.lint_cache = None
+        if self.changed_files_config.get("enabled", False):
+            default_cache_file = Path(config["logging"]["directory"]) / "linter-cache.json"
+            self.lint_cache = LintResultCache(
+                self.changed_files_config.get("cache_file", default_cache_file), logger
+            )
+
+        self.eslint_workers = None
+        if config["linter"].get("worker", {}).get("enabled", False):
+            self.eslint_workers = ESLintWorkerPool(
+                config,
+                logger,
+                self.changed_files_config.get("config_files", DEFAULT_LINT_CONFIG_FILES),
+                self.command_runner,
+            )
+
+    def fix_linter_issues(self, pr, snapshot=None):
+        if self.command_runner.cancelled():
+            self.logger.info(f"⏭  Linter fixes cancelled - skipping PR #{pr.number}")
+            return
+
+        if self.worktree_pool is not None:
+            self._fix_in_worktree(pr, snapshot)
+            return
+
+        with self._clone_lock:
+            self._fix_in_shared_clone(pr, snapshot)
+
+    def cancel(self):
+        self.command_runner.cancel()
+        if self.eslint_workers is not None:
+            self.eslint_workers.close()
 
-    def fix_linter_issues(self, pr):
+    def _fix_in_worktree(self, pr, snapshot):
+        try:
+            branch_name = pr.head.ref
+            with self.worktree_pool.worktree(pr, snapshot) as worktree_path:
+                self.logger.info(f"🌳 Fixing PR #{pr.number} in worktree {worktree_path}")
+                worktree_repo = Repo(worktree_path)
+                if self._lint(worktree_repo, pr, snapshot):
+                    self._commit_and_push(worktree_repo, pr, f"HEAD:refs/heads/{branch_name}")
+                else:
+                    self._discard_changes(worktree_repo, pr)
+
+        except Exception as e:
+            self.logger.error(
+                f"Failed to fix linter issues for PR #{pr.number}: {e}", exc_info=True
+            )
+
+    def _fix_in_shared_clone(self, pr, snapshot):
         try:
             self._ensure_local_repo()
 
             local_repo = Repo(self.local_repo_path)
 
             self.logger.info(f"📥 Fetching latest changes for PR #{pr.number}")
-            local_repo.remotes.origin.fetch()
+            remote_ref = self.fetch_strategy.fetch_pr(local_repo, pr, snapshot)
 
             branch_name = pr.head.ref
             self.logger.info(f"🔄 Checking out branch {branch_name}")
+            self.fetch_strategy.checkout(local_repo, pr, remote_ref, local_branch=branch_name)
+
+            if self._lint(local_repo, pr, snapshot):
+                self._commit_and_push(local_repo, pr, branch_name)
+            else:
+                self._discard_changes(local_repo, pr)
+
+        except Exception as e:
+            self.logger.error(
+                f"Failed to fix linter issues for PR #{pr.number}: {e}", exc_info=True
+            )
 
-            try:
-                local_repo.git.checkout(branch_name)
-            except GitCommandError:
-                local_repo.git.checkout("-b", branch_name, f"origin/{branch_name}")
+    def _lint(self, local_repo, pr, snapshot):
+        if self.lint_cache is not None or self.eslint_workers is not None:
+            return self._fix_changed_files(local_repo, pr, snapshot)
 
-            local_repo.remotes.origin.pull(branch_name)
+        result = self._run_fix_command(
+            local_repo.working_tree_dir, self.config["linter"]["fix_command"], pr
+        )
+        return self._completed(result)
 
-            self.logger.info(
-                f"🔧 Running linter fix command: {self.config['linter']['fix_command']}"
+    def _fix_changed_files(self, local_repo, pr, snapshot):
+        settings = self.changed_files_config
+        cwd = local_repo.working_tree_dir
+
+        files = self._changed_files(local_repo, pr, snapshot)
+        pending = files
+        if self.lint_cache is not None:
+            config_hash = LintResultCache.config_hash(
+                cwd, settings.get("config_files", DEFAULT_LINT_CONFIG_FILES), self._lint_command()
             )
-            result = subprocess.run(
-                self.config["linter"]["fix_command"],
-                shell=True,
-                cwd=self.local_repo_path,
-                capture_output=True,
-                text=True,
+            blob_shas = self._hash_files(local_repo, files)
+            pending = [
+                file for file in files if not self.lint_cache.is_clean(blob_shas[file], config_hash)
+            ]
+            self.logger.info(
+                f"🧮 PR #{pr.number} has {len(files)} changed lintable files, "
+                f"{len(files) - len(pending)} already clean in cache"
             )
 
-            self.logger.info(f"📄 Linter command output: {result.stdout}")
-            if result.stderr:
-                self.logger.warning(f"⚠️  Linter command stderr: {result.stderr}")
+        batch_size = settings.get("batch_size", 50)
+        cacheable_exit_codes = settings.get("cacheable_exit_codes", [0, 1])
+        for start in range(0, len(pending), batch_size):
+            if self.command_runner.cancelled():
+                return False
+
+            batch = pending[start : start + batch_size]
+            if self.eslint_workers is not None:
+                result = self.eslint_workers.fix(cwd, batch)
+                self._record_command(pr, result)
+                if result.returncode is None:
+                    self.logger.info("↩️  Falling back to the linter fix command")
+                    result = self._run_fix_command(cwd, self.config["linter"]["fix_command"], pr)
+                    return self._completed(result)
+            else:
+                command = settings["command"].replace(
+                    "{files}", " ".join(shlex.quote(file) for file in batch)
+                )
+                result = self._run_fix_command(cwd, command, pr)
+                if not self._completed(result):
+                    return False
 
-            if local_repo.is_dirty():
-                self.logger.info("💾 Committing linter fixes")
-                local_repo.git.add(A=True)
-                local_repo.index.commit("Fix linter issues (automated by CI Plumber)")
+            if self.lint_cache is not None and result.returncode in cacheable_exit_codes:
+                fixed_shas = self._hash_files(local_repo, batch)
+                self.lint_cache.mark_clean(fixed_shas.values(), config_hash)
 
-                self.logger.info("📤 Pushing linter fixes to remote")
-                local_repo.remotes.origin.push(branch_name)
+        return True
 
-                self.logger.info(
-                    f"✅ Successfully fixed and pushed linter issues for PR #{pr.number}"
-                )
-            else:
-                self.logger.info("ℹ️  No linter changes to commit")
+    def _lint_command(self):
+        # Worker results are cached separately from the command line they replace.
+        if self.eslint_workers is not None:
+            return f"eslint-worker:{self.eslint_workers.node}"
+        return self.changed_files_config["command"]
 
-        except Exception as e:
-            self.logger.error(
-                f"Failed to fix linter issues for PR #{pr.number}: {e}", exc_info=True
+    def _changed_files(self, local_repo, pr, snapshot):
+        base_ref = snapshot.base_ref if snapshot is not None else pr.base.ref
+        extensions = tuple(self.changed_files_config.get("extensions", DEFAULT_LINT_EXTENSIONS))
+
+        try:
+            output = local_repo.git.diff(
+                "--name-only", "--diff-filter=ACMR", f"refs/remotes/origin/{base_ref}...HEAD"
             )
+            files = output.splitlines()
+        except GitCommandError:
+            self.logger.info("ℹ️  Merge base not available locally, listing PR files via the API")
+            files = [changed.filename for changed in pr.get_files() if changed.status != "removed"]
+
+        return [
+            file
+            for file in files
+            if file.endswith(extensions)
+            and os.path.exists(os.path.join(local_repo.working_tree_dir, file))
+        ]
+
+    @staticmethod
+    def _hash_files(local_repo, files):
+        blob_shas = {}
+        for start in range(0, len(files), 500):
+            batch = files[start : start + 500]
+            output = local_repo.git.hash_object("--", *batch)
+            blob_shas.update(zip(batch, output.splitlines()))
+        return blob_shas
+
+    def _run_fix_command(self, cwd, command, pr):
+        self.logger.info(f"🔧 Running linter fix command: {command}")
+        result = self.command_runner.run(command, cwd)
+        self._record_command(pr, result)
+        return result
+
+    def _record_command(self, pr, result):
+        if self.metrics is not None:
+            self.metrics.record_command(pr.number, result)
+
+    @staticmethod
+    def _completed(result):
+        return not (result.timed_out or result.cancelled)
+
+    def _discard_changes(self, local_repo, pr):
+        # A killed linter may have rewritten only some files; never push half a fix.
+        self.logger.warning(
+            f"🗑️  Linter run for PR #{pr.number} did not finish, discarding changes"
+        )
+        local_repo.git.reset("--hard", "HEAD")
+
+    def _commit_and_push(self, local_repo, pr, push_refspec):
+        if local_repo.is_dirty():
+            self.logger.info("💾 Committing linter fixes")
+            local_repo.git.add(A=True)
+            local_repo.index.commit("Fix linter issues (automated by CI Plumber)")
+
+            self.logger.info("📤 Pushing linter fixes to remote")
+            local_repo.remotes.origin.push(push_refspec)
+            self.status_cache.invalidate(pr.head.sha)
+
+            self.logger.info(f"✅ Successfully fixed and pushed linter issues for PR #{pr.number}")
+        else:
+            self.logger.info("ℹ️  No linter changes to commit")
 
     def _ensure_local_repo(self):
         if not os.path.exists(self.local_repo_path):
             self.logger.info(f"📦 Cloning repository to {self.local_repo_path}")
             repo_url = f"https://{self.config['github']['token']}@github.com/{self.config['github']['repo']}.git"
-            Repo.clone_from(repo_url, self.local_repo_path)
+            self.fetch_strategy.clone(repo_url, self.local_repo_path)
             self.logger.info("✅ Repository cloned successfully")
         else:
             self.logger.info(f"📂 Using existing repository at {self.local_repo_path}")
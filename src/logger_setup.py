@@ -1,8 +1,17 @@
 #!/usr/bin/env python3
 
+import atexit
+import gzip
 import logging
+import os
+import queue
+import re
+import shutil
 import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 
@@ -25,34 +34,253 @@ class ColoredFormatter(logging.Formatter):
         "CRITICAL": "🔥",
     }
 
+    def __init__(self, fmt=None, use_color=None):
+        super().__init__(fmt)
+        if use_color is None:
+            use_color = hasattr(sys.stdout, "isatty") and sys.stdout.isatty()
+        self.use_color = use_color
+
     def format(self, record):
-        if hasattr(sys.stdout, "isatty") and sys.stdout.isatty():
-            levelname = record.levelname
-            if levelname in self.COLORS:
-                emoji = self.EMOJI.get(levelname, "")
-                record.levelname = f"{self.COLORS[levelname]}{emoji} {levelname}{self.RESET}"
-                record.msg = f"{self.COLORS[levelname]}{record.msg}{self.RESET}"
-        return super().format(record)
+        if getattr(record, "console_only", False):
+            return record.getMessage()
 
+        levelname = record.levelname
+        if not self.use_color or levelname not in self.COLORS:
+            return super().format(record)
 
-def setup_logging(config):
-    log_dir = Path(config["logging"]["directory"])
-    log_dir.mkdir(exist_ok=True)
+        # The file handler formats the same record, so the colors go on a copy.
+        colored = logging.makeLogRecord(record.__dict__)
+        colored.levelname = (
+            f"{self.COLORS[levelname]}{self.EMOJI[levelname]} {levelname}{self.RESET}"
+        )
+        colored.msg = f"{self.COLORS[levelname]}{record.getMessage()}{self.RESET}"
+        colored.args = None
+        return super().format(colored)
+
+
+class DailyLogFileHandler(logging.FileHandler):
+    def __init__(self, directory, prefix, max_bytes, backup_count, compress):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress
+        self.day = self._today()
+        self._archive_pattern = re.compile(
+            rf"{re.escape(prefix)}-(\d{{4}}-\d{{2}}-\d{{2}})(?:\.(\d+))?\.log(\.gz)?$"
+        )
+        self._swept = False
+        super().__init__(self._path(self.day), delay=True, encoding="utf-8")
+
+    @staticmethod
+    def _today():
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def _path(self, day):
+        return self.directory / f"{self.prefix}-{day}.log"
+
+    def emit(self, record):
+        # Runs on the listener thread, so rotation and compression never hold up the
+        # thread that logged the record.
+        try:
+            if not self._swept:
+                self._swept = True
+                self._archive_previous_days()
+
+            day = self._today()
+            if day != self.day:
+                self.close()
+                self.day = day
+                self.baseFilename = os.path.abspath(self._path(day))
+                self._archive_previous_days()
+            elif self.max_bytes:
+                if self.stream is None:
+                    self.stream = self._open()
+                if self.stream.tell() >= self.max_bytes:
+                    self._roll_over_size()
+        except Exception:
+            self.handleError(record)
+            return
+        super().emit(record)
+
+    def _roll_over_size(self):
+        self.close()
+        current = Path(self.baseFilename)
+        index = 1
+        while any(
+            (self.directory / f"{self.prefix}-{self.day}.{index}.log{suffix}").exists()
+            for suffix in ("", ".gz")
+        ):
+            index += 1
+        rolled = self.directory / f"{self.prefix}-{self.day}.{index}.log"
+        os.replace(current, rolled)
+        self._archive(rolled)
+        self._prune()
+
+    def _archive_previous_days(self):
+        # Hourly runs rarely live across midnight, so yesterday's file is usually
+        # left behind by an earlier process and archived by the next one.
+        active = Path(self.baseFilename).name
+        for path in self.directory.glob(f"{self.prefix}-*.log"):
+            if path.name != active and self._archive_pattern.match(path.name):
+                self._archive(path)
+        self._prune()
+
+    def _archive(self, path):
+        if not self.compress:
+            return
+        target = path.with_name(f"{path.name}.gz")
+        tmp_path = path.with_name(f"{path.name}.gz.tmp")
+        with open(path, "rb") as source, gzip.open(tmp_path, "wb") as destination:
+            shutil.copyfileobj(source, destination)
+        shutil.copystat(path, tmp_path)
+        os.replace(tmp_path, target)
+        path.unlink()
+
+    def _prune(self):
+        if not self.backup_count:
+            return
+        active = Path(self.baseFilename).name
+        archives = sorted(
+            (
+                path
+                for path in self.directory.glob(f"{self.prefix}-*")
+                if path.name != active and self._archive_pattern.match(path.name)
+            ),
+            key=self._archive_order,
+        )
+        for path in archives[: max(len(archives) - self.backup_count, 0)]:
+            path.unlink()
+
+    def _archive_order(self, path):
+        # Compressing rewrites a file, so its mtime says when it was archived rather
+        # than when it was logged. Within a day the size roll-overs come in index
+        # order, and the day's own file, which is only archived the next day, last.
+        day, index, _ = self._archive_pattern.match(path.name).groups()
+        return day, int(index) if index else float("inf")
+
+
+class ConsoleOnlyFilter(logging.Filter):
+    def filter(self, record):
+        return not getattr(record, "console_only", False)
+
+
+class PRLogBuffer(logging.Filter):
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+        self._flush_lock = threading.Lock()
 
-    log_file = log_dir / f"ci-plumber-{datetime.now().strftime('%Y-%m-%d')}.log"
+    def filter(self, record):
+        records = getattr(self._local, "records", None)
+        if records is None:
+            return True
+        records.append(record)
+        return False
 
-    file_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-    console_formatter = ColoredFormatter("%(asctime)s - %(levelname)s - %(message)s")
+    @contextmanager
+    def capture(self, logger, header=None):
+        self._local.records = []
+        try:
+            yield
+        finally:
+            records = self._local.records
+            self._local.records = None
+            with self._flush_lock:
+                if header:
+                    header()
+                for record in records:
+                    logger.handle(record)
 
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setFormatter(file_formatter)
 
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(console_formatter)
+_pipeline = {}
+_pipeline_lock = threading.Lock()
+
+
+def setup_logging(config):
+    logging_config = config["logging"]
+    rotation = logging_config.get("rotation", {})
+    settings = (
+        str(Path(logging_config["directory"]).resolve()),
+        logging_config["level"],
+        rotation.get("max_size_mb", 50),
+        rotation.get("backups", 30),
+        rotation.get("compress", True),
+    )
 
     logger = logging.getLogger(__name__)
-    logger.setLevel(getattr(logging, config["logging"]["level"]))
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    with _pipeline_lock:
+        # Setting up again with the same settings keeps the running pipeline instead
+        # of stacking a second set of handlers on the logger.
+        if _pipeline.get("settings") == settings:
+            return logger
+        _stop_pipeline(logger)
+
+        log_dir = Path(logging_config["directory"])
+        log_dir.mkdir(parents=True, exist_ok=True)
+
+        file_handler = DailyLogFileHandler(
+            log_dir,
+            "ci-plumber",
+            max_bytes=int(settings[2] * 1024 * 1024),
+            backup_count=settings[3],
+            compress=settings[4],
+        )
+        file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+        file_handler.addFilter(ConsoleOnlyFilter())
+
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(ColoredFormatter("%(asctime)s - %(levelname)s - %(message)s"))
+
+        # Callers only put records on the queue; one listener thread does all disk
+        # and terminal writes, so PR workers never wait on I/O.
+        records = queue.SimpleQueue()
+        listener = QueueListener(records, file_handler, console_handler, respect_handler_level=True)
+        listener.start()
+
+        queue_handler = QueueHandler(records)
+        logger.addHandler(queue_handler)
+        logger.setLevel(getattr(logging, logging_config["level"]))
+
+        _pipeline.update(
+            settings=settings,
+            listener=listener,
+            queue_handler=queue_handler,
+            handlers=[file_handler, console_handler],
+        )
+        if not _pipeline.get("atexit"):
+            atexit.register(shutdown_logging)
+            _pipeline["atexit"] = True
 
     return logger
+
+
+def shutdown_logging():
+    with _pipeline_lock:
+        _stop_pipeline(logging.getLogger(__name__))
+
+
+def _stop_pipeline(logger):
+    listener = _pipeline.pop("listener", None)
+    if listener is None:
+        return
+    logger.removeHandler(_pipeline.pop("queue_handler"))
+    # stop() writes out everything still queued before the handlers are closed.
+    listener.stop()
+    for handler in _pipeline.pop("handlers"):
+        handler.close()
+    _pipeline.pop("settings", None)
+
+
+def write_console(text):
+    logger = logging.getLogger(__name__)
+    if not logger.handlers:
+        print(text)
+        return
+
+    # Banners travel through the same queue as log records so they stay in order
+    # with them; they bypass the level and are kept out of the log file.
+    record = logger.makeRecord(
+        logger.name, logging.INFO, "(console)", 0, text, None, None, extra={"console_only": True}
+    )
+    logger.handle(record)
@@ -1,19 +1,74 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
+import signal
 import sys
 from pathlib import Path
 
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.ci_plumber import CIPlumber
+from src.startup_profile import startup_profile  # isort: skip - first, to time the rest
+
+from src.config_loader import ConfigLoader
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Keep labeled PRs green and merge them.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--daemon",
+        action="store_true",
+        help="stay running and re-evaluate PRs when GitHub webhooks arrive",
+    )
+    mode.add_argument(
+        "--replay",
+        nargs="+",
+        metavar="PATH",
+        help="feed recorded webhook deliveries (files or directories) through the daemon queue",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="log where time goes between process start and the first PR evaluation",
+    )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+    if args.profile_startup:
+        startup_profile.enable()
+    startup_profile.mark("entry point")
+
     config_path = os.path.join(os.path.dirname(__file__), "..", "cfg", "config.yaml")
-    plumber = CIPlumber(config_path)
-    plumber.run()
+    config = ConfigLoader.load(config_path)
+    startup_profile.mark("config")
+
+    # Only the modes in use are imported; a plain run never loads the HTTP server.
+    if config.get("repositories"):
+        from src.multi_repo import MultiRepoPlumber
+
+        startup_profile.mark("imports")
+        plumber = MultiRepoPlumber(config=config)
+    else:
+        from src.ci_plumber import CIPlumber
+
+        startup_profile.mark("imports")
+        plumber = CIPlumber(config=config)
+
+    if args.daemon or args.replay:
+        from src.daemon import WebhookDaemon
+
+        if args.daemon:
+            WebhookDaemon(plumber).serve()
+        else:
+            WebhookDaemon(plumber).replay(args.replay)
+    else:
+        # launchd stops a run with SIGTERM; linter processes are killed instead of orphaned.
+        signal.signal(signal.SIGTERM, lambda signum, frame: plumber.cancel())
+        plumber.run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass
+
+from github import GithubException
+
+
+@dataclass
+class MergeCandidate:
+    pr: object
+    snapshot: object
+    files: frozenset
+    changes: int
+    behind_by: object
+    overlaps: int = 0
+
+
+class MergePlanner:
+    def __init__(self, config, logger):
+        self.logger = logger
+
+        planner_config = config.get("merge_planner", {})
+        self.enabled = planner_config.get("enabled", False)
+        self.defer_overlapping = planner_config.get("defer_overlapping", True)
+
+    def plan(self, ready):
+        if len(ready) == 1:
+            pr, snapshot = ready[0]
+            return [MergeCandidate(pr, snapshot, frozenset(), 0, self._behind_by(snapshot))]
+
+        candidates = [self._candidate(pr, snapshot) for pr, snapshot in ready]
+        for candidate in candidates:
+            candidate.overlaps = sum(
+                1
+                for other in candidates
+                if other is not candidate and candidate.files & other.files
+            )
+
+        # Up-to-date PRs keep their green CI after an earlier merge only if nothing
+        # merged before them touched their files, so they go first; then the PRs
+        # that collide with the fewest others, then the smallest diffs.
+        ordered = sorted(
+            candidates,
+            key=lambda candidate: (
+                candidate.behind_by != 0,
+                candidate.overlaps,
+                candidate.changes,
+                candidate.pr.number,
+            ),
+        )
+        self.logger.info(
+            "🗺️  Merge plan: "
+            + ", ".join(
+                f"#{candidate.pr.number} ({self._describe(candidate)})" for candidate in ordered
+            )
+        )
+        return ordered
+
+    def merge_all(self, ready, merge, update_branch):
+        decisions = {}
+        merged = []
+
+        for candidate in self.plan(ready):
+            number = candidate.pr.number
+            blocking = [other.pr.number for other in merged if candidate.files & other.files]
+            if self.defer_overlapping and blocking:
+                self.logger.info(
+                    f"⏭  PR #{number} held back - it touches files changed by "
+                    f"{', '.join(f'#{other}' for other in blocking)} merged just before; "
+                    "updating its branch so CI runs against the new base"
+                )
+                # Without the update its head would not change, and the next run
+                # would merge the same commit that was never tested on this base.
+                update_branch(candidate.pr, candidate.snapshot)
+                decisions[number] = "merge_deferred"
+                continue
+
+            if merge(candidate.pr, candidate.snapshot):
+                decisions[number] = "merged"
+                merged.append(candidate)
+                continue
+
+            decisions[number] = "merge_failed"
+            # Ready PRs skip the branch update, so a merge refused for being behind
+            # (a branch protection requiring up-to-date branches, for one) would fail
+            # the same way every run. A PR that already contains the base is left as is.
+            if candidate.behind_by != 0 or merged:
+                self.logger.info(f"🔄 Updating the branch of PR #{number} after the failed merge")
+                update_branch(candidate.pr, candidate.snapshot)
+
+        return decisions
+
+    def _candidate(self, pr, snapshot):
+        files = set()
+        changes = 0
+        try:
+            for changed_file in pr.get_files():
+                files.add(changed_file.filename)
+                if changed_file.previous_filename:
+                    files.add(changed_file.previous_filename)
+                changes += changed_file.changes
+        except GithubException as e:
+            self.logger.warning(f"⚠️  Could not list files of PR #{pr.number} for planning: {e}")
+
+        return MergeCandidate(pr, snapshot, frozenset(files), changes, self._behind_by(snapshot))
+
+    @staticmethod
+    def _behind_by(snapshot):
+        return snapshot.behind_by if snapshot is not None else None
+
+    @staticmethod
+    def _describe(candidate):
+        if candidate.behind_by == 0:
+            position = "up to date"
+        elif candidate.behind_by is None:
+            position = "behind unknown"
+        else:
+            position = f"{candidate.behind_by} behind"
+        return (
+            f"{position}, {len(candidate.files)} files, {candidate.changes} lines, "
+            f"overlaps {candidate.overlaps}"
+        )
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import asyncio
+import time
+
+
+class MergeWatcher:
+    def __init__(self, config, logger, github_handler, status_cache):
+        self.logger = logger
+        self.github_handler = github_handler
+        self.status_cache = status_cache
+
+        watch_config = config.get("watch", {})
+        self.deadline = watch_config.get("deadline_minutes", 15) * 60
+        self.concurrency = watch_config.get("concurrency", 4)
+        self.initial_interval = watch_config.get("initial_interval_seconds", 15)
+        self.max_interval = watch_config.get("max_interval_seconds", 120)
+        self.backoff_factor = watch_config.get("backoff_factor", 2)
+
+    def watch(self, candidates):
+        self.logger.info(
+            f"👀 Watching {len(candidates)} approved PR(s) waiting for CI "
+            f"for up to {self.deadline // 60} minutes"
+        )
+        started = time.monotonic()
+        results = asyncio.run(self._watch_all(candidates))
+
+        outcomes = {}
+        for outcome in results:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        summary = ", ".join(f"{count} {outcome}" for outcome, count in sorted(outcomes.items()))
+        self.logger.info(f"👀 Watch finished after {time.monotonic() - started:.0f}s: {summary}")
+        return results
+
+    async def _watch_all(self, candidates):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        deadline = time.monotonic() + self.deadline
+        return await asyncio.gather(
+            *(self._watch_pr(pr, snapshot, semaphore, deadline) for pr, snapshot in candidates)
+        )
+
+    async def _watch_pr(self, pr, snapshot, semaphore, deadline):
+        head_sha = snapshot.head_sha if snapshot is not None else pr.head.sha
+        interval = self.initial_interval
+
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.logger.info(f"⌛ PR #{pr.number} still pending at the watch deadline")
+                    return "timed_out"
+
+                await asyncio.sleep(min(interval, remaining))
+                async with semaphore:
+                    state = await asyncio.to_thread(self._poll, head_sha)
+
+                if state == "success":
+                    self.logger.info(f"🟢 PR #{pr.number} turned green, merging")
+                    async with semaphore:
+                        merged = await asyncio.to_thread(self._merge, pr, snapshot, head_sha)
+                    return "merged" if merged else "merge_failed"
+
+                if state != "pending":
+                    self.logger.warning(f"❌ PR #{pr.number} CI finished with '{state}'")
+                    return state
+
+                self.logger.debug(f"⏳ PR #{pr.number} still pending, next check in {interval}s")
+                interval = min(interval * self.backoff_factor, self.max_interval)
+
+        except Exception as e:
+            self.logger.error(f"Error watching PR #{pr.number}: {e}", exc_info=True)
+            return "error"
+
+    def _poll(self, head_sha):
+        self.status_cache.invalidate(head_sha)
+        commit_status = self.status_cache.get(head_sha)
+
+        if any(
+            check.conclusion not in ["success", "skipped", "neutral", None]
+            for check in commit_status.check_runs
+        ):
+            return "failure"
+        return commit_status.state
+
+    def _merge(self, pr, snapshot, head_sha):
+        if not self.github_handler.can_merge(pr, snapshot):
+            return False
+        return self.github_handler.merge_pr(pr, sha=head_sha)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import time
+from dataclasses import replace
+
+from github import GithubException
+
+from .request_gateway import CRITICAL, request_priority
+
+
+class MergeabilityResolver:
+    def __init__(self, config, logger, snapshot_loader):
+        self.logger = logger
+        self.snapshot_loader = snapshot_loader
+
+        mergeability_config = config["github"].get("mergeability", {})
+        self.wait_seconds = mergeability_config.get("wait_seconds", 2)
+        self.attempts = mergeability_config.get("attempts", 3)
+
+    def resolve(self, prs, snapshots):
+        # Reading mergeable (snapshot query or PR fetch) is what makes GitHub start
+        # computing it, so every PR is read once before the first shared wait.
+        with request_priority(CRITICAL):
+            unknown = [pr for pr in prs if self._mergeable(pr, snapshots) is None]
+
+            for attempt in range(self.attempts):
+                if not unknown:
+                    break
+                self.logger.info(
+                    f"⏳ GitHub is still computing mergeability for {len(unknown)} PR(s), "
+                    f"checking again in {self.wait_seconds}s"
+                )
+                time.sleep(self.wait_seconds)
+                self._refresh(unknown, snapshots)
+                unknown = [pr for pr in unknown if self._mergeable(pr, snapshots) is None]
+
+        for pr in unknown:
+            self.logger.info(f"❔ PR #{pr.number} mergeability is still unknown, rechecking soon")
+        return {pr.number for pr in unknown}
+
+    def _mergeable(self, pr, snapshots):
+        snapshot = snapshots.get(pr.number)
+        if snapshot is not None:
+            return True if snapshot.merged else snapshot.mergeable
+        # Reading these fetches the PR; a failure only leaves this PR unknown.
+        try:
+            return True if pr.merged else pr.mergeable
+        except GithubException as e:
+            self.logger.warning(f"⚠️  Could not read mergeability of PR #{pr.number}: {e}")
+            return None
+
+    def _refresh(self, prs, snapshots):
+        numbers = [pr.number for pr in prs if pr.number in snapshots]
+        if numbers:
+            try:
+                for number, mergeable in self.snapshot_loader.load_mergeable(numbers).items():
+                    snapshots[number] = replace(snapshots[number], mergeable=mergeable)
+            except Exception as e:
+                self.logger.warning(f"⚠️  Could not refresh mergeability for PRs {numbers}: {e}")
+
+        for pr in prs:
+            if pr.number not in snapshots:
+                try:
+                    pr.update()
+                except GithubException as e:
+                    self.logger.warning(f"⚠️  Could not refresh PR #{pr.number}: {e}")
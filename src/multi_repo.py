@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .ci_plumber import CIPlumber
+from .config_loader import ConfigLoader
+from .console_utils import print_header, print_success_box
+from .shared_context import SharedContext
+
+
+def merge_config(base, override):
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def repository_configs(config):
+    base = {key: value for key, value in config.items() if key != "repositories"}
+    configs = []
+
+    for entry in config["repositories"]:
+        entry = dict(entry) if isinstance(entry, dict) else {"repo": entry}
+        repo_name = entry.pop("repo")
+        repo_config = merge_config(base, entry)
+        repo_config["github"]["repo"] = repo_name
+
+        # Run reports, state and caches that are keyed by PR number or written per
+        # run get their own directory so repositories do not overwrite each other.
+        if "directory" not in entry.get("logging", {}):
+            repo_config["logging"]["directory"] = str(
+                Path(base["logging"]["directory"]) / repo_name.replace("/", "__")
+            )
+        configs.append(repo_config)
+
+    names = [repo_config["github"]["repo"].lower() for repo_config in configs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Repositories listed more than once: {', '.join(duplicates)}")
+
+    local_paths = [repo_config["repository"]["local_path"] for repo_config in configs]
+    duplicates = sorted({path for path in local_paths if local_paths.count(path) > 1})
+    if duplicates:
+        raise ValueError(
+            f"Repositories share repository.local_path {', '.join(duplicates)}. "
+            "Give each entry under 'repositories' its own local_path."
+        )
+    return configs
+
+
+class MultiRepoPlumber:
+    def __init__(self, config_path="cfg/config.yaml", config=None):
+        self.config = config if config is not None else ConfigLoader.load(config_path)
+        repo_configs = repository_configs(self.config)
+
+        self.shared = SharedContext(
+            self.config, [repo_config["github"]["repo"] for repo_config in repo_configs]
+        )
+        self.logger = self.shared.logger
+        self.plumbers = [
+            CIPlumber(config=repo_config, shared=self.shared) for repo_config in repo_configs
+        ]
+        self.concurrency = self.config.get("processing", {}).get("repositories", len(self.plumbers))
+
+    def run(self, watch=True):
+        print_header("🔧 CI Plumber Starting...")
+        self.logger.info(
+            f"📦 Processing {len(self.plumbers)} repositories, up to {self.concurrency} at a time"
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="repo-worker"
+        ) as executor:
+            futures = [executor.submit(plumber.run, watch) for plumber in self.plumbers]
+            try:
+                for future in futures:
+                    future.result()
+            except KeyboardInterrupt:
+                self.cancel()
+                raise
+
+        self.shared.log_summaries()
+        print_success_box("✅ CI Plumber Run Completed!")
+
+    def cancel(self):
+        for plumber in self.plumbers:
+            plumber.cancel()
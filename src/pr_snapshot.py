@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+
+from dataclasses import dataclass
+
+from .graphql_client import GraphQLClient, quote
+from .request_gateway import CRITICAL, request_priority
+
+
+PR_FIELDS = """
+fragment PRFields on PullRequest {
+  id
+  number
+  merged
+  mergeable
+  isCrossRepository
+  headRefName
+  headRefOid
+  baseRefName
+  baseRef { target { oid } }
+  labels(first: 100) { pageInfo { hasNextPage } nodes { name } }
+  reviews(first: 100) { pageInfo { hasNextPage } nodes { state author { login } } }
+  reviewRequests(first: 100) {
+    pageInfo { hasNextPage }
+    nodes { requestedReviewer { __typename ... on User { login } ... on Team { slug } } }
+  }
+  commits(last: 1) {
+    nodes {
+      commit {
+        oid
+        status { state contexts { context state } }
+        checkSuites(first: 50) {
+          pageInfo { hasNextPage }
+          nodes {
+            workflowRun { databaseId workflow { databaseId name } }
+            checkRuns(first: 100) {
+              pageInfo { hasNextPage }
+              nodes { databaseId name conclusion detailsUrl }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+MERGEABLE_STATES = {"MERGEABLE": True, "CONFLICTING": False, "UNKNOWN": None}
+
+
+@dataclass(frozen=True)
+class StatusContext:
+    context: str
+    state: str
+
+
+@dataclass(frozen=True)
+class CheckRun:
+    id: int
+    name: str
+    conclusion: object
+    details_url: object = None
+    workflow_run_id: object = None
+    workflow_id: object = None
+    workflow_name: object = None
+
+
+@dataclass(frozen=True)
+class CommitStatus:
+    sha: str
+    state: str
+    statuses: tuple
+    check_runs: tuple
+
+
+@dataclass(frozen=True)
+class Review:
+    user: str
+    state: str
+
+
+@dataclass(frozen=True)
+class PRSnapshot:
+    number: int
+    head_sha: str
+    head_ref: str
+    base_ref: str
+    is_cross_repository: bool
+    merged: bool
+    mergeable: object
+    labels: tuple
+    reviews: tuple
+    requested_users: tuple
+    requested_teams: tuple
+    status: CommitStatus
+    behind_by: object = None
+    base_sha: object = None
+    node_id: object = None
+
+
+class PRSnapshotLoader:
+    def __init__(self, repo, config, logger):
+        self.repo = repo
+        self.config = config
+        self.logger = logger
+        self.client = GraphQLClient(repo._requester)
+        self.owner, self.name = config["github"]["repo"].split("/", 1)
+
+    def enabled(self):
+        return self.config["github"].get("snapshot", {}).get("enabled", True)
+
+    def load(self, prs):
+        batch_size = self.config["github"].get("snapshot", {}).get("batch_size", 20)
+        numbers = [pr.number for pr in prs]
+        snapshots = {}
+
+        for start in range(0, len(numbers), batch_size):
+            batch = numbers[start : start + batch_size]
+            try:
+                with request_priority(CRITICAL):
+                    snapshots.update(self._load_batch(batch))
+            except Exception as e:
+                self.logger.warning(
+                    f"⚠️  Could not load snapshot for PRs {batch}, falling back to REST: {e}"
+                )
+
+        self.logger.info(f"📸 Loaded snapshots for {len(snapshots)}/{len(numbers)} PRs")
+        return snapshots
+
+    def _load_batch(self, numbers):
+        selections = "\n".join(
+            f"    pr{number}: pullRequest(number: {number}) {{ ...PRFields }}" for number in numbers
+        )
+        query = (
+            "query($owner: String!, $name: String!) {\n"
+            "  repository(owner: $owner, name: $name) {\n"
+            f"{selections}\n"
+            "  }\n"
+            "}\n"
+            f"{PR_FIELDS}"
+        )
+        data = self.client.execute(query, {"owner": self.owner, "name": self.name})
+
+        snapshots = {}
+        for number in numbers:
+            node = data["repository"].get(f"pr{number}")
+            if node is None:
+                continue
+            if self._is_truncated(node):
+                self.logger.info(f"ℹ️  PR #{number} has too many reviews/checks for a snapshot")
+                continue
+            snapshots[number] = self._build_snapshot(node)
+
+        return snapshots
+
+    def load_mergeable(self, numbers):
+        selections = "\n".join(
+            f"    pr{number}: pullRequest(number: {number}) {{ mergeable }}" for number in numbers
+        )
+        query = (
+            "query($owner: String!, $name: String!) {\n"
+            "  repository(owner: $owner, name: $name) {\n"
+            f"{selections}\n"
+            "  }\n"
+            "}\n"
+        )
+        data = self.client.execute(query, {"owner": self.owner, "name": self.name})
+
+        return {
+            number: MERGEABLE_STATES.get(data["repository"][f"pr{number}"]["mergeable"])
+            for number in numbers
+            if data["repository"].get(f"pr{number}")
+        }
+
+    def load_behind_counts(self, snapshots):
+        comparable = [snapshot for snapshot in snapshots if not snapshot.is_cross_repository]
+        if not comparable:
+            return {}
+
+        selections = "\n".join(
+            f"    pr{snapshot.number}: ref(qualifiedName: {quote('refs/heads/' + snapshot.base_ref)}) "
+            f"{{ compare(headRef: {quote(snapshot.head_ref)}) {{ behindBy }} }}"
+            for snapshot in comparable
+        )
+        query = (
+            "query($owner: String!, $name: String!) {\n"
+            "  repository(owner: $owner, name: $name) {\n"
+            f"{selections}\n"
+            "  }\n"
+            "}\n"
+        )
+        data = self.client.execute(query, {"owner": self.owner, "name": self.name})
+
+        behind_counts = {}
+        for snapshot in comparable:
+            ref = data["repository"].get(f"pr{snapshot.number}")
+            if ref and ref.get("compare"):
+                behind_counts[snapshot.number] = ref["compare"]["behindBy"]
+        return behind_counts
+
+    @staticmethod
+    def _is_truncated(node):
+        connections = [node["labels"], node["reviews"], node["reviewRequests"]]
+        for commit_node in node["commits"]["nodes"]:
+            suites = commit_node["commit"]["checkSuites"]
+            connections.append(suites)
+            connections.extend(suite["checkRuns"] for suite in suites["nodes"])
+        return any(connection["pageInfo"]["hasNextPage"] for connection in connections)
+
+    def _build_snapshot(self, node):
+        requested_users = []
+        requested_teams = []
+        for request in node["reviewRequests"]["nodes"]:
+            reviewer = request["requestedReviewer"] or {}
+            if reviewer.get("__typename") == "User":
+                requested_users.append(reviewer["login"])
+            elif reviewer.get("__typename") == "Team":
+                requested_teams.append(reviewer["slug"])
+
+        return PRSnapshot(
+            number=node["number"],
+            node_id=node.get("id"),
+            head_sha=node["headRefOid"],
+            head_ref=node["headRefName"],
+            base_ref=node["baseRefName"],
+            base_sha=((node["baseRef"] or {}).get("target") or {}).get("oid"),
+            is_cross_repository=node["isCrossRepository"],
+            merged=node["merged"],
+            mergeable=MERGEABLE_STATES.get(node["mergeable"]),
+            labels=tuple(label["name"] for label in node["labels"]["nodes"]),
+            reviews=tuple(
+                Review(user=(review["author"] or {}).get("login", "ghost"), state=review["state"])
+                for review in node["reviews"]["nodes"]
+            ),
+            requested_users=tuple(requested_users),
+            requested_teams=tuple(requested_teams),
+            status=self._build_commit_status(node["headRefOid"], node["commits"]["nodes"]),
+        )
+
+    @staticmethod
+    def _build_commit_status(sha, commit_nodes):
+        statuses = []
+        check_runs = []
+        # REST reports "pending" for a commit without any statuses, keep the same contract.
+        state = "pending"
+
+        for commit_node in commit_nodes:
+            commit = commit_node["commit"]
+            if commit["oid"] != sha:
+                continue
+
+            if commit["status"]:
+                state = commit["status"]["state"].lower()
+                statuses = [
+                    StatusContext(context=context["context"], state=context["state"].lower())
+                    for context in commit["status"]["contexts"]
+                ]
+
+            for suite in commit["checkSuites"]["nodes"]:
+                workflow_run = suite["workflowRun"] or {}
+                workflow = workflow_run.get("workflow") or {}
+                for run in suite["checkRuns"]["nodes"]:
+                    check_runs.append(
+                        CheckRun(
+                            id=run["databaseId"],
+                            name=run["name"],
+                            conclusion=run["conclusion"].lower() if run["conclusion"] else None,
+                            details_url=run["detailsUrl"],
+                            workflow_run_id=workflow_run.get("databaseId"),
+                            workflow_id=workflow.get("databaseId"),
+                            workflow_name=workflow.get("name"),
+                        )
+                    )
+
+        return CommitStatus(
+            sha=sha, state=state, statuses=tuple(statuses), check_runs=tuple(check_runs)
+        )
+
+
+def fetch_commit_status(repo, sha):
+    commit = repo.get_commit(sha)
+    combined_status = commit.get_combined_status()
+
+    return CommitStatus(
+        sha=sha,
+        state=combined_status.state,
+        statuses=tuple(
+            StatusContext(context=status.context, state=status.state)
+            for status in combined_status.statuses
+        ),
+        check_runs=tuple(
+            CheckRun(
+                id=check.id,
+                name=check.name,
+                conclusion=check.conclusion,
+                details_url=check.details_url,
+            )
+            for check in commit.get_check_runs()
+        ),
+    )
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+
+import heapq
+import itertools
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from github import RateLimitExceededException
+from github.Requester import Requester
+
+from .http_cache import CachingHTTPAdapter
+from .run_metrics import count_api_call
+
+
+CRITICAL = 0
+NORMAL = 1
+OPTIONAL = 2
+PRIORITY_NAMES = {CRITICAL: "critical", NORMAL: "normal", OPTIONAL: "optional"}
+
+ENDPOINT_PATTERNS = [
+    (re.compile(r"^/api/v3"), ""),
+    (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/{repo}"),
+    (re.compile(r"^/orgs/[^/]+"), "/orgs/{org}"),
+    (re.compile(r"/teams/[^/]+"), "/teams/{team}"),
+    (re.compile(r"/(memberships|users|collaborators)/[^/]+"), r"/\1/{user}"),
+    (re.compile(r"/[0-9a-f]{40}(?=/|$)"), "/{sha}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{n}"),
+    (re.compile(r"/(branches|labels|git/refs)/.+$"), r"/\1/{name}"),
+]
+
+_context = threading.local()
+
+
+@contextmanager
+def request_priority(priority):
+    previous = getattr(_context, "priority", NORMAL)
+    _context.priority = priority
+    try:
+        yield
+    finally:
+        _context.priority = previous
+
+
+def current_priority():
+    return getattr(_context, "priority", NORMAL)
+
+
+class RequestGateway:
+    def __init__(self, config, logger):
+        self.logger = logger
+
+        gateway_config = config["github"].get("rate_limit", {})
+        self.pace_below = gateway_config.get("pace_below", 0.2)
+        self.reserve = gateway_config.get("reserve", 0.05)
+        self.max_wait = gateway_config.get("max_wait_seconds", 900)
+        self.max_retries = gateway_config.get("max_retries", 3)
+        self.secondary_wait = gateway_config.get("secondary_wait_seconds", 60)
+
+        self._condition = threading.Condition()
+        self._sequence = itertools.count()
+        self._waiting = defaultdict(list)
+        self._limits = {}
+        self._last_sent = defaultdict(float)
+        self._blocked_until = 0.0
+        self._endpoints = defaultdict(lambda: {"requests": 0, "cost": 0, "rate_limited": 0})
+        self._waited = 0.0
+
+    def send(self, request, attempt):
+        resource = self._resource(request)
+        priority = current_priority()
+
+        for retry in range(self.max_retries + 1):
+            self._admit(resource, priority)
+            response = attempt()
+            cost = self._observe(resource, response)
+            wait = self._rate_limit_wait(response)
+            self._account(request, cost, rate_limited=wait is not None)
+
+            if wait is None:
+                return response
+            if retry == self.max_retries or wait > self.max_wait:
+                self.logger.error(
+                    f"🚦 Rate limited on {self._endpoint(request)}, giving up after "
+                    f"{retry + 1} attempt(s) (next window in {wait:.0f}s)"
+                )
+                return response
+
+            self.logger.warning(
+                f"🚦 Rate limited on {self._endpoint(request)} - pausing all requests for "
+                f"{wait:.0f}s"
+            )
+            with self._condition:
+                self._blocked_until = max(self._blocked_until, time.time() + wait)
+                self._condition.notify_all()
+
+        return response
+
+    def _admit(self, resource, priority):
+        ticket = (priority, next(self._sequence))
+        started = time.time()
+
+        with self._condition:
+            waiting = self._waiting[resource]
+            heapq.heappush(waiting, ticket)
+            try:
+                while True:
+                    wait = self._wait_time(resource, priority)
+                    if wait > self.max_wait:
+                        raise RateLimitExceededException(
+                            403,
+                            {"message": f"{resource} budget exhausted for {wait:.0f}s"},
+                            {},
+                        )
+                    if waiting[0] == ticket and wait <= 0:
+                        break
+                    self._condition.wait(timeout=wait if waiting[0] == ticket else None)
+            finally:
+                waiting.remove(ticket)
+                heapq.heapify(waiting)
+                self._condition.notify_all()
+
+            self._last_sent[resource] = time.time()
+            limits = self._limits.get(resource)
+            if limits is not None:
+                limits["remaining"] -= 1
+            self._waited += time.time() - started
+
+    def _wait_time(self, resource, priority):
+        now = time.time()
+        wait = self._blocked_until - now
+
+        limits = self._limits.get(resource)
+        if limits is None or limits["reset"] <= now:
+            return wait
+
+        if priority == OPTIONAL and limits["remaining"] <= limits["limit"] * self.reserve:
+            raise RateLimitExceededException(
+                403,
+                {"message": f"{resource} budget below reserve, skipping optional request"},
+                {},
+            )
+
+        if limits["remaining"] <= 0:
+            return max(wait, limits["reset"] - now + 1)
+
+        if limits["remaining"] < limits["limit"] * self.pace_below:
+            interval = (limits["reset"] - now) / limits["remaining"]
+            wait = max(wait, self._last_sent[resource] + interval - now)
+
+        return wait
+
+    def _observe(self, resource, response):
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+        if "X-RateLimit-Remaining" not in headers:
+            return 0 if response.status_code == 304 else 1
+
+        used = int(headers.get("X-RateLimit-Used", 0))
+        reset = int(headers.get("X-RateLimit-Reset", 0))
+        with self._condition:
+            previous = self._limits.get(resource)
+            self._limits[resource] = {
+                "limit": int(headers.get("X-RateLimit-Limit", 0)),
+                "remaining": int(headers["X-RateLimit-Remaining"]),
+                "reset": reset,
+                "used": used,
+            }
+            self._condition.notify_all()
+
+        if response.status_code == 304:
+            return 0
+        # GraphQL queries cost points, not requests; the change in X-RateLimit-Used
+        # approximates the cost when requests do not overlap.
+        if resource == "graphql" and previous is not None and previous["reset"] == reset:
+            return max(used - previous["used"], 1)
+        return 1
+
+    def _rate_limit_wait(self, response):
+        if response.status_code not in (403, 429):
+            return None
+
+        headers = response.headers
+        retry_after = headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return int(retry_after)
+
+        if headers.get("X-RateLimit-Remaining") == "0":
+            return max(int(headers.get("X-RateLimit-Reset", 0)) - time.time(), 0) + 1
+
+        if response.status_code == 429:
+            return self.secondary_wait
+
+        try:
+            message = response.json().get("message", "")
+        except (ValueError, AttributeError):
+            return None
+        return self.secondary_wait if Requester.isRateLimitError(message) else None
+
+    @staticmethod
+    def _resource(request):
+        path = urlparse(request.url).path
+        if path.endswith("/graphql"):
+            return "graphql"
+        if "/search/" in path:
+            return "search"
+        return "core"
+
+    @staticmethod
+    def _endpoint(request):
+        path = urlparse(request.url).path
+        for pattern, replacement in ENDPOINT_PATTERNS:
+            path = pattern.sub(replacement, path)
+        return f"{request.method} {path}"
+
+    def _account(self, request, cost, rate_limited):
+        endpoint = self._endpoint(request)
+        with self._condition:
+            stats = self._endpoints[endpoint]
+            stats["requests"] += 1
+            stats["cost"] += cost
+            stats["rate_limited"] += int(rate_limited)
+
+    def log_summary(self):
+        with self._condition:
+            endpoints = sorted(self._endpoints.items(), key=lambda item: -item[1]["cost"])
+            limits = dict(self._limits)
+            waited = self._waited
+            self._endpoints.clear()
+            self._waited = 0.0
+
+        total_requests = sum(stats["requests"] for _, stats in endpoints)
+        total_cost = sum(stats["cost"] for _, stats in endpoints)
+        self.logger.info(
+            f"📊 GitHub API usage: {total_requests} requests, {total_cost} rate-limit points, "
+            f"{waited:.1f}s spent waiting for budget"
+        )
+        for endpoint, stats in endpoints:
+            limited = f", {stats['rate_limited']} rate-limited" if stats["rate_limited"] else ""
+            self.logger.info(
+                f"   {stats['requests']:>5} req {stats['cost']:>5} pts  {endpoint}{limited}"
+            )
+        for resource, state in sorted(limits.items()):
+            self.logger.info(
+                f"   🔋 {resource}: {state['remaining']}/{state['limit']} remaining, resets "
+                f"{time.strftime('%H:%M:%S', time.localtime(state['reset']))}"
+            )
+
+
+class GatewayHTTPAdapter(CachingHTTPAdapter):
+    def __init__(self, gateway=None, **kwargs):
+        self.gateway = gateway
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if self.gateway is None:
+            count_api_call()
+            return super().send(request, **kwargs)
+
+        # Each attempt sends a fresh copy so the conditional cache headers of a
+        # rate-limited attempt are not mistaken for PyGithub's own on the retry.
+        parent = super()
+
+        def attempt():
+            count_api_call()
+            return parent.send(request.copy(), **kwargs)
+
+        return self.gateway.send(request, attempt)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+
+PR_PHASES = ["labels", "branch", "ci_status", "linter", "chromatic", "approvals", "merge"]
+
+# Every active counter (the run's and the current phase's) sees each request.
+# Context variables follow asyncio.to_thread, and ThreadPoolExecutor workers are
+# given a copy of the submitting context.
+_counters = contextvars.ContextVar("api_call_counters", default=())
+
+
+class CallCounter:
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def add(self):
+        with self._lock:
+            self.calls += 1
+
+
+@contextmanager
+def counting_api_calls():
+    counter = CallCounter()
+    token = _counters.set(_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _counters.reset(token)
+
+
+def count_api_call():
+    for counter in _counters.get():
+        counter.add()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Nearest-rank percentile: small samples report a value that actually occurred.
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+class RunMetrics:
+    def __init__(self, config, logger):
+        self.logger = logger
+        self.repo_name = config["github"]["repo"]
+
+        metrics_config = config.get("metrics", {})
+        self.enabled = metrics_config.get("enabled", True)
+        self.format = metrics_config.get("format", "json")
+        extension = "prom" if self.format == "prometheus" else "json"
+        default_path = Path(config["logging"]["directory"]) / f"run-report.{extension}"
+        self.path = Path(metrics_config.get("path", default_path))
+
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._started = time.time()
+        self._run_phases = {}
+        self._prs = defaultdict(lambda: {"decision": None, "phases": {}, "commands": []})
+
+    @contextmanager
+    def run(self):
+        if not self.enabled:
+            yield
+            return
+
+        self._reset()
+        with counting_api_calls() as counter:
+            try:
+                yield
+            finally:
+                self._finish(counter.calls)
+
+    @contextmanager
+    def phase(self, name, pr_number=None):
+        if not self.enabled:
+            yield
+            return
+
+        started = time.perf_counter()
+        with counting_api_calls() as counter:
+            try:
+                yield
+            finally:
+                sample = {"seconds": time.perf_counter() - started, "api_calls": counter.calls}
+                with self._lock:
+                    if pr_number is None:
+                        self._add(self._run_phases, name, sample)
+                    else:
+                        self._add(self._prs[pr_number]["phases"], name, sample)
+
+    @staticmethod
+    def _add(phases, name, sample):
+        if name in phases:
+            phases[name]["seconds"] += sample["seconds"]
+            phases[name]["api_calls"] += sample["api_calls"]
+        else:
+            phases[name] = sample
+
+    def record_decision(self, pr_number, decision):
+        if self.enabled:
+            with self._lock:
+                self._prs[pr_number]["decision"] = decision
+
+    def record_command(self, pr_number, result):
+        if self.enabled:
+            with self._lock:
+                self._prs[pr_number]["commands"].append(
+                    {
+                        "command": result.command,
+                        "exit_code": result.returncode,
+                        "seconds": result.seconds,
+                        "peak_memory_bytes": result.peak_memory_bytes,
+                        "output_lines": result.output_lines + result.dropped_lines,
+                        "timed_out": result.timed_out,
+                        "cancelled": result.cancelled,
+                    }
+                )
+
+    def _finish(self, api_calls):
+        report = self._build_report(api_calls)
+        self._log_summary(report)
+        try:
+            self._write(report)
+        except OSError as e:
+            self.logger.warning(f"⚠️  Could not write run report to {self.path}: {e}")
+
+    def _build_report(self, api_calls):
+        with self._lock:
+            run_phases = dict(self._run_phases)
+            prs = {number: dict(record) for number, record in self._prs.items()}
+
+        for record in prs.values():
+            record["seconds"] = sum(sample["seconds"] for sample in record["phases"].values())
+            record["api_calls"] = sum(sample["api_calls"] for sample in record["phases"].values())
+
+        summary = {}
+        for name in PR_PHASES:
+            samples = [
+                record["phases"][name] for record in prs.values() if name in record["phases"]
+            ]
+            if not samples:
+                continue
+            seconds = [sample["seconds"] for sample in samples]
+            summary[name] = {
+                "count": len(samples),
+                "p50_seconds": percentile(seconds, 0.5),
+                "p95_seconds": percentile(seconds, 0.95),
+                "max_seconds": max(seconds),
+                "total_seconds": sum(seconds),
+                "api_calls": sum(sample["api_calls"] for sample in samples),
+            }
+
+        decisions = defaultdict(int)
+        for record in prs.values():
+            if record["decision"] is not None:
+                decisions[record["decision"]] += 1
+
+        commands = [command for record in prs.values() for command in record["commands"]]
+        linter_commands = {
+            "count": len(commands),
+            "total_seconds": sum(command["seconds"] for command in commands),
+            "max_seconds": max((command["seconds"] for command in commands), default=0.0),
+            "max_peak_memory_bytes": max(
+                (command["peak_memory_bytes"] or 0 for command in commands), default=0
+            ),
+            "timed_out": sum(1 for command in commands if command["timed_out"]),
+            "cancelled": sum(1 for command in commands if command["cancelled"]),
+        }
+
+        return {
+            "repository": self.repo_name,
+            "started_at": self._started,
+            "duration_seconds": time.time() - self._started,
+            "api_calls": api_calls,
+            "decisions": dict(decisions),
+            "run_phases": run_phases,
+            "summary": summary,
+            "linter_commands": linter_commands,
+            "prs": {str(number): record for number, record in sorted(prs.items())},
+        }
+
+    def _log_summary(self, report):
+        self.logger.info(
+            f"⏱️  {report['repository']} run took {report['duration_seconds']:.1f}s and "
+            f"{report['api_calls']} API calls for {len(report['prs'])} PR(s)"
+        )
+        for name, sample in report["run_phases"].items():
+            self.logger.info(
+                f"   {name:<14} {sample['seconds']:>7.2f}s  {sample['api_calls']:>5} calls"
+            )
+        for name, stats in report["summary"].items():
+            self.logger.info(
+                f"   {name:<14} p50 {stats['p50_seconds']:>6.2f}s  p95 {stats['p95_seconds']:>6.2f}s  "
+                f"{stats['api_calls']:>5} calls over {stats['count']} PR(s)"
+            )
+        commands = report["linter_commands"]
+        if commands["count"]:
+            self.logger.info(
+                f"   {commands['count']} linter command(s): max {commands['max_seconds']:.1f}s, "
+                f"peak memory {commands['max_peak_memory_bytes'] / 2**20:.0f} MiB, "
+                f"{commands['timed_out']} timed out, {commands['cancelled']} cancelled"
+            )
+
+    def _write(self, report):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            if self.format == "prometheus":
+                f.write(self._prometheus(report))
+            else:
+                json.dump(report, f, indent=2)
+        # Scrapers such as the node_exporter textfile collector must never see a
+        # half-written file.
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _prometheus(report):
+        repo = f'repo="{report["repository"]}"'
+
+        def metric(name, kind, help_text, samples):
+            lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for suffix, labels, value in samples:
+                label_text = ",".join([repo] + [f'{key}="{val}"' for key, val in labels])
+                lines.append(f"{name}{suffix}{{{label_text}}} {value}")
+            return lines
+
+        run_phases = report["run_phases"]
+        summary = report["summary"]
+        commands = report["linter_commands"]
+        phase_seconds = []
+        for name, stats in summary.items():
+            phase_seconds += [
+                ("", [("phase", name), ("quantile", "0.5")], f"{stats['p50_seconds']:.3f}"),
+                ("", [("phase", name), ("quantile", "0.95")], f"{stats['p95_seconds']:.3f}"),
+                ("_sum", [("phase", name)], f"{stats['total_seconds']:.3f}"),
+                ("_count", [("phase", name)], stats["count"]),
+            ]
+
+        lines = (
+            metric(
+                "ci_plumber_last_run_timestamp_seconds",
+                "gauge",
+                "Start time of the last run.",
+                [("", [], f"{report['started_at']:.0f}")],
+            )
+            + metric(
+                "ci_plumber_run_duration_seconds",
+                "gauge",
+                "Wall time of the last run.",
+                [("", [], f"{report['duration_seconds']:.3f}")],
+            )
+            + metric(
+                "ci_plumber_run_api_calls",
+                "gauge",
+                "GitHub API requests made by the last run.",
+                [("", [], report["api_calls"])],
+            )
+            + metric(
+                "ci_plumber_prs",
+                "gauge",
+                "PRs evaluated by the last run, by decision.",
+                [
+                    ("", [("decision", decision)], count)
+                    for decision, count in sorted(report["decisions"].items())
+                ],
+            )
+            + metric(
+                "ci_plumber_run_phase_seconds",
+                "gauge",
+                "Wall time of run-wide phases.",
+                [
+                    ("", [("phase", name)], f"{sample['seconds']:.3f}")
+                    for name, sample in run_phases.items()
+                ],
+            )
+            + metric(
+                "ci_plumber_phase_seconds",
+                "summary",
+                "Per-PR wall time of each processing step.",
+                phase_seconds,
+            )
+            + metric(
+                "ci_plumber_phase_api_calls",
+                "gauge",
+                "GitHub API requests made by each step.",
+                [
+                    ("", [("phase", name)], sample["api_calls"])
+                    for name, sample in run_phases.items()
+                ]
+                + [("", [("phase", name)], stats["api_calls"]) for name, stats in summary.items()],
+            )
+            + metric(
+                "ci_plumber_linter_commands",
+                "gauge",
+                "Linter fix commands run by the last run, by outcome.",
+                [
+                    ("", [("outcome", "timed_out")], commands["timed_out"]),
+                    ("", [("outcome", "cancelled")], commands["cancelled"]),
+                    (
+                        "",
+                        [("outcome", "finished")],
+                        commands["count"] - commands["timed_out"] - commands["cancelled"],
+                    ),
+                ],
+            )
+            + metric(
+                "ci_plumber_linter_command_max_seconds",
+                "gauge",
+                "Longest linter fix command of the last run.",
+                [("", [], f"{commands['max_seconds']:.3f}")],
+            )
+            + metric(
+                "ci_plumber_linter_peak_memory_bytes",
+                "gauge",
+                "Largest peak resident memory of a linter fix command in the last run.",
+                [("", [], commands["max_peak_memory_bytes"])],
+            )
+        )
+        return "\n".join(lines) + "\n"
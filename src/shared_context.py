@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+from .github_client import build_github_client
+from .http_cache import HTTPResponseCache
+from .identity_cache import IdentityCache
+from .logger_setup import PRLogBuffer, setup_logging
+from .request_gateway import RequestGateway
+from .startup_profile import startup_profile
+from .team_cache import TeamMembershipCache
+
+
+class SharedContext:
+    def __init__(self, config, repo_names):
+        self.logger = setup_logging(config)
+        self.log_buffer = PRLogBuffer()
+        self.logger.addFilter(self.log_buffer)
+        startup_profile.mark("logging")
+
+        self.http_cache = None
+        if config["github"].get("http_cache", {}).get("enabled", False):
+            self.http_cache = HTTPResponseCache(config, self.logger)
+        self.gateway = None
+        if config["github"].get("rate_limit", {}).get("enabled", True):
+            self.gateway = RequestGateway(config, self.logger)
+        self.github = build_github_client(config, self.http_cache, self.gateway)
+        startup_profile.mark("github client")
+
+        self.identity_cache = IdentityCache(config, self.logger)
+        self.token_owner, self.repositories = self.identity_cache.resolve(self.github, repo_names)
+        self.logger.info(f"🔑 Detected token owner: {self.token_owner}")
+        startup_profile.mark("token owner and repos")
+
+        # get_user() without a login is lazy, so this only borrows the requester.
+        self.team_cache = TeamMembershipCache(
+            self.github.get_user()._requester, config, self.logger
+        )
+
+    def repository(self, repo_name):
+        metadata = self.repositories.get(repo_name.lower())
+        if metadata is None:
+            _, resolved = self.identity_cache.resolve(self.github, [repo_name])
+            metadata = resolved[repo_name.lower()]
+            self.repositories[repo_name.lower()] = metadata
+        # Lazy: the metadata was already checked, so no GET /repos is needed.
+        return self.github.get_repo(metadata["full_name"], lazy=True)
+
+    def log_summaries(self):
+        if self.http_cache is not None:
+            self.http_cache.log_summary()
+        if self.gateway is not None:
+            self.gateway.log_summary()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+
+
+class StartupProfile:
+    def __init__(self):
+        self.enabled = False
+        self.started = time.perf_counter()
+        self.steps = []
+        self._last = self.started
+        self._reported = False
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def mark(self, name):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._reported:
+                return
+            now = time.perf_counter()
+            self.steps.append((name, now - self._last))
+            self._last = now
+
+    def report(self, logger, name):
+        # The first call wins: a run reports when its first PR is evaluated, or at
+        # the end when there was nothing to evaluate.
+        self.mark(name)
+        with self._lock:
+            if not self.enabled or self._reported:
+                return
+            self._reported = True
+
+        total = sum(seconds for _, seconds in self.steps)
+        logger.info(f"🚀 Startup took {total:.3f}s before the first PR was evaluated")
+        for step, seconds in self.steps:
+            share = seconds / total * 100 if total else 0.0
+            logger.info(f"   {step:<22} {seconds:>7.3f}s  {share:>5.1f}%")
+
+
+# Module level so every stage of startup can mark itself without being handed the
+# profile; measured from the moment the entry point imports this module.
+startup_profile = StartupProfile()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class RunStateStore:
+    # Errors, failed or held-back merges are retried on the next run.
+    RETRIED_DECISIONS = ("error", "merge_failed", "merge_deferred")
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pr_state (
+            repo TEXT NOT NULL,
+            number INTEGER NOT NULL,
+            fingerprint TEXT NOT NULL,
+            head_sha TEXT,
+            updated_at TEXT,
+            labels TEXT,
+            review_state TEXT,
+            last_decision TEXT,
+            evaluated_at REAL NOT NULL,
+            PRIMARY KEY (repo, number)
+        )
+    """
+
+    def __init__(self, config, logger, status_cache):
+        self.config = config
+        self.logger = logger
+        self.status_cache = status_cache
+
+        state_config = config.get("state", {})
+        default_path = Path(config["logging"]["directory"]) / "ci-plumber-state.sqlite"
+        self.path = Path(state_config.get("path", default_path))
+        self.max_interval = state_config.get("max_interval_minutes", 360) * 60
+        self.repo_name = config["github"]["repo"]
+
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute(self.SCHEMA)
+        self._connection.commit()
+
+    def build_inputs(self, pr, snapshot):
+        inputs = {"updated_at": pr.updated_at.isoformat() if pr.updated_at else None}
+
+        if snapshot is None:
+            # New CI results do not bump updated_at, so the head commit and its
+            # statuses are compared too. The status lookup goes through the run's
+            # cache, where the PR's CI check picks it up again.
+            head_sha = pr.head.sha
+            inputs.update(
+                {
+                    "head_sha": head_sha,
+                    "labels": sorted(label.name for label in pr.labels),
+                    "status": self._status_inputs(self.status_cache.get(head_sha)),
+                }
+            )
+            return inputs
+
+        max_commits_behind = self.config["repository"]["max_commits_behind"]
+        inputs.update(
+            {
+                "head_sha": snapshot.head_sha,
+                "labels": sorted(snapshot.labels),
+                "review_state": {
+                    "reviews": sorted([review.user, review.state] for review in snapshot.reviews),
+                    "requested_users": sorted(snapshot.requested_users),
+                    "requested_teams": sorted(snapshot.requested_teams),
+                },
+                "merged": snapshot.merged,
+                "mergeable": snapshot.mergeable,
+                "too_far_behind": (
+                    None if snapshot.behind_by is None else snapshot.behind_by > max_commits_behind
+                ),
+                "status": self._status_inputs(snapshot.status),
+            }
+        )
+        return inputs
+
+    @staticmethod
+    def _status_inputs(status):
+        return [
+            status.state,
+            sorted([context.context, context.state] for context in status.statuses),
+            sorted([check.name, check.conclusion or ""] for check in status.check_runs),
+        ]
+
+    @staticmethod
+    def fingerprint(inputs):
+        encoded = json.dumps(inputs, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def needs_evaluation(self, number, inputs):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fingerprint, evaluated_at, last_decision FROM pr_state "
+                "WHERE repo = ? AND number = ?",
+                (self.repo_name, number),
+            ).fetchone()
+
+        if row is None:
+            return True, "new PR"
+
+        fingerprint, evaluated_at, last_decision = row
+        if fingerprint != self.fingerprint(inputs):
+            return True, "inputs changed"
+
+        if time.time() - evaluated_at > self.max_interval:
+            return True, "refresh interval elapsed"
+
+        return False, f"unchanged since last run ({last_decision})"
+
+    def record_decision(self, number, inputs, decision, mergeable_known=True):
+        # A PR GitHub had not finished computing mergeability for is retried as well.
+        if decision in self.RETRIED_DECISIONS or not mergeable_known:
+            self.forget(number)
+        else:
+            self.record(number, inputs, decision)
+
+    def record(self, number, inputs, decision):
+        review_state = inputs.get("review_state")
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pr_state "
+                "(repo, number, fingerprint, head_sha, updated_at, labels, review_state, "
+                "last_decision, evaluated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.repo_name,
+                    number,
+                    self.fingerprint(inputs),
+                    inputs.get("head_sha"),
+                    inputs.get("updated_at"),
+                    json.dumps(inputs.get("labels", [])),
+                    json.dumps(review_state) if review_state is not None else None,
+                    decision,
+                    time.time(),
+                ),
+            )
+            self._connection.commit()
+
+    def forget(self, number):
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM pr_state WHERE repo = ? AND number = ?", (self.repo_name, number)
+            )
+            self._connection.commit()
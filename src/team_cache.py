@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from github import UnknownObjectException
+from github.Team import Team
+
+from .request_gateway import OPTIONAL, request_priority
+
+
+class TeamMembershipCache:
+    def __init__(self, requester, config, logger):
+        self.requester = requester
+        self.logger = logger
+
+        cache_config = config.get("approvals", {}).get("team_cache", {})
+        default_path = Path(config["logging"]["directory"]) / "team-cache.json"
+        self.path = Path(cache_config.get("path", default_path))
+        self.ttl = cache_config.get("ttl_minutes", 720) * 60
+        self.not_found_ttl = cache_config.get("not_found_ttl_minutes", 10) * 60
+        self.strategy = cache_config.get("strategy", "membership")
+
+        self._lock = threading.Lock()
+        self._memberships = {}
+        self._rosters = {}
+        self._load()
+
+    def any_member(self, organization, team_slug, logins):
+        if self.strategy == "roster":
+            members = self._roster(organization, team_slug)
+            return any(login in members for login in logins)
+
+        return any(self._is_member(organization, team_slug, login) for login in sorted(logins))
+
+    def _team(self, organization, team_slug):
+        # A lazy Team addressed by org and slug, so no get_team_by_slug lookup is needed.
+        url = f"/orgs/{organization}/teams/{team_slug}"
+        return Team(self.requester, {}, {"url": url, "slug": team_slug}, completed=False)
+
+    def _is_member(self, organization, team_slug, login):
+        # Keys include the organization because one cache serves every configured repo.
+        key = f"{organization}/{team_slug}:{login}"
+        with self._lock:
+            cached = self._fresh(self._memberships.get(key))
+        if cached is not None:
+            return cached
+
+        try:
+            with request_priority(OPTIONAL):
+                membership = self._team(organization, team_slug).get_team_membership(login)
+        except UnknownObjectException:
+            # GitHub answers 404 for a non-member, but also for a missing team or a
+            # token that cannot see the org's teams; those get fixed, so the answer
+            # is only kept briefly.
+            self.logger.debug(
+                f"👥 No membership of {login} in @{organization}/{team_slug} "
+                "(not a member, or the team is not visible to the token)"
+            )
+            self._store(self._memberships, key, False, self.not_found_ttl)
+            return False
+
+        is_member = membership.state == "active"
+        self.logger.debug(f"👥 {login} is {'' if is_member else 'not '}a member of @{team_slug}")
+        self._store(self._memberships, key, is_member)
+        return is_member
+
+    def _roster(self, organization, team_slug):
+        key = f"{organization}/{team_slug}"
+        with self._lock:
+            cached = self._fresh(self._rosters.get(key))
+        if cached is not None:
+            return set(cached)
+
+        with request_priority(OPTIONAL):
+            members = {member.login for member in self._team(organization, team_slug).get_members()}
+        self.logger.info(f"👥 Cached {len(members)} members of @{organization}/{team_slug}")
+        self._store(self._rosters, key, sorted(members))
+        return members
+
+    def _fresh(self, entry):
+        if entry is None:
+            return None
+        value, fetched_at, *ttl = entry
+        if time.time() - fetched_at > (ttl[0] if ttl else self.ttl):
+            return None
+        return value
+
+    def _store(self, entries, key, value, ttl=None):
+        entry = [value, time.time()] if ttl is None else [value, time.time(), ttl]
+        with self._lock:
+            entries[key] = entry
+            self._save()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self._memberships = data.get("memberships", {})
+            self._rosters = data.get("rosters", {})
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"⚠️  Ignoring unreadable team cache {self.path}: {e}")
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"memberships": self._memberships, "rosters": self._rosters}, f)
+        os.replace(tmp_path, self.path)
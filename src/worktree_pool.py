@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from git import GitCommandError, Repo
+
+from .fetch_strategy import FetchStrategy
+
+
+class WorktreePool:
+    STATE_FILE = "pool-state.json"
+
+    def __init__(self, config, logger):
+        self.config = config
+        self.logger = logger
+
+        repository_config = config["repository"]
+        worktree_config = repository_config.get("worktrees", {})
+        local_path = repository_config["local_path"].rstrip("/")
+
+        self.bare_path = worktree_config.get("bare_path", f"{local_path}.git")
+        self.worktree_dir = Path(worktree_config.get("directory", f"{local_path}-worktrees"))
+        self.size = worktree_config.get("size", 4)
+        self.fetch_strategy = FetchStrategy(config, logger)
+
+        self._condition = threading.Condition()
+        self._fetch_lock = threading.Lock()
+        self._idle = {}
+        self._busy = set()
+        self._initialized = False
+
+    @contextmanager
+    def worktree(self, pr, snapshot=None):
+        branch = pr.head.ref
+        path = self._acquire(branch)
+        try:
+            self._prepare(path, pr, snapshot)
+            yield path
+        finally:
+            self._release(path, branch)
+
+    def _initialize(self):
+        self._ensure_bare_repo()
+        self.worktree_dir.mkdir(parents=True, exist_ok=True)
+
+        bare_repo = Repo(self.bare_path)
+        bare_repo.git.worktree("prune")
+
+        state = self._load_state()
+        for slot in sorted(self.worktree_dir.glob("wt-*")):
+            if (slot / ".git").exists():
+                self._idle[str(slot)] = state.get(str(slot))
+
+        self.logger.info(
+            f"🌳 Worktree pool ready at {self.worktree_dir} "
+            f"({len(self._idle)} warm, max {self.size})"
+        )
+        self._initialized = True
+
+    def _ensure_bare_repo(self):
+        if os.path.exists(self.bare_path):
+            return
+
+        self.logger.info(f"📦 Creating bare object store at {self.bare_path}")
+        repo_url = f"https://{self.config['github']['token']}@github.com/{self.config['github']['repo']}.git"
+        self.fetch_strategy.clone(repo_url, self.bare_path, bare=True)
+        self.logger.info("✅ Bare object store created")
+
+    def _acquire(self, branch):
+        with self._condition:
+            if not self._initialized:
+                self._initialize()
+
+            while True:
+                path = self._pick_idle(branch)
+                if path is not None:
+                    del self._idle[path]
+                    self._busy.add(path)
+                    return path
+
+                if len(self._idle) + len(self._busy) < self.size:
+                    path = self._next_slot()
+                    self._busy.add(path)
+                    return path
+
+                self._condition.wait()
+
+    def _pick_idle(self, branch):
+        for path, last_branch in self._idle.items():
+            if last_branch == branch:
+                self.logger.info(f"♻️  Reusing warm worktree {path} for {branch}")
+                return path
+        return next(iter(self._idle), None)
+
+    def _next_slot(self):
+        index = 0
+        while str(self.worktree_dir / f"wt-{index}") in self._busy | set(self._idle):
+            index += 1
+        return str(self.worktree_dir / f"wt-{index}")
+
+    def _prepare(self, path, pr, snapshot):
+        with self._fetch_lock:
+            self.logger.info(f"📥 Fetching {pr.head.ref} into the shared object store")
+            remote_ref = self.fetch_strategy.fetch_pr(Repo(self.bare_path), pr, snapshot)
+
+        if not (Path(path) / ".git").exists():
+            self.logger.info(f"🌱 Creating worktree {path}")
+            with self._fetch_lock:
+                Repo(self.bare_path).git.worktree(
+                    "add", "--detach", "--no-checkout", path, remote_ref
+                )
+            worktree_repo = Repo(path)
+        else:
+            worktree_repo = Repo(path)
+            self._reset(worktree_repo)
+
+        self.fetch_strategy.checkout(worktree_repo, pr, remote_ref)
+
+    def _release(self, path, branch):
+        try:
+            if (Path(path) / ".git").exists():
+                self._reset(Repo(path))
+        except GitCommandError as e:
+            self.logger.warning(f"⚠️  Could not reset worktree {path}, discarding it: {e}")
+            self._remove(path)
+            branch = None
+
+        with self._condition:
+            self._busy.discard(path)
+            if (Path(path) / ".git").exists():
+                self._idle[path] = branch
+            self._save_state()
+            self._condition.notify()
+
+    @staticmethod
+    def _reset(worktree_repo):
+        worktree_repo.git.reset("--hard")
+        # Ignored files are kept on purpose so node_modules survives between runs.
+        worktree_repo.git.clean("-ffd")
+
+    def _remove(self, path):
+        try:
+            with self._fetch_lock:
+                Repo(self.bare_path).git.worktree("remove", "--force", path)
+        except GitCommandError as e:
+            self.logger.warning(f"⚠️  Could not remove worktree {path}: {e}")
+
+    def _load_state(self):
+        state_file = self.worktree_dir / self.STATE_FILE
+        if not state_file.exists():
+            return {}
+        try:
+            with open(state_file, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        state_file = self.worktree_dir / self.STATE_FILE
+        with open(state_file, "w") as f:
+            json.dump(self._idle, f, indent=2)
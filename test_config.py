@@ -10,6 +10,7 @@ import yaml  # noqa: E402
 from github import Github, GithubException  # noqa: E402
 
 from src.console_utils import Colors, print_header, print_success_box  # noqa: E402
+from src.multi_repo import repository_configs  # noqa: E402
 
 
 def test_config():
@@ -43,19 +44,29 @@ def test_config():
         print(f"{Colors.RED}✗ GitHub authentication failed: {e}{Colors.NC}")
         return False
 
-    repo_name = config.get("github", {}).get("repo")
-    if not repo_name:
+    if config.get("repositories"):
+        try:
+            repo_names = [
+                repo_config["github"]["repo"] for repo_config in repository_configs(config)
+            ]
+        except (KeyError, ValueError) as e:
+            print(f"{Colors.RED}✗ Invalid 'repositories' list: {e}{Colors.NC}")
+            return False
+    else:
+        repo_names = [config.get("github", {}).get("repo")]
+    if not all(repo_names):
         print(f"{Colors.RED}✗ Repository not configured in cfg/config.yaml{Colors.NC}")
         return False
 
-    try:
-        repo = g.get_repo(repo_name)
-        print(
-            f"{Colors.GREEN}✓ Successfully accessed repository: {Colors.BOLD}{repo.full_name}{Colors.NC}"
-        )
-    except GithubException as e:
-        print(f"{Colors.RED}✗ Cannot access repository {repo_name}: {e}{Colors.NC}")
-        return False
+    for repo_name in repo_names:
+        try:
+            repo = g.get_repo(repo_name)
+            print(
+                f"{Colors.GREEN}✓ Successfully accessed repository: {Colors.BOLD}{repo.full_name}{Colors.NC}"
+            )
+        except GithubException as e:
+            print(f"{Colors.RED}✗ Cannot access repository {repo_name}: {e}{Colors.NC}")
+            return False
 
     trigger_label = config.get("labels", {}).get("trigger")
     if trigger_label:
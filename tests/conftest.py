@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import logging
+import sys
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def config(tmp_path):
+    return {
+        "github": {"repo": "acme/widgets", "token": "test-token"},
+        "repository": {"local_path": str(tmp_path / "clone"), "max_commits_behind": 10},
+        "linter": {"fix_command": "true"},
+        "logging": {"level": "INFO", "directory": str(tmp_path / "logs")},
+        "state": {"enabled": True},
+    }
+
+
+@pytest.fixture
+def logger():
+    return logging.getLogger("ci-plumber-tests")
+
+
+@pytest.fixture
+def fake_github():
+    from benchmark.fake_github import FakeGitHub, FakeRepositoryState
+
+    fake = FakeGitHub(FakeRepositoryState(pr_count=6, seed=3), latency=0, jitter=0).start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture
+def github_config(fake_github, tmp_path):
+    # A full CIPlumber config against the in-process fake GitHub of the benchmark.
+    from src.logger_setup import shutdown_logging
+
+    state = fake_github.state
+    yield {
+        "github": {
+            "token": "test-token",
+            "repo": state.full_name,
+            "base_url": fake_github.base_url,
+            "seconds_between_requests": 0,
+            "seconds_between_writes": 0,
+            "http_cache": {"enabled": False},
+            "mergeability": {"wait_seconds": 0},
+        },
+        "authors": {"include_token_owner": True, "allowed_users": state.authors[1:]},
+        "labels": {"trigger": state.trigger_label, "auto_add": [], "categories": []},
+        "repository": {
+            "local_path": str(tmp_path / "clone"),
+            "max_commits_behind": 100,
+            "behind_counts": {"local": False},
+        },
+        "approvals": {"minimum_count": 2},
+        "processing": {"workers": 1},
+        "linter": {"fix_command": "true"},
+        "metrics": {"enabled": False},
+        "logging": {"level": "INFO", "directory": str(tmp_path / "logs")},
+    }
+    shutdown_logging()
@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+
+import pytest
+
+from src.command_runner import CommandRunner
+
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX only")
+
+
+def make_runner(logger, **linter):
+    return CommandRunner({"linter": {"kill_grace_seconds": 1, **linter}}, logger)
+
+
+def is_running(pid):
+    # A killed grandchild is reparented and may linger as a zombie until reaped.
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            return stat.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+    except OSError:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+
+
+def wait_for_pid(path):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if path.exists() and path.read_text().strip():
+            return int(path.read_text())
+        time.sleep(0.05)
+    raise AssertionError(f"{path} was never written")
+
+
+def test_timeout_kills_the_whole_process_group(logger, tmp_path):
+    runner = make_runner(logger, timeout_seconds=1)
+    pid_file = tmp_path / "grandchild.pid"
+    # The grandchild ignores SIGTERM and keeps the output pipes open, so only the
+    # SIGKILL of the group after the grace period ends it.
+    command = f"(trap '' TERM; exec sleep 60) & echo $! > {pid_file}; sleep 60"
+
+    started = time.monotonic()
+    result = runner.run(command, tmp_path)
+
+    grandchild = wait_for_pid(pid_file)
+    assert result.timed_out
+    assert not result.cancelled
+    assert result.returncode != 0
+    assert time.monotonic() - started < 30
+    deadline = time.monotonic() + 5
+    while is_running(grandchild) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not is_running(grandchild)
+
+
+def test_cancel_stops_a_running_command(logger, tmp_path):
+    runner = make_runner(logger, timeout_seconds=60)
+    threading.Timer(0.5, runner.cancel).start()
+
+    started = time.monotonic()
+    result = runner.run("sleep 60", tmp_path)
+
+    assert runner.cancelled()
+    assert result.cancelled
+    assert not result.timed_out
+    assert time.monotonic() - started < 30
+
+
+def test_exit_code_memory_and_output_are_recorded(logger, tmp_path):
+    runner = make_runner(logger, max_output_lines=3)
+
+    result = runner.run(
+        "for i in 1 2 3 4 5; do echo line $i; done; echo oops >&2; exit 3", tmp_path
+    )
+
+    assert result.returncode == 3
+    assert not result.timed_out and not result.cancelled
+    assert result.peak_memory_bytes > 0
+    assert result.seconds > 0
+    assert result.output_lines == 3
+    assert result.dropped_lines == 3
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+from src.daemon import WebhookDaemon
+
+
+class FakePlumber:
+    # The part of CIPlumber the daemon talks to.
+    def __init__(self, config, logger):
+        self.config = config
+        self.logger = logger
+        self.repo_name = config["github"]["repo"]
+        self.unknown_mergeable = set()
+        self.evaluated = []
+
+    def run(self, watch=True):
+        self.evaluated.append("all")
+
+    def run_pr(self, number):
+        self.evaluated.append(number)
+
+    def cancel(self):
+        pass
+
+
+def make_daemon(config, logger, rechecks=3):
+    config["daemon"] = {"debounce_seconds": 10, "mergeability_rechecks": rechecks}
+    plumber = FakePlumber(config, logger)
+    return WebhookDaemon(plumber), plumber
+
+
+def queued_delay(daemon, key):
+    first_seen, due = daemon._pending.pop(key)
+    return round(due - first_seen)
+
+
+def test_unknown_mergeability_is_rechecked_with_backoff_then_left_alone(config, logger):
+    daemon, plumber = make_daemon(config, logger)
+    key = ("acme/widgets", 7)
+    plumber.unknown_mergeable = {7}
+
+    delays = []
+    daemon._run_task("pr", key)
+    while key in daemon._pending:
+        delays.append(queued_delay(daemon, key))
+        daemon._run_task("pr", key)
+
+    assert delays == [10, 20, 40]
+    assert plumber.evaluated == [7, 7, 7, 7]
+
+
+def test_recheck_budget_is_reset_by_a_resolved_pr_and_a_reconcile(config, logger):
+    daemon, plumber = make_daemon(config, logger, rechecks=1)
+    key = ("acme/widgets", 7)
+    plumber.unknown_mergeable = {7}
+
+    daemon._run_task("pr", key)
+    assert queued_delay(daemon, key) == 10
+    daemon._run_task("pr", key)
+    assert key not in daemon._pending
+
+    daemon._run_task("reconcile", None)
+    assert queued_delay(daemon, key) == 10
+
+    plumber.unknown_mergeable = set()
+    daemon._run_task("pr", key)
+    assert key not in daemon._rechecks
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import logging
+import shutil
+
+import pytest
+
+from src.command_runner import CommandRunner
+from src.eslint_worker import ESLintWorkerPool
+from src.run_metrics import RunMetrics
+
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+
+# Stands in for the eslint package of a checkout: every file gets two errors.
+FAKE_ESLINT = """
+class ESLint {
+  async lintFiles(files) {
+    return files.map((filePath) => ({ filePath, errorCount: 2, warningCount: 0, output: "" }));
+  }
+  static async outputFixes() {}
+  async loadFormatter() {
+    const format = (results) =>
+      results.map((r) => `${r.filePath}\\n  1:1  error  bad  a\\n  2:1  error  bad  b`).join("\\n");
+    return { format };
+  }
+}
+module.exports = { ESLint };
+"""
+
+
+@pytest.fixture
+def checkout(tmp_path):
+    package = tmp_path / "checkout" / "node_modules" / "eslint"
+    package.mkdir(parents=True)
+    (package / "index.js").write_text(FAKE_ESLINT)
+    return tmp_path / "checkout"
+
+
+@pytest.fixture
+def pool(config, logger):
+    config["linter"]["max_output_lines"] = 4
+    pool = ESLintWorkerPool(config, logger, ["package.json"], CommandRunner(config, logger))
+    yield pool
+    pool.close()
+
+
+def test_worker_output_is_capped_like_command_output(pool, checkout, caplog):
+    with caplog.at_level(logging.INFO, logger="ci-plumber-tests"):
+        result = pool.fix(str(checkout), ["a.js", "b.js", "c.js"])
+
+    assert result.returncode == 1
+    assert result.output_lines == 4
+    assert result.dropped_lines == 5
+    output = [message for message in caplog.messages if message.startswith("📄")]
+    assert len(output) == 4
+    assert "5 more output lines not shown" in caplog.text
+
+
+def test_worker_requests_are_recorded_in_the_run_report(pool, checkout, config, logger):
+    metrics = RunMetrics(config, logger)
+    metrics.record_command(7, pool.fix(str(checkout), ["a.js"]))
+
+    commands = metrics._build_report(api_calls=0)["linter_commands"]
+    assert commands["count"] == 1
+    assert commands["total_seconds"] > 0
+    assert commands["max_peak_memory_bytes"] > 0
+
+
+def test_failed_worker_request_is_still_recorded(pool, tmp_path, config, logger):
+    # No eslint package in this directory, so the worker cannot serve the request.
+    result = pool.fix(str(tmp_path), ["a.js"])
+
+    assert result.returncode is None
+    metrics = RunMetrics(config, logger)
+    metrics.record_command(7, result)
+    assert metrics._build_report(api_calls=0)["linter_commands"]["count"] == 1
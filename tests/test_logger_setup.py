@@ -0,0 +1,38 @@
+import gzip
+import logging
+import os
+
+from src.logger_setup import DailyLogFileHandler
+
+
+def test_prune_keeps_the_newest_days_by_name_not_by_mtime(tmp_path):
+    names = [
+        "ci-plumber-2020-01-03.log",
+        "ci-plumber-2020-01-02.log.gz",
+        "ci-plumber-2020-01-02.1.log.gz",
+        "ci-plumber-2020-01-01.log.gz",
+    ]
+    # Written in the reverse of their log order, as a later compression would do.
+    for age, name in enumerate(names):
+        path = tmp_path / name
+        if name.endswith(".gz"):
+            with gzip.open(path, "wt") as archive:
+                archive.write(f"{name}\n")
+        else:
+            path.write_text(f"{name}\n")
+        os.utime(path, (1_000_000 + age, 1_000_000 + age))
+
+    handler = DailyLogFileHandler(tmp_path, "ci-plumber", 0, 3, True)
+    try:
+        handler.emit(logging.makeLogRecord({"msg": "hello"}))
+    finally:
+        handler.close()
+
+    archives = sorted(path.name for path in tmp_path.glob("ci-plumber-2020-*"))
+    assert archives == [
+        "ci-plumber-2020-01-02.1.log.gz",
+        "ci-plumber-2020-01-02.log.gz",
+        "ci-plumber-2020-01-03.log.gz",
+    ]
+    with gzip.open(tmp_path / "ci-plumber-2020-01-03.log.gz", "rt") as archive:
+        assert archive.read() == "ci-plumber-2020-01-03.log\n"
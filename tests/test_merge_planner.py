@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+from types import SimpleNamespace
+
+from src.merge_planner import MergePlanner
+
+
+def make_pr(number, files):
+    changed = [SimpleNamespace(filename=name, previous_filename=None, changes=10) for name in files]
+    return SimpleNamespace(number=number, get_files=lambda: changed)
+
+
+def make_snapshot(number, behind_by=0):
+    return SimpleNamespace(number=number, behind_by=behind_by)
+
+
+def run_plan(planner, ready):
+    merged = []
+    updated = []
+
+    def merge(pr, snapshot):
+        merged.append(pr.number)
+        return True
+
+    def update_branch(pr, snapshot):
+        updated.append(pr.number)
+
+    decisions = planner.merge_all(ready, merge, update_branch)
+    return decisions, merged, updated
+
+
+def test_overlapping_pr_is_deferred_and_its_branch_updated(logger):
+    planner = MergePlanner({"merge_planner": {"enabled": True}}, logger)
+    ready = [
+        (make_pr(1, ["src/app.js"]), make_snapshot(1)),
+        (make_pr(2, ["src/app.js", "src/util.js"]), make_snapshot(2)),
+        (make_pr(3, ["README.md"]), make_snapshot(3)),
+    ]
+
+    decisions, merged, updated = run_plan(planner, ready)
+
+    assert decisions == {1: "merged", 2: "merge_deferred", 3: "merged"}
+    assert merged == [3, 1]
+    assert updated == [2]
+
+
+def test_overlapping_prs_are_all_merged_without_deferral(logger):
+    planner = MergePlanner({"merge_planner": {"enabled": True, "defer_overlapping": False}}, logger)
+    ready = [
+        (make_pr(1, ["src/app.js"]), make_snapshot(1)),
+        (make_pr(2, ["src/app.js"]), make_snapshot(2)),
+    ]
+
+    decisions, merged, updated = run_plan(planner, ready)
+
+    assert decisions == {1: "merged", 2: "merged"}
+    assert updated == []
+
+
+def test_failed_merge_updates_the_branch_of_a_pr_behind_its_base(logger):
+    planner = MergePlanner({"merge_planner": {"enabled": True}}, logger)
+    ready = [
+        (make_pr(1, ["src/app.js"]), make_snapshot(1, behind_by=0)),
+        (make_pr(2, ["src/util.js"]), make_snapshot(2, behind_by=30)),
+    ]
+    updated = []
+
+    decisions = planner.merge_all(
+        ready, lambda pr, snapshot: False, lambda pr, snapshot: updated.append(pr.number)
+    )
+
+    assert decisions == {1: "merge_failed", 2: "merge_failed"}
+    # PR 1 already contains the base, so an update cannot help it.
+    assert updated == [2]
+
+
+def test_failed_merge_after_an_earlier_merge_updates_the_branch(logger):
+    planner = MergePlanner({"merge_planner": {"enabled": True}}, logger)
+    ready = [
+        (make_pr(1, ["src/app.js"]), make_snapshot(1, behind_by=0)),
+        (make_pr(2, ["src/util.js", "src/more.js"]), make_snapshot(2, behind_by=0)),
+    ]
+    updated = []
+
+    decisions = planner.merge_all(
+        ready,
+        lambda pr, snapshot: pr.number == 1,
+        lambda pr, snapshot: updated.append(pr.number),
+    )
+
+    assert decisions == {1: "merged", 2: "merge_failed"}
+    assert updated == [2]
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+from github import GithubException
+
+from src.mergeability import MergeabilityResolver
+
+
+class FakePR:
+    def __init__(self, number, mergeable, fails=False):
+        self.number = number
+        self._mergeable = mergeable
+        self.fails = fails
+        self.updates = 0
+
+    @property
+    def merged(self):
+        if self.fails:
+            raise GithubException(502, {"message": "Bad Gateway"}, {})
+        return False
+
+    @property
+    def mergeable(self):
+        return self._mergeable
+
+    def update(self):
+        self.updates += 1
+        if self.fails:
+            raise GithubException(502, {"message": "Bad Gateway"}, {})
+
+
+def make_resolver(config, logger):
+    config["github"]["mergeability"] = {"wait_seconds": 0, "attempts": 2}
+    return MergeabilityResolver(config, logger, snapshot_loader=None)
+
+
+def test_failing_pr_is_left_unknown_and_the_others_are_resolved(config, logger):
+    resolver = make_resolver(config, logger)
+    prs = [FakePR(1, True), FakePR(2, None, fails=True), FakePR(3, False)]
+
+    assert resolver.resolve(prs, {}) == {2}
+    assert prs[1].updates == 2
+
+
+def test_pr_that_stays_uncomputed_is_reported_unknown(config, logger):
+    resolver = make_resolver(config, logger)
+    prs = [FakePR(1, None), FakePR(2, True)]
+
+    assert resolver.resolve(prs, {}) == {1}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import logging
+import threading
+
+from src.ci_plumber import CIPlumber
+from src.logger_setup import PRLogBuffer
+from src.shared_context import SharedContext
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def make_logger(name):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = ListHandler()
+    logger.addHandler(handler)
+    log_buffer = PRLogBuffer()
+    logger.addFilter(log_buffer)
+    return logger, log_buffer, handler
+
+
+def test_capture_holds_a_threads_records_until_the_block_ends():
+    logger, log_buffer, handler = make_logger("ci-plumber-tests.capture")
+    inside = threading.Event()
+    release = threading.Event()
+
+    def worker():
+        with log_buffer.capture(logger, header=lambda: logger.info("header")):
+            logger.info("first")
+            inside.set()
+            release.wait()
+            logger.info("second")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    inside.wait()
+    logger.info("from another thread")
+    release.set()
+    thread.join()
+
+    assert handler.messages == ["from another thread", "header", "first", "second"]
+
+
+def test_prs_of_a_shared_context_plumber_are_logged_as_blocks(github_config):
+    shared = SharedContext(github_config, [github_config["github"]["repo"]])
+    plumber = CIPlumber(config=github_config, shared=shared)
+    handler = ListHandler()
+    plumber.logger.addHandler(handler)
+
+    # Another repository of the same process logging its PRs meanwhile.
+    done = threading.Event()
+
+    def other_repository():
+        while not done.is_set():
+            with plumber.log_buffer.capture(plumber.logger):
+                plumber.logger.info("other repository")
+                plumber.logger.info("other repository")
+
+    other = threading.Thread(target=other_repository)
+    other.start()
+    try:
+        plumber.run(watch=False)
+    finally:
+        done.set()
+        other.join()
+        plumber.logger.removeHandler(handler)
+
+    repo_name = github_config["github"]["repo"]
+    headers = [
+        index
+        for index, message in enumerate(handler.messages)
+        if message.startswith(f"🔄 Processing {repo_name}#")
+    ]
+    assert headers
+    for start in headers:
+        number = handler.messages[start].split("#")[1].split(":")[0]
+        block = []
+        for message in handler.messages[start + 1 :]:
+            if message.startswith("🔄 Processing") or message == "other repository":
+                break
+            block.append(message)
+        # The block holds the PR's whole evaluation, ending with its verdict.
+        assert any(f"PR #{number}" in message for message in block)
+        assert any(
+            "ready to merge" in message or "not ready" in message or "waiting" in message
+            for message in block
+        ), block
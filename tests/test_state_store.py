@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.pr_snapshot import CheckRun, CommitStatus, StatusContext
+from src.state_store import RunStateStore
+
+
+class FakeStatusCache:
+    def __init__(self):
+        self.statuses = {}
+
+    def get(self, sha):
+        return self.statuses.get(sha, CommitStatus(sha, "pending", (), ()))
+
+
+@pytest.fixture
+def status_cache():
+    return FakeStatusCache()
+
+
+@pytest.fixture
+def store(config, logger, status_cache):
+    return RunStateStore(config, logger, status_cache)
+
+
+def make_pr(number=7, sha="a1"):
+    return SimpleNamespace(number=number, updated_at=None, labels=[], head=SimpleNamespace(sha=sha))
+
+
+def evaluate(store, pr, decision, mergeable_known=True):
+    # One run of the PR: compare its inputs, then record the decision if it ran.
+    inputs = store.build_inputs(pr, None)
+    needed, _ = store.needs_evaluation(pr.number, inputs)
+    if needed:
+        store.record_decision(pr.number, inputs, decision, mergeable_known)
+    return needed
+
+
+def test_unchanged_pr_is_skipped_after_a_recorded_decision(store):
+    pr = make_pr()
+
+    assert evaluate(store, pr, "not_ready")
+    assert not evaluate(store, pr, "not_ready")
+
+
+@pytest.mark.parametrize("decision", ["error", "merge_failed", "merge_deferred"])
+def test_failed_pr_is_evaluated_again_on_the_next_run(store, decision):
+    pr = make_pr()
+
+    assert evaluate(store, pr, decision)
+    assert evaluate(store, pr, "merged")
+
+
+def test_pr_with_unknown_mergeability_is_evaluated_again(store):
+    pr = make_pr()
+
+    assert evaluate(store, pr, "not_ready", mergeable_known=False)
+    assert evaluate(store, pr, "not_ready")
+
+
+def test_pr_without_snapshot_is_evaluated_when_its_ci_finishes(store, status_cache):
+    pr = make_pr()
+
+    assert evaluate(store, pr, "not_ready")
+    assert not evaluate(store, pr, "not_ready")
+
+    # A finished check run does not change the PR's updated_at.
+    status_cache.statuses["a1"] = CommitStatus(
+        "a1",
+        "success",
+        (StatusContext("ci/build", "success"),),
+        (CheckRun(1, "lint", "success"),),
+    )
+    assert evaluate(store, pr, "not_ready")
+
+
+def test_pr_without_snapshot_is_evaluated_after_a_push(store):
+    assert evaluate(store, make_pr(sha="a1"), "not_ready")
+    assert evaluate(store, make_pr(sha="b2"), "not_ready")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+from types import SimpleNamespace
+
+from github import UnknownObjectException
+
+from src.team_cache import TeamMembershipCache
+
+
+class FakeTeam:
+    def __init__(self, answers):
+        self.answers = answers
+        self.lookups = 0
+
+    def get_team_membership(self, login):
+        self.lookups += 1
+        answer = self.answers[login]
+        if answer is None:
+            raise UnknownObjectException(404, {"message": "Not Found"}, {})
+        return SimpleNamespace(state=answer)
+
+
+def make_cache(config, logger, team):
+    cache = TeamMembershipCache(None, config, logger)
+    cache._team = lambda organization, team_slug: team
+    return cache
+
+
+def age_entries(cache, seconds):
+    for entry in cache._memberships.values():
+        entry[1] -= seconds
+
+
+def test_membership_is_reused_for_the_ttl(config, logger):
+    team = FakeTeam({"alice": "active"})
+    cache = make_cache(config, logger, team)
+
+    assert cache.any_member("acme", "core", ["alice"])
+    age_entries(cache, 3600)
+    assert cache.any_member("acme", "core", ["alice"])
+    assert team.lookups == 1
+
+
+def test_not_found_answer_expires_quickly(config, logger):
+    team = FakeTeam({"alice": None})
+    cache = make_cache(config, logger, team)
+
+    assert not cache.any_member("acme", "core", ["alice"])
+    assert not cache.any_member("acme", "core", ["alice"])
+    assert team.lookups == 1
+
+    # The token was given access to the org's teams in the meantime.
+    team.answers["alice"] = "active"
+    age_entries(cache, cache.not_found_ttl + 1)
+    assert cache.any_member("acme", "core", ["alice"])
+    assert team.lookups == 2
+
+
+def test_not_found_ttl_survives_a_restart(config, logger):
+    cache = make_cache(config, logger, FakeTeam({"alice": None}))
+    cache.any_member("acme", "core", ["alice"])
+
+    team = FakeTeam({"alice": "active"})
+    reloaded = make_cache(config, logger, team)
+    age_entries(reloaded, reloaded.not_found_ttl + 1)
+    assert reloaded.any_member("acme", "core", ["alice"])
+    assert team.lookups == 1